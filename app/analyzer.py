@@ -2,22 +2,34 @@ import os
 import re
 import pandas as pd
 import streamlit as st
-from textblob import TextBlob
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize, sent_tokenize
 import nltk
 
-from .utils import load_input_excel, count_syllables
+from .utils import load_input_excel
+from .metrics import span
+from .corpus import ARTICLES_DIR, read_article
+from .dedupe import NearDuplicateIndex, DEDUPE_ENABLED
+from .sentiment import score_text, textblob_totals
+from .readability import ReadabilityCounts, collect_counts, analyzer_metrics
+from .long_documents import LONG_DOCUMENT_CHARS, cap_text, split_chunks, map_chunks
+from .workspace import atomic_path
 
 # 🛡 Ensure required NLTK resources
 from .nltk_setup import ensure_nltk_resources
 
 ensure_nltk_resources()
 stop_words = set(stopwords.words("english"))
+WORD_PATTERN = re.compile(r'\b\w+\b')
+
+
+def tokenize_words(text):
+    """Word tokens of a text, in order (the tokenizer shared by the pronoun counter and the full-text index)."""
+    return WORD_PATTERN.findall(text)
+
 
 # 🔍 Personal pronoun counter
 def count_personal_pronouns(text):
-    words = re.findall(r'\b\w+\b', text)
+    words = tokenize_words(text)
     count = 0
     for word in words:
         if word == 'I':
@@ -26,13 +38,196 @@ def count_personal_pronouns(text):
             count += 1
     return count
 
+# 📋 Output columns, in the order written to the Excel report
+OUTPUT_COLUMNS = [
+    "URL_ID", "URL", "POLARITY SCORE", "SUBJECTIVITY SCORE", "AVG SENTENCE LENGTH",
+    "PERCENTAGE OF COMPLEX WORDS", "FOG INDEX",
+    "COMPLEX WORD COUNT", "WORD COUNT", "SYLLABLE PER WORD",
+    "PERSONAL PRONOUNS", "AVG WORD LENGTH", "DUPLICATE OF"
+]
+METRIC_COLUMNS = OUTPUT_COLUMNS[2:-1]
+
+# 🧭 Which intermediate computation each metric comes from
+READABILITY_COLUMNS = (
+    "AVG SENTENCE LENGTH", "PERCENTAGE OF COMPLEX WORDS", "FOG INDEX",
+    "COMPLEX WORD COUNT", "WORD COUNT", "SYLLABLE PER WORD", "AVG WORD LENGTH",
+)
+METRIC_SOURCES = {
+    "POLARITY SCORE": "sentiment",
+    "SUBJECTIVITY SCORE": "sentiment",
+    "PERSONAL PRONOUNS": "pronouns",
+    **{column: "readability" for column in READABILITY_COLUMNS},
+}
+
+# 🎛️ Named analysis profiles: the metrics each one computes
+ANALYSIS_PROFILES = {
+    "full": tuple(METRIC_COLUMNS),
+    "sentiment": ("POLARITY SCORE", "SUBJECTIVITY SCORE"),
+    "readability": READABILITY_COLUMNS,
+}
+ANALYSIS_PROFILE = os.getenv("ARTICLE_ANALYSIS_PROFILE", "full")
+
+
+def profile_columns(profile=None):
+    """Metric columns computed by an analysis profile (defaults to ANALYSIS_PROFILE)."""
+    profile = profile or ANALYSIS_PROFILE
+    if profile not in ANALYSIS_PROFILES:
+        raise ValueError(f"Unknown analysis profile {profile!r}; expected one of {sorted(ANALYSIS_PROFILES)}")
+    return ANALYSIS_PROFILES[profile]
+
+
+def plan_metrics(columns):
+    """
+    Works out which intermediate computations the requested metrics need.
+
+    Returns:
+        set: Subset of {"sentiment", "readability", "pronouns"}.
+    """
+    return {METRIC_SOURCES[column] for column in columns}
+
+
+# 📚 Long documents: per-chunk partial results that add up to the whole document's
+def score_chunk(chunk, stages):
+    """
+    Mergeable partial results for one chunk of a long document.
+
+    Returns:
+        dict: "readability" (ReadabilityCounts), "sentiment" (polarity total,
+        subjectivity total, assessments) and "pronouns" (count), for the requested stages.
+    """
+    partial = {}
+    if "readability" in stages:
+        partial["readability"] = tuple(collect_counts(chunk))
+    if "sentiment" in stages:
+        partial["sentiment"] = textblob_totals(chunk)
+    if "pronouns" in stages:
+        partial["pronouns"] = count_personal_pronouns(chunk)
+    return partial
+
+
+def analyze_long_text(text, stages):
+    """
+    Computes the metrics of `stages` for a long text from sentence-aligned chunks.
+
+    Counts are summed and sentiment is averaged over all assessments (chunks are
+    weighted by how many they contain). Chunks are cut where punkt starts a
+    sentence, so the readability counts match scoring the text in one piece;
+    sentiment can still differ when a negation or intensifier ends one sentence
+    and the word it modifies starts the next chunk.
+
+    Returns:
+        dict: {metric column: value} for the metrics of `stages`.
+    """
+    with span("analyzer.long_document"):
+        partials = map_chunks(score_chunk, split_chunks(text), stages)
+
+    values = {}
+    if "readability" in stages:
+        counts = ReadabilityCounts(*(sum(column) for column in zip(*(p["readability"] for p in partials))))
+        values.update(analyzer_metrics(counts))
+    if "sentiment" in stages:
+        polarity, subjectivity, n = (sum(column) for column in zip(*(p["sentiment"] for p in partials)))
+        values["POLARITY SCORE"] = round(polarity / float(n or 1), 3)
+        values["SUBJECTIVITY SCORE"] = round(subjectivity / float(n or 1), 3)
+    if "pronouns" in stages:
+        values["PERSONAL PRONOUNS"] = sum(p["pronouns"] for p in partials)
+    return values
+
+
+# 🧮 Metrics for a single article
+def analyze_text(text, columns=None, known=None):
+    """
+    Computes article metrics for one text, running only the stages they need.
+
+    Texts longer than MAX_ANALYZED_CHARS are truncated first, and texts longer
+    than LONG_DOCUMENT_CHARS are scored in chunks (see analyze_long_text).
+
+    Args:
+        text (str): Article text.
+        columns (iterable): Metrics to compute; defaults to all of METRIC_COLUMNS.
+        known (list): Metric values already computed (None where missing), in
+            METRIC_COLUMNS order; only the missing requested metrics are computed.
+
+    Returns:
+        list: Metric values in OUTPUT_COLUMNS order (without URL_ID, URL and DUPLICATE OF);
+        metrics that were not requested are None.
+    """
+    values = dict(zip(METRIC_COLUMNS, known or [None] * len(METRIC_COLUMNS)))
+    missing = [column for column in (columns or METRIC_COLUMNS) if values[column] is None]
+    stages = plan_metrics(missing)
+
+    # Very long texts are capped, then scored in chunks
+    text = cap_text(text)
+    if stages and len(text) > LONG_DOCUMENT_CHARS:
+        values.update(analyze_long_text(text, stages))
+        return [values[column] for column in METRIC_COLUMNS]
+
+    if "readability" in stages:
+        # Sentence, word and syllable counts in one pass
+        values.update(analyzer_metrics(collect_counts(text)))
+
+    if "sentiment" in stages:
+        with span("analyzer.textblob"):
+            sentiment = score_text(text, vader=False)
+        values["POLARITY SCORE"] = round(sentiment.polarity, 3)
+        values["SUBJECTIVITY SCORE"] = round(sentiment.subjectivity, 3)
+
+    if "pronouns" in stages:
+        values["PERSONAL PRONOUNS"] = count_personal_pronouns(text)
+
+    return [values[column] for column in METRIC_COLUMNS]
+
+
+def missing_metrics(df, columns):
+    """Requested metric columns that are absent or not filled for every row of `df`."""
+    return [column for column in columns if column not in df.columns or df[column].isna().any()]
+
+
+def fill_missing_metrics(df, columns, folder=ARTICLES_DIR):
+    """
+    Computes metrics a profile skipped, for the rows that lack them.
+
+    Only the stages the missing columns need are run, and article text is read
+    only for rows with gaps.
+
+    Returns:
+        pd.DataFrame: A copy of `df` with `columns` filled where the text is available.
+    """
+    df = df.copy()
+    for column in columns:
+        if column not in df.columns:
+            df[column] = None
+        df[column] = df[column].astype(object)
+
+    gaps = df[list(columns)].isna().any(axis=1)
+    with span("analyzer.fill_missing"):
+        for index, url_id in df.loc[gaps, "URL_ID"].items():
+            text = read_article(url_id, folder)
+            if text is None:
+                continue
+            known = [df.at[index, column] if column in df.columns and pd.notna(df.at[index, column]) else None
+                     for column in METRIC_COLUMNS]
+            for column, value in zip(METRIC_COLUMNS, analyze_text(text, columns, known)):
+                if column in columns:
+                    df.at[index, column] = value
+
+    for column in columns:
+        df[column] = pd.to_numeric(df[column], errors="coerce")
+    return df
+
+
 # 🔬 Main analysis pipeline
 @st.cache_data
-def analyze_articles(path):
+def analyze_articles(path, output_path="output/Output Data Structure.xlsx", profile=None, folder=ARTICLES_DIR):
     df = load_input_excel(path)
+    columns = profile_columns(profile)
     output_data = []
     invalid_rows = []
 
+    # Near-duplicates reuse the metrics of the first copy instead of being re-analyzed
+    dedupe_index = NearDuplicateIndex() if DEDUPE_ENABLED else None
+    metrics_by_id = {}
+
     for _, row in df.iterrows():
         url_id = row.get("URL_ID")
         url = row.get("URL")
@@ -41,55 +236,37 @@ def analyze_articles(path):
             invalid_rows.append(row)
             continue
 
-        file_path = f"extracted_articles/{url_id}.txt"
-        if not os.path.exists(file_path):
-            st.warning(f"⚠️ File not found for URL_ID {url_id}. Skipping.")
-            continue
-
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                text = f.read()
-
-            # Preprocessing
-            blob = TextBlob(text)
-            words = word_tokenize(text)
-            sentences = sent_tokenize(text)
-
-            clean_words = [w.lower() for w in words if w.isalpha() and w.lower() not in stop_words]
-            word_count = len(clean_words)
-            complex_words = [w for w in clean_words if count_syllables(w) > 2]
-            complex_word_count = len(complex_words)
-
-            # Metrics
-            polarity = round(blob.sentiment.polarity, 3)
-            subjectivity = round(blob.sentiment.subjectivity, 3)
-            avg_sentence_len = round(word_count / max(len(sentences), 1), 3)
-            percent_complex = round(complex_word_count / max(word_count, 1), 3)
-            fog_index = round(0.4 * (avg_sentence_len + percent_complex), 3)
-            syll_per_word = round(sum(count_syllables(w) for w in clean_words) / max(word_count, 1), 3)
-            avg_word_len = round(sum(len(w) for w in clean_words) / max(word_count, 1), 3)
-            pronouns = count_personal_pronouns(text)
-
-            output_data.append([
-                url_id, url, polarity, subjectivity, avg_sentence_len,
-                percent_complex, fog_index,
-                complex_word_count, word_count, syll_per_word,
-                pronouns, avg_word_len
-            ])
+            with span("analyzer.read"):
+                text = read_article(url_id, folder)
+
+            if text is None:
+                st.warning(f"⚠️ File not found for URL_ID {url_id}. Skipping.")
+                continue
+
+            duplicate_of = None
+            if dedupe_index is not None:
+                with span("analyzer.dedupe"):
+                    duplicate_of = dedupe_index.add(url_id, text)
+
+            if duplicate_of in metrics_by_id:
+                metrics = metrics_by_id[duplicate_of]
+            else:
+                duplicate_of = None
+                metrics = analyze_text(text, columns)
+                metrics_by_id[url_id] = metrics
+
+            output_data.append([url_id, url] + metrics + [str(duplicate_of) if duplicate_of is not None else ""])
 
         except Exception as e:
             st.error(f"❌ Failed to analyze article {url_id}: {e}")
 
-    # Save output
-    df_out = pd.DataFrame(output_data, columns=[
-        "URL_ID", "URL", "POLARITY SCORE", "SUBJECTIVITY SCORE", "AVG SENTENCE LENGTH",
-        "PERCENTAGE OF COMPLEX WORDS", "FOG INDEX",
-        "COMPLEX WORD COUNT", "WORD COUNT", "SYLLABLE PER WORD",
-        "PERSONAL PRONOUNS", "AVG WORD LENGTH"
-    ])
+    # Save output (metrics outside the profile stay empty)
+    df_out = pd.DataFrame(output_data, columns=OUTPUT_COLUMNS)
+    df_out[METRIC_COLUMNS] = df_out[METRIC_COLUMNS].apply(pd.to_numeric, errors="coerce")
 
-    os.makedirs("output", exist_ok=True)
-    df_out.to_excel("output/Output Data Structure.xlsx", index=False)
+    with span("report.excel_write"), atomic_path(output_path) as tmp_path:
+        df_out.to_excel(tmp_path, index=False)
 
     if invalid_rows:
         st.warning(f"⚠️ Skipped {len(invalid_rows)} row(s) due to missing URL_ID or URL.")
@@ -0,0 +1,204 @@
+"""
+Approximate summary insights from a uniform sample of finished articles.
+
+While a large batch is still running, every finished article is offered to a
+fixed-size reservoir sample (Algorithm R), so the sample is always a uniform
+draw of what has finished so far. Polarity mean, sentiment band counts and top
+keywords are estimated from it with 95% confidence intervals (with a finite
+population correction), and the estimates tighten as the sample and the
+finished share grow. Jobs process articles in a shuffled order, so "finished
+so far" is itself a random subset of the batch and the intervals describe the
+whole batch. Articles that fail produce no row, so counts are scaled to the
+articles expected to succeed (the batch size times the success rate so far),
+which is also the population of the finite population correction. The exact
+summary replaces these estimates once it is ready.
+"""
+import math
+import os
+import random
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+
+from .corpus import ARTICLES_DIR, read_article
+from .keyword_extractor import extract_keywords_batch
+from .metrics import span
+
+SUMMARY_SAMPLE_SIZE = int(os.getenv("ARTICLE_SUMMARY_SAMPLE", 500))
+MIN_SAMPLE = 20          # fewer finished articles than this: no estimate yet
+Z_95 = 1.96
+POLARITY_BINS = np.linspace(-1, 1, 11)
+
+
+class Reservoir:
+    """Uniform fixed-size sample of a stream of items (Algorithm R)."""
+
+    def __init__(self, capacity=SUMMARY_SAMPLE_SIZE, seed=None):
+        self.capacity = max(1, capacity)
+        self.items = []
+        self.seen = 0
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def add(self, item):
+        """Offers an item to the sample; returns True if it was kept."""
+        with self.lock:
+            self.seen += 1
+            if len(self.items) < self.capacity:
+                self.items.append(item)
+                return True
+            slot = self.random.randrange(self.seen)
+            if slot < self.capacity:
+                self.items[slot] = item
+                return True
+            return False
+
+    def snapshot(self):
+        with self.lock:
+            return list(self.items), self.seen
+
+
+# 📏 Intervals
+def _fpc(n, population):
+    """Finite population correction: the interval shrinks to zero once the whole population is sampled."""
+    if not population or population <= 1:
+        return 1.0
+    if n >= population:
+        return 0.0
+    return math.sqrt((population - n) / (population - 1))
+
+
+def mean_interval(values, population=None):
+    """Sample mean with a 95% normal-approximation interval: (mean, low, high)."""
+    n = len(values)
+    mean = float(np.mean(values))
+    if n < 2:
+        return mean, mean, mean
+    half = Z_95 * float(np.std(values, ddof=1)) / math.sqrt(n) * _fpc(n, population)
+    return mean, mean - half, mean + half
+
+
+def proportion_interval(k, n, population=None):
+    """
+    Proportion k/n with a 95% Wilson score interval: (p, low, high).
+
+    The finite population correction shrinks both bounds towards p, so the
+    interval collapses onto p once the whole population has been sampled.
+    """
+    if n == 0:
+        return 0.0, 0.0, 1.0
+    p = k / n
+    z2 = Z_95 ** 2
+    center = (p + z2 / (2 * n)) / (1 + z2 / n)
+    half = Z_95 * math.sqrt(p * (1 - p) / n + z2 / (4 * n * n)) / (1 + z2 / n)
+    fpc = _fpc(n, population)
+    low, high = max(0.0, center - half), min(1.0, center + half)
+    return p, p - (p - low) * fpc, p + (high - p) * fpc
+
+
+# 📊 Estimates
+def estimated_population(succeeded, completed, total):
+    """
+    Articles of a batch expected to produce a result row.
+
+    Args:
+        succeeded (int): Finished articles that produced a row (the sampled stream).
+        completed (int): Finished articles, including failures.
+        total (int): Articles in the whole batch.
+
+    Returns:
+        int: `total` scaled by the success rate so far; at least `succeeded`.
+    """
+    if not completed:
+        return total
+    return max(succeeded, round(total * min(1.0, succeeded / completed)))
+
+
+def approximate_summary(polarities, finished, population):
+    """
+    Estimates the summary statistics of a batch from a sample of polarity scores.
+
+    Args:
+        polarities (list): Polarity scores of the sampled articles.
+        finished (int): Articles finished with a result so far (the sample is drawn from these).
+        population (int): Articles the estimates are scaled to (see estimated_population).
+
+    Returns:
+        dict: sample_size, finished, population, avg_polarity (mean, low, high),
+        bands {band: (estimated articles, low, high)} scaled to `population`, and
+        a polarity histogram of the sample; None if the sample is too small.
+    """
+    values = [p for p in polarities if p is not None and not math.isnan(p)]
+    n = len(values)
+    if n < MIN_SAMPLE:
+        return None
+
+    values = np.asarray(values, dtype=float)
+    counts = {
+        "Positive": int((values > 0.1).sum()),
+        "Negative": int((values < -0.1).sum()),
+        "Neutral": int(((values >= -0.1) & (values <= 0.1)).sum()),
+    }
+    bands = {}
+    for band, k in counts.items():
+        p, low, high = proportion_interval(k, n, population)
+        bands[band] = (round(p * population), math.floor(low * population), math.ceil(high * population))
+
+    histogram, _ = np.histogram(values, bins=POLARITY_BINS)
+    return {
+        "sample_size": n,
+        "finished": finished,
+        "population": population,
+        "avg_polarity": tuple(round(v, 3) for v in mean_interval(values, population)),
+        "bands": bands,
+        "histogram": histogram.tolist(),
+    }
+
+
+def refine_sample_keywords(cache, url_ids, folder=ARTICLES_DIR, backend=None, time_limit=0.2,
+                           document_frequencies=None):
+    """
+    Extracts keywords for sampled articles that have none yet, for at most `time_limit` seconds.
+
+    `cache` ({URL_ID: keywords}) persists between calls, so repeated calls
+    progressively cover the sample without redoing work. With the TF-IDF
+    backend, IDF comes from `document_frequencies`, to which every processed
+    article is added: the sample is uniform, so its document frequencies
+    estimate the batch's.
+
+    Returns:
+        int: Number of articles still without keywords.
+    """
+    pending = [url_id for url_id in url_ids if url_id not in cache]
+    deadline = time.perf_counter() + time_limit
+    done = 0
+    with span("summary.sample_keywords"):
+        for url_id in pending:
+            if time.perf_counter() >= deadline:
+                break
+            cache[url_id] = extract_keywords_batch(
+                [read_article(url_id, folder) or ""], backend=backend, document_frequencies=document_frequencies
+            )[0]
+            done += 1
+    return len(pending) - done
+
+
+def approximate_top_keywords(cache, url_ids, population, k=10):
+    """
+    Top keywords of the sampled articles, as an estimated number of articles mentioning each.
+
+    Returns:
+        list: [(keyword, estimated articles, low, high), ...] for the k most common keywords.
+    """
+    covered = [url_id for url_id in url_ids if url_id in cache]
+    n = len(covered)
+    if n < MIN_SAMPLE:
+        return []
+    document_counts = Counter(keyword for url_id in covered for keyword in set(cache[url_id]))
+    top = []
+    for keyword, count in document_counts.most_common(k):
+        p, low, high = proportion_interval(count, n, population)
+        top.append((keyword, round(p * population), math.floor(low * population), math.ceil(high * population)))
+    return top
@@ -1,11 +1,11 @@
-import os
 import streamlit as st
 import pandas as pd
-from textblob import TextBlob
-from nltk.sentiment import SentimentIntensityAnalyzer
-import textstat
 
 from app.nltk_setup import ensure_nltk_resources
+from app.metrics import span
+from app.corpus import read_article
+from app.sentiment import score_texts
+from app.readability import score_documents
 ensure_nltk_resources()
 
 from app.visualizer import (
@@ -27,66 +27,72 @@ def classify_sentiment(score):
 # ---------------- Sentiment Benchmark ----------------
 def benchmark_sentiments(df, folder="extracted_articles", top_n=5):
     results = []
-    sia = SentimentIntensityAnalyzer()
+    articles = []
 
     for _, row in df.head(top_n).iterrows():
         url_id = row['URL_ID']
-        file_path = os.path.join(folder, f"{url_id}.txt")
-        if not os.path.exists(file_path):
+        text = read_article(url_id, folder)
+        if text is None:
             st.warning(f"⚠️ Missing file for article {url_id}")
             continue
-
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                text = f.read()
-
-            blob_score = round(TextBlob(text).sentiment.polarity, 3)
-            vader_score = round(sia.polarity_scores(text)['compound'], 3)
-            diff = round(vader_score - blob_score, 3)
-
-            blob_label = classify_sentiment(blob_score)
-            vader_label = classify_sentiment(vader_score)
-            agreement = "Agree" if blob_label == vader_label else "Disagree"
-
-            results.append({
-                "URL_ID": url_id,
-                "TextBlob": blob_score,
-                "VADER": vader_score,
-                "Difference": diff,
-                "Agreement": agreement
-            })
-
-        except Exception as e:
-            st.error(f"⚠️ Error processing {url_id}: {e}")
+        articles.append((url_id, text))
+
+    # Both models are scored in one pass over each text
+    try:
+        with span("benchmark.sentiment"):
+            scores = score_texts([text for _, text in articles])
+    except Exception as e:
+        st.error(f"⚠️ Error scoring sentiment: {e}")
+        return results
+
+    for (url_id, _), score in zip(articles, scores):
+        blob_score = round(score.polarity, 3)
+        vader_score = round(score.compound, 3)
+        diff = round(vader_score - blob_score, 3)
+
+        blob_label = classify_sentiment(blob_score)
+        vader_label = classify_sentiment(vader_score)
+        agreement = "Agree" if blob_label == vader_label else "Disagree"
+
+        results.append({
+            "URL_ID": url_id,
+            "TextBlob": blob_score,
+            "VADER": vader_score,
+            "Difference": diff,
+            "Agreement": agreement
+        })
 
     return results
 
 # ---------------- Readability Benchmark ----------------
 def benchmark_readability(df, folder="extracted_articles", top_n=5):
+    """
+    Readability formulas for the first `top_n` articles, side by side.
+
+    The scores come from app.readability, the engine the report uses, so this
+    compares formulas on identical counts; it does not validate the report.
+    """
     results = []
+    articles = []
 
     for _, row in df.head(top_n).iterrows():
         url_id = row['URL_ID']
-        file_path = os.path.join(folder, f"{url_id}.txt")
-        if not os.path.exists(file_path):
+        text = read_article(url_id, folder)
+        if text is None:
             st.warning(f"⚠️ Missing file for article {url_id}")
             continue
+        articles.append((url_id, text))
 
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                text = f.read()
-
-            fog_score = round(textstat.gunning_fog(text), 2)
-            flesch_score = round(textstat.flesch_reading_ease(text), 2)
-
-            results.append({
-                "URL_ID": url_id,
-                "FOG": fog_score,
-                "Flesch": flesch_score
-            })
+    # Every score comes from one set of sentence/word/syllable counts per article
+    try:
+        with span("benchmark.readability"):
+            scores = score_documents([text for _, text in articles])
+    except Exception as e:
+        st.error(f"⚠️ Error scoring readability: {e}")
+        return results
 
-        except Exception as e:
-            st.error(f"⚠️ Error processing {url_id}: {e}")
+    for (url_id, _), score in zip(articles, scores):
+        results.append({"URL_ID": url_id, **score})
 
     return results
 
@@ -96,7 +102,7 @@ def benchmarking_tools_page(df_result):
         st.markdown("""
         - Benchmarking helps validate your NLP pipeline.
         - TextBlob vs VADER → compare ML vs rule-based sentiment.
-        - FOG vs Flesch → test readability from complexity and ease perspectives.
+        - Readability formulas → FOG, Flesch and others side by side, from the same counts as the report.
         """)
 
     top_n = st.slider("📌 Select number of articles to benchmark:", min_value=2, max_value=20, value=5)
@@ -124,7 +130,8 @@ def benchmarking_tools_page(df_result):
 
     # -------- Readability Section --------
     if readability_results:
-        st.subheader("📚 Readability Comparison")
+        st.subheader("📚 Readability Formulas")
+        st.caption("Scores come from the report's own readability engine, so they show how the formulas differ, not an independent check of the report.")
         readability_df = pd.DataFrame(readability_results)
 
         st.plotly_chart(plot_readability_comparison(readability_results), use_container_width=True)
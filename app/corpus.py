@@ -0,0 +1,247 @@
+"""
+Read/write API for extracted article texts.
+
+Every stage goes through these helpers instead of opening
+`extracted_articles/{URL_ID}.txt` itself, so the storage backend can change:
+
+    ARTICLE_STORE=files    one .txt file per article (default, original layout)
+    ARTICLE_STORE=packed   compressed append-only segment + offset index (app/corpus_store.py)
+    ARTICLE_STORE=cas      URL_ID -> content hash refs into a shared, immutable object store
+
+Folders that already hold cas refs (e.g. background job workspaces) always use the cas backend.
+"""
+import hashlib
+import os
+import threading
+import time
+
+from .corpus_store import PackedCorpusStore
+from .workspace import WORKSPACES_DIR, WORKSPACE_MAX_AGE_HOURS, atomic_write, clean_old_workspaces
+
+ARTICLES_DIR = "extracted_articles"
+ARTICLE_STORE = os.getenv("ARTICLE_STORE", "files")
+ARTICLE_OBJECTS_DIR = os.getenv("ARTICLE_OBJECTS_DIR", os.path.join(ARTICLES_DIR, "objects"))
+REFS_DIR = "refs"
+
+
+class FileCorpusStore:
+    """The original layout: extracted_articles/{URL_ID}.txt."""
+
+    def __init__(self, folder):
+        self.folder = folder
+
+    def path(self, url_id):
+        return os.path.join(self.folder, f"{url_id}.txt")
+
+    def __contains__(self, url_id):
+        return os.path.exists(self.path(url_id))
+
+    def keys(self):
+        if not os.path.isdir(self.folder):
+            return []
+        return sorted(name[:-4] for name in os.listdir(self.folder) if name.endswith(".txt"))
+
+    def read(self, url_id):
+        try:
+            with open(self.path(url_id), "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def version(self, url_id):
+        """Cheap change marker (mtime + size) that does not read the text."""
+        try:
+            stat = os.stat(self.path(url_id))
+        except FileNotFoundError:
+            return None
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def write(self, url_id, text):
+        atomic_write(self.path(url_id), text)
+
+    def delete(self, url_id):
+        try:
+            os.remove(self.path(url_id))
+        except FileNotFoundError:
+            pass
+
+
+class ContentAddressedStore:
+    """
+    Texts are stored once by SHA-256 in a shared object directory; a folder only
+    holds small refs/{URL_ID} files naming the hash. Objects are immutable and
+    refs are replaced atomically, so any number of sessions and worker processes
+    can write concurrently without locks, and identical texts are stored once.
+    """
+
+    def __init__(self, folder, objects_dir=ARTICLE_OBJECTS_DIR):
+        self.folder = folder
+        self.refs_dir = os.path.join(folder, REFS_DIR)
+        self.objects_dir = objects_dir
+        os.makedirs(self.refs_dir, exist_ok=True)
+
+    def ref_path(self, url_id):
+        return os.path.join(self.refs_dir, str(url_id))
+
+    def object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.txt")
+
+    def __contains__(self, url_id):
+        return os.path.exists(self.ref_path(url_id))
+
+    def keys(self):
+        return sorted(os.listdir(self.refs_dir))
+
+    def version(self, url_id):
+        """The content hash: identical texts share a version across folders."""
+        try:
+            with open(self.ref_path(url_id), "r", encoding="utf-8") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def read(self, url_id):
+        digest = self.version(url_id)
+        if digest is None:
+            return None
+        try:
+            with open(self.object_path(digest), "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def write(self, url_id, text):
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        object_path = self.object_path(digest)
+        try:
+            # A fresh mtime keeps clean_unreferenced_objects off an object whose ref is being written
+            os.utime(object_path)
+        except FileNotFoundError:
+            atomic_write(object_path, text)
+        atomic_write(self.ref_path(url_id), digest)
+
+    def delete(self, url_id):
+        try:
+            os.remove(self.ref_path(url_id))
+        except FileNotFoundError:
+            pass
+
+    def read_object(self, digest):
+        """The text stored under a content hash, or None if it is not in the object store."""
+        try:
+            with open(self.object_path(digest), "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def link(self, url_id, digest):
+        """Points `url_id` at an object already in the store, without rewriting the text."""
+        atomic_write(self.ref_path(url_id), digest)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(folder=ARTICLES_DIR, backend=None):
+    """
+    Returns the (cached) store for `folder`.
+
+    Args:
+        folder (str): Corpus folder.
+        backend (str): "files", "packed" or "cas"; defaults to cas for folders
+            holding refs, otherwise ARTICLE_STORE.
+    """
+    key = os.path.abspath(folder)
+    with _stores_lock:
+        if key not in _stores:
+            if backend is None:
+                backend = "cas" if os.path.isdir(os.path.join(folder, REFS_DIR)) else ARTICLE_STORE
+            if backend == "cas":
+                _stores[key] = ContentAddressedStore(folder)
+            elif backend == "packed":
+                _stores[key] = PackedCorpusStore(folder)
+            else:
+                _stores[key] = FileCorpusStore(folder)
+        return _stores[key]
+
+
+def has_article(url_id, folder=ARTICLES_DIR):
+    return str(url_id) in get_store(folder)
+
+
+def read_article(url_id, folder=ARTICLES_DIR):
+    """Returns the article text, or None if it was never extracted."""
+    return get_store(folder).read(str(url_id))
+
+
+def article_version(url_id, folder=ARTICLES_DIR):
+    """Returns a marker that changes whenever the article is rewritten, or None if it is missing."""
+    return get_store(folder).version(str(url_id))
+
+
+def write_article(url_id, text, folder=ARTICLES_DIR):
+    get_store(folder).write(str(url_id), text)
+
+
+def iter_articles(url_ids, folder=ARTICLES_DIR):
+    """Yields (URL_ID, text) for each id that has an extracted article, one at a time."""
+    store = get_store(folder)
+    for url_id in url_ids:
+        text = store.read(str(url_id))
+        if text is not None:
+            yield url_id, text
+
+
+def clean_unreferenced_objects(max_age_hours=WORKSPACE_MAX_AGE_HOURS, objects_dir=ARTICLE_OBJECTS_DIR,
+                               roots=(ARTICLES_DIR, WORKSPACES_DIR)):
+    """
+    Deletes content-addressed texts older than `max_age_hours` that no refs file names any more.
+
+    Run it after clean_old_workspaces, which removes the refs of old workspaces.
+    Objects are touched whenever a ref to them is written, so the age limit also
+    keeps an object whose ref is still being written.
+
+    Args:
+        max_age_hours (float): Age after which an unreferenced object is deleted.
+        objects_dir (str): The shared object store.
+        roots (tuple): Directories searched for refs folders.
+    """
+    skip = os.path.abspath(objects_dir)
+    referenced = set()
+    for top in roots:
+        for root, dirs, files in os.walk(top):
+            dirs[:] = [d for d in dirs if os.path.abspath(os.path.join(root, d)) != skip]
+            if os.path.basename(root) != REFS_DIR:
+                continue
+            for name in files:
+                try:
+                    with open(os.path.join(root, name), "r", encoding="utf-8") as f:
+                        referenced.add(f.read().strip())
+                except OSError:
+                    pass  # removed while walking
+
+    cutoff = time.time() - max_age_hours * 3600
+    deleted_count = 0
+    for root, _, files in os.walk(objects_dir):
+        for name in files:
+            digest, ext = os.path.splitext(name)
+            path = os.path.join(root, name)
+            if ext != ".txt" or digest in referenced:
+                continue
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    deleted_count += 1
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"Error deleting {path}: {e}")
+
+    print(f"🧹 Cleaned {deleted_count} unreferenced article text(s) from '{objects_dir}'")
+
+
+def clean_storage(keep=()):
+    """Deletes old workspaces, then the article texts they alone referenced (run it off the UI thread)."""
+    clean_old_workspaces(keep=keep)
+    clean_unreferenced_objects()
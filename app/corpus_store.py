@@ -0,0 +1,289 @@
+"""
+Packed article corpus: one append-only segment file of compressed records plus a URL_ID -> offset index.
+
+Layout inside the store directory:
+    corpus.seg   records: header | URL_ID (utf-8) | zlib-compressed text
+    corpus.idx   append-only log of "URL_ID<TAB>offset" lines (last line wins)
+
+Reads go through a read-only memory map of the segment. Rewrites and deletes
+only append, so stale records accumulate until `compact()` copies the live
+ones into a fresh segment. A single process should write to a store at a time.
+
+Usage:
+    python -m app.corpus_store pack extracted_articles     # import existing .txt files
+    python -m app.corpus_store compact extracted_articles
+"""
+import argparse
+import glob
+import itertools
+import mmap
+import os
+import struct
+import threading
+import zlib
+
+SEGMENT_FILE = "corpus.seg"
+INDEX_FILE = "corpus.idx"
+
+MAGIC = b"ART1"
+FLAG_DELETED = 1
+# magic, flags, key length, payload length, crc32 of payload
+HEADER = struct.Struct(">4sBHII")
+COMPRESSION_LEVEL = 6
+
+
+class CorpusCorrupted(Exception):
+    """Raised when a record header or checksum does not match."""
+
+
+class PackedCorpusStore:
+    def __init__(self, folder):
+        self.folder = folder
+        self.segment_path = os.path.join(folder, SEGMENT_FILE)
+        self.index_path = os.path.join(folder, INDEX_FILE)
+        self.lock = threading.RLock()
+        self.index = {}
+        self.segment = None
+        self.index_log = None
+        self.mapped = None
+        self.mapped_size = 0
+        self._open()
+
+    # ---------------- Opening & recovery ----------------
+    def _open(self):
+        os.makedirs(self.folder, exist_ok=True)
+        self.segment = open(self.segment_path, "ab")
+        self.size = self.segment.tell()
+        indexed_end = self._load_index()
+
+        # Records appended after the last index line (e.g. a crash) are recovered by scanning
+        if indexed_end < self.size:
+            self._scan(indexed_end, self._index_record)
+            self._rewrite_index()
+
+        self.index_log = open(self.index_path, "a", encoding="utf-8")
+
+    def _load_index(self):
+        """Loads the index log and returns the segment offset it covers up to."""
+        self.index = {}
+        if not os.path.exists(self.index_path):
+            return 0
+
+        covered = 0
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                key, _, offset = line.rstrip("\n").rpartition("\t")
+                if not key or not offset.lstrip("-").isdigit():
+                    continue
+                offset = int(offset)
+                if offset < 0:
+                    self.index.pop(key, None)
+                else:
+                    self.index[key] = offset
+                    covered = max(covered, offset)
+
+        if not self.index and covered == 0:
+            return 0
+
+        # The index may point into an older segment (interrupted compaction): verify and rebuild
+        try:
+            end = covered + self._record_length(covered)
+            for key, offset in itertools.islice(self.index.items(), 16):
+                if self._read_header(offset)[1] != key:
+                    raise CorpusCorrupted(key)
+        except (CorpusCorrupted, struct.error, ValueError):
+            self.index = {}
+            self._scan(0, self._index_record)
+            self._rewrite_index()
+            return self.size
+        return end
+
+    def _index_record(self, key, offset, flags):
+        if flags & FLAG_DELETED:
+            self.index.pop(key, None)
+        else:
+            self.index[key] = offset
+
+    def _scan(self, start, callback):
+        """Walks record headers from `start`, stopping at the first incomplete record."""
+        with open(self.segment_path, "rb") as f:
+            f.seek(start)
+            offset = start
+            while True:
+                header = f.read(HEADER.size)
+                if len(header) < HEADER.size:
+                    break
+                magic, flags, key_len, data_len, _ = HEADER.unpack(header)
+                if magic != MAGIC:
+                    break
+                key = f.read(key_len)
+                if len(key) < key_len:
+                    break
+                f.seek(data_len, os.SEEK_CUR)
+                end = offset + HEADER.size + key_len + data_len
+                if end > self.size:
+                    break
+                callback(key.decode("utf-8"), offset, flags)
+                offset = end
+
+    def _rewrite_index(self):
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(f"{key}\t{offset}\n" for key, offset in self.index.items())
+        os.replace(tmp_path, self.index_path)
+
+    # ---------------- Low-level reads ----------------
+    def _view(self, end):
+        """Returns a memory map covering at least `end` bytes of the segment."""
+        if self.mapped is None or end > self.mapped_size:
+            if self.mapped is not None:
+                self.mapped.close()
+            self.segment.flush()
+            with open(self.segment_path, "rb") as f:
+                self.mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.mapped_size = len(self.mapped)
+        return self.mapped
+
+    def _read_header(self, offset):
+        view = self._view(offset + HEADER.size)
+        magic, flags, key_len, data_len, crc = HEADER.unpack_from(view, offset)
+        if magic != MAGIC:
+            raise CorpusCorrupted(f"Bad record header at offset {offset}")
+        view = self._view(offset + HEADER.size + key_len)
+        key = bytes(view[offset + HEADER.size: offset + HEADER.size + key_len]).decode("utf-8")
+        return flags, key, key_len, data_len, crc
+
+    def _record_length(self, offset):
+        _, _, key_len, data_len, _ = self._read_header(offset)
+        return HEADER.size + key_len + data_len
+
+    # ---------------- Public API ----------------
+    def __contains__(self, url_id):
+        with self.lock:
+            return str(url_id) in self.index
+
+    def __len__(self):
+        with self.lock:
+            return len(self.index)
+
+    def keys(self):
+        with self.lock:
+            return list(self.index)
+
+    def read(self, url_id):
+        """Returns the article text, or None if the store has no live record for it."""
+        with self.lock:
+            offset = self.index.get(str(url_id))
+            if offset is None:
+                return None
+            flags, key, key_len, data_len, crc = self._read_header(offset)
+            start = offset + HEADER.size + key_len
+            payload = self._view(start + data_len)[start:start + data_len]
+
+        if zlib.crc32(payload) != crc:
+            raise CorpusCorrupted(f"Checksum mismatch for article {url_id}")
+        return zlib.decompress(payload).decode("utf-8")
+
+    def version(self, url_id):
+        """The record offset: every rewrite appends, so it changes whenever the text does."""
+        with self.lock:
+            offset = self.index.get(str(url_id))
+        return None if offset is None else str(offset)
+
+    def write(self, url_id, text):
+        """Appends a new version of an article; older versions become garbage until compaction."""
+        payload = zlib.compress(text.encode("utf-8"), COMPRESSION_LEVEL)
+        self._append(str(url_id), payload, 0)
+
+    def delete(self, url_id):
+        with self.lock:
+            if str(url_id) in self.index:
+                self._append(str(url_id), b"", FLAG_DELETED)
+
+    def _append(self, key, payload, flags):
+        key_bytes = key.encode("utf-8")
+        record = HEADER.pack(MAGIC, flags, len(key_bytes), len(payload), zlib.crc32(payload)) + key_bytes + payload
+        with self.lock:
+            offset = self.size
+            self.segment.write(record)
+            self.segment.flush()
+            self.size += len(record)
+
+            self.index_log.write(f"{key}\t{-1 if flags & FLAG_DELETED else offset}\n")
+            self.index_log.flush()
+            self._index_record(key, offset, flags)
+
+    def garbage_ratio(self):
+        """Share of the segment taken by overwritten or deleted records."""
+        with self.lock:
+            if not self.size:
+                return 0.0
+            live = sum(self._record_length(offset) for offset in self.index.values())
+            return 1 - live / self.size
+
+    def compact(self):
+        """Rewrites the segment with only the live records and swaps it in atomically."""
+        with self.lock:
+            tmp_segment = f"{self.segment_path}.compact"
+            new_index = {}
+            with open(tmp_segment, "wb") as out:
+                for key, offset in self.index.items():
+                    length = self._record_length(offset)
+                    new_index[key] = out.tell()
+                    out.write(self._view(offset + length)[offset:offset + length])
+                out.flush()
+                os.fsync(out.fileno())
+
+            self.close()
+            os.replace(tmp_segment, self.segment_path)
+            self.index = new_index
+            self._rewrite_index()
+            self._open()
+
+    def close(self):
+        with self.lock:
+            if self.mapped is not None:
+                self.mapped.close()
+                self.mapped = None
+                self.mapped_size = 0
+            for handle in (self.segment, self.index_log):
+                if handle is not None:
+                    handle.close()
+            self.segment = self.index_log = None
+
+
+def pack_folder(folder):
+    """Imports every <URL_ID>.txt file in `folder` into the packed store there."""
+    store = PackedCorpusStore(folder)
+    count = 0
+    for file_path in sorted(glob.glob(os.path.join(folder, "*.txt"))):
+        url_id = os.path.splitext(os.path.basename(file_path))[0]
+        with open(file_path, "r", encoding="utf-8") as f:
+            store.write(url_id, f.read())
+        count += 1
+    store.close()
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the packed article corpus.")
+    parser.add_argument("command", choices=["pack", "compact", "stats"])
+    parser.add_argument("folder", nargs="?", default="extracted_articles")
+    args = parser.parse_args(argv)
+
+    if args.command == "pack":
+        print(f"📦 Packed {pack_folder(args.folder)} article(s) into {args.folder}/{SEGMENT_FILE}")
+        return
+
+    store = PackedCorpusStore(args.folder)
+    if args.command == "compact":
+        before = store.size
+        store.compact()
+        print(f"🧹 Compacted {before} -> {store.size} bytes")
+    else:
+        print(f"📊 {len(store)} article(s), {store.size} bytes, {store.garbage_ratio():.1%} garbage")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Near-duplicate detection for extracted articles (MinHash signatures + LSH banding).
+
+Syndicated or mirrored copies of an article are grouped with the first copy
+seen, so the expensive analysis runs once per group and its metrics are reused.
+"""
+import os
+import re
+import zlib
+
+import numpy as np
+
+DEDUPE_ENABLED = os.getenv("ARTICLE_DEDUPE", "1") != "0"
+
+SHINGLE_SIZE = 5          # words per shingle
+NUM_PERM = 128            # MinHash permutations
+BANDS = 16                # LSH bands (NUM_PERM / BANDS rows per band)
+SIMILARITY_THRESHOLD = 0.8
+BLOCK_SIZE = 8192         # shingles hashed per block, bounds memory on long texts
+
+_PRIME = np.uint64(4294967291)  # largest prime below 2**32; a * x + b stays below 2**64
+_rng = np.random.RandomState(1)
+_A = _rng.randint(1, 2 ** 32 - 5, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.randint(0, 2 ** 32 - 5, size=NUM_PERM, dtype=np.uint64)
+
+WORD_RE = re.compile(r"\w+")
+
+
+def shingle_hashes(text):
+    """Returns the unique crc32 hashes of the text's word shingles."""
+    words = WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        shingles = [" ".join(words)]
+    else:
+        shingles = (" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1))
+    return np.unique(np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64))
+
+
+def minhash_signature(text):
+    """Computes a NUM_PERM-long MinHash signature (uint32) for a text."""
+    hashes = shingle_hashes(text)
+    signature = np.full(NUM_PERM, np.iinfo(np.uint32).max, dtype=np.uint64)
+    for start in range(0, len(hashes), BLOCK_SIZE):
+        block = hashes[start:start + BLOCK_SIZE]
+        permuted = (np.outer(_A, block) + _B[:, None]) % _PRIME
+        np.minimum(signature, permuted.min(axis=1), out=signature)
+    return signature.astype(np.uint32)
+
+
+def estimated_similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of the two texts' shingle sets."""
+    return float(np.mean(sig_a == sig_b))
+
+
+class NearDuplicateIndex:
+    """
+    Incremental LSH index: each added article is either new (its own group)
+    or a near-duplicate of an article added earlier.
+
+    Only group representatives are kept (a signature and one bucket entry per
+    band each); remove() drops one, so callers can keep the index to a window.
+    """
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD, bands=BANDS):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self.buckets = [{} for _ in range(bands)]
+        self.signatures = {}
+
+    def add(self, url_id, text):
+        """
+        Adds an article and returns the URL_ID of the group it duplicates, or None if it is new.
+        """
+        signature = minhash_signature(text)
+        band_keys = self._band_keys(signature)
+
+        candidates = set()
+        for band, key in zip(self.buckets, band_keys):
+            candidates.update(band.get(key, ()))
+
+        best_id, best_score = None, self.threshold
+        for candidate in candidates:
+            score = estimated_similarity(signature, self.signatures[candidate])
+            if score >= best_score:
+                best_id, best_score = candidate, score
+
+        if best_id is not None:
+            return best_id
+
+        # Only group representatives are indexed, so groups never chain
+        self.signatures[url_id] = signature
+        for band, key in zip(self.buckets, band_keys):
+            band.setdefault(key, []).append(url_id)
+        return None
+
+    def remove(self, url_id):
+        """Forgets a group representative; later copies of it start a new group."""
+        signature = self.signatures.pop(url_id, None)
+        if signature is None:
+            return
+        for band, key in zip(self.buckets, self._band_keys(signature)):
+            members = band.get(key, [])
+            if url_id in members:
+                members.remove(url_id)
+            if not members:
+                band.pop(key, None)
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def _band_keys(self, signature):
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+
+def find_duplicate_groups(items, threshold=SIMILARITY_THRESHOLD):
+    """
+    Maps each (URL_ID, text) item to the URL_ID of the article it duplicates.
+
+    Returns:
+        dict: {URL_ID: canonical URL_ID} for duplicates only.
+    """
+    index = NearDuplicateIndex(threshold)
+    duplicates = {}
+    for url_id, text in items:
+        canonical = index.add(url_id, text)
+        if canonical is not None:
+            duplicates[url_id] = canonical
+    return duplicates
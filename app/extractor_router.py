@@ -0,0 +1,206 @@
+import atexit
+import json
+import os
+import threading
+import time
+from collections import Counter, namedtuple
+from urllib.parse import urlparse
+
+import lxml.html
+from bs4 import BeautifulSoup
+from newspaper import Article
+from readability import Document
+
+from .metrics import span
+
+
+# ---------------- Extractors ----------------
+Extractor = namedtuple("Extractor", ["name", "label", "min_chars", "extract"])
+
+NOISE_TAGS = ("script", "style", "noscript", "nav", "header", "footer", "aside", "form")
+
+
+def extract_with_lxml(html, url=None):
+    """
+    Fast path: picks the element holding the most paragraph text and joins its <p> children.
+    """
+    tree = lxml.html.fromstring(html)
+    for element in list(tree.iter(*NOISE_TAGS)):
+        element.drop_tree()
+
+    scores = {}
+    for p in tree.iter("p"):
+        parent = p.getparent()
+        if parent is not None:
+            scores[parent] = scores.get(parent, 0) + len(p.text_content().strip())
+
+    if not scores:
+        return ""
+    best = max(scores, key=scores.get)
+    paragraphs = [p.text_content().strip() for p in best.iterchildren("p")]
+    return "\n".join(p for p in paragraphs if p)
+
+
+def extract_with_readability(html, url=None):
+    doc = Document(html)
+    soup = BeautifulSoup(doc.summary(), "lxml")
+    paragraphs = [p.get_text(strip=True) for p in soup.find_all("p")]
+    return "\n".join(paragraphs)
+
+
+def extract_with_newspaper(html, url=None):
+    article = Article(url or "")
+    article.download(input_html=html)
+    article.parse()
+    return article.text
+
+
+EXTRACTORS = {
+    "newspaper": Extractor("newspaper", "Newspaper3k", 300, extract_with_newspaper),
+    "readability": Extractor("readability", "Readability", 100, extract_with_readability),
+    "lxml": Extractor("lxml", "lxml fast path", 300, extract_with_lxml),
+}
+
+
+def parse_html(html, url, plan):
+    """
+    Tries the extractors in `plan` on a page until one returns enough text.
+
+    Returns:
+        tuple: (text, name of the extractor that succeeded or None,
+        [(extractor name, success, seconds), ...] for every try, last exception or None)
+    """
+    attempts, last_error = [], None
+    for name in plan:
+        extractor = EXTRACTORS[name]
+        start = time.perf_counter()
+        try:
+            with span("scraper.parse", extractor=name):
+                text = extractor.extract(html, url).strip()
+        except Exception as e:
+            text, last_error = "", e
+
+        success = len(text) >= extractor.min_chars
+        attempts.append((name, success, time.perf_counter() - start))
+        if success:
+            return text, name, attempts, last_error
+    return "", None, attempts, last_error
+
+
+# Order used for domains we know nothing about (highest quality first)
+DEFAULT_ORDER = ["newspaper", "readability", "lxml"]
+# Rough relative parse cost, used until a domain has timings of its own
+COST_ORDER = ["lxml", "readability", "newspaper"]
+
+
+# ---------------- Router ----------------
+ROUTER_STATS_PATH = os.getenv("ARTICLE_ROUTER_STATS", os.path.join(".cache", "extractor_routes.json"))
+MIN_SAMPLES = 3          # attempts before an extractor's success rate is trusted
+SUCCESS_THRESHOLD = 0.8  # success rate for an extractor to count as "works"
+EXPLORE_EVERY = 20       # every Nth request, try an untested cheaper extractor first
+SAVE_EVERY = 25          # flush stats to disk after this many records
+
+
+def domain_of(url):
+    host = (urlparse(str(url)).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class ExtractorRouter:
+    """
+    Learns, per domain, which extractor produces usable text and how long it takes.
+
+    Stats are kept as {domain: {extractor: {"attempts", "successes", "seconds"}}}
+    and persisted as JSON so routing survives restarts.
+    """
+
+    def __init__(self, path=ROUTER_STATS_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.requests = Counter()  # plan() calls per domain in this process, for exploration
+        self.stats = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        with self.lock:
+            if not self.pending:
+                return
+            snapshot = json.dumps(self.stats)
+            self.pending = 0
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(snapshot)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ Could not save extractor stats: {e}")
+
+    def plan(self, url):
+        """
+        Returns extractor names in the order they should be tried for this URL.
+
+        Proven extractors (success rate above threshold) come first, cheapest
+        measured parse time first; untested ones follow in the default order and
+        extractors that keep failing on this domain are only kept as a last resort.
+        """
+        domain = domain_of(url)
+        with self.lock:
+            domain_stats = {k: dict(v) for k, v in self.stats.get(domain, {}).items()}
+            self.requests[domain] += 1
+            request_number = self.requests[domain]
+
+        proven, untested, failing = [], [], []
+        for name in DEFAULT_ORDER:
+            entry = domain_stats.get(name)
+            if not entry or entry["attempts"] < MIN_SAMPLES:
+                untested.append(name)
+            elif entry["successes"] / entry["attempts"] >= SUCCESS_THRESHOLD:
+                proven.append(name)
+            else:
+                failing.append(name)
+
+        proven.sort(key=lambda name: domain_stats[name]["seconds"] / domain_stats[name]["attempts"])
+
+        # Every EXPLORE_EVERY-th request to a domain gives a cheaper, untested extractor the first shot
+        # (counted per request: one request can record several attempts)
+        if proven:
+            cheaper = [n for n in untested if COST_ORDER.index(n) < COST_ORDER.index(proven[0])]
+            if cheaper and request_number % EXPLORE_EVERY == 0:
+                return cheaper[:1] + proven + [n for n in untested if n not in cheaper[:1]] + failing
+
+        return proven + untested + failing
+
+    def record(self, url, name, success, seconds):
+        with self.lock:
+            entry = self.stats.setdefault(domain_of(url), {}).setdefault(
+                name, {"attempts": 0, "successes": 0, "seconds": 0.0}
+            )
+            entry["attempts"] += 1
+            entry["successes"] += int(bool(success))
+            entry["seconds"] = round(entry["seconds"] + seconds, 6)
+            self.pending += 1
+            should_save = self.pending >= SAVE_EVERY
+        if should_save:
+            self.save()
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_router():
+    """Returns the process-wide extractor router."""
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = ExtractorRouter()
+            atexit.register(_router.save)
+        return _router
@@ -0,0 +1,134 @@
+import codecs
+import os
+import re
+import requests
+
+
+# ⚙️ Limits (override with environment variables on constrained workers)
+MAX_BODY_BYTES = int(os.getenv("ARTICLE_MAX_BODY_BYTES", 5 * 1024 * 1024))
+MAX_DECODED_BYTES = int(os.getenv("ARTICLE_MAX_DECODED_BYTES", 15 * 1024 * 1024))
+REQUEST_TIMEOUT = 10
+CHUNK_SIZE = 64 * 1024
+SNIFF_BYTES = 4096
+
+HTML_MIME_TYPES = {"text/html", "application/xhtml+xml"}
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; ArticleAnalyzer/1.0)",
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.1",
+}
+
+# Magic numbers of common binary payloads that are sometimes served as text/html
+BINARY_SIGNATURES = (
+    b"%PDF", b"PK\x03\x04", b"\x89PNG", b"GIF8", b"\xff\xd8\xff", b"ID3",
+    b"OggS", b"RIFF", b"\x1f\x8b", b"\x1a\x45\xdf\xa3", b"\x00\x00\x01\xba",
+)
+
+META_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-zA-Z0-9_\-:.]+)""", re.IGNORECASE)
+HEADER_CHARSET_RE = re.compile(r"""charset\s*=\s*["']?([a-zA-Z0-9_\-:.]+)""", re.IGNORECASE)
+
+
+class FetchRejected(Exception):
+    """Raised when a response is not HTML or exceeds the configured size limits."""
+
+
+# 🔍 Utility: Check the first bytes of a body for binary content
+def looks_like_html(head):
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return True
+    head = head.lstrip()
+    if head.startswith(BINARY_SIGNATURES) or head[4:8] == b"ftyp":
+        return False
+    return b"\x00" not in head[:SNIFF_BYTES]
+
+
+# 🔤 Utility: Pick a text encoding from the headers, BOM or <meta> tag
+def sniff_encoding(content_type, head):
+    candidates = []
+
+    header_match = HEADER_CHARSET_RE.search(content_type or "")
+    if header_match:
+        candidates.append(header_match.group(1))
+
+    for bom, name in ((codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16")):
+        if head.startswith(bom):
+            candidates.insert(0, name)
+
+    meta_match = META_CHARSET_RE.search(head[:SNIFF_BYTES])
+    if meta_match:
+        candidates.append(meta_match.group(1).decode("ascii", "ignore"))
+
+    for name in candidates:
+        try:
+            return codecs.lookup(name).name
+        except LookupError:
+            continue
+    return "utf-8"
+
+
+# 🌐 Main: Streamed, size-capped HTML download
+def fetch_page(url, timeout=REQUEST_TIMEOUT, max_bytes=MAX_BODY_BYTES, max_decoded_bytes=MAX_DECODED_BYTES, session=None):
+    """
+    Downloads a page in chunks and returns its raw body.
+
+    Non-HTML responses are rejected from the Content-Type header or the first
+    bytes of the body, before the rest of the payload is transferred.
+
+    Args:
+        url (str): Page URL.
+        timeout (int): Connect/read timeout in seconds.
+        max_bytes (int): Maximum bytes read off the wire (compressed size).
+        max_decoded_bytes (int): Maximum body size after content decoding.
+        session (requests.Session): Optional session for connection reuse.
+
+    Returns:
+        tuple: (body bytes after content decoding, Content-Type header).
+
+    Raises:
+        FetchRejected: If the response is not HTML or is too large.
+        requests.RequestException: On network or HTTP errors.
+    """
+    getter = session or requests
+    with getter.get(url, timeout=timeout, stream=True, headers=DEFAULT_HEADERS) as response:
+        response.raise_for_status()
+
+        content_type = response.headers.get("Content-Type", "")
+        mime = content_type.split(";")[0].strip().lower()
+        if mime and mime not in HTML_MIME_TYPES:
+            raise FetchRejected(f"Unsupported content type '{mime}'")
+
+        declared = response.headers.get("Content-Length", "")
+        if declared.isdigit() and int(declared) > max_bytes:
+            raise FetchRejected(f"Body too large ({int(declared)} bytes declared, limit {max_bytes})")
+
+        chunks = []
+        decoded_size = 0
+        for chunk in response.iter_content(CHUNK_SIZE):
+            if not chunk:
+                continue
+            if not chunks and not looks_like_html(chunk):
+                raise FetchRejected("Body does not look like HTML")
+
+            decoded_size += len(chunk)
+            if response.raw.tell() > max_bytes:
+                raise FetchRejected(f"Body exceeds {max_bytes} bytes")
+            if decoded_size > max_decoded_bytes:
+                raise FetchRejected(f"Decoded body exceeds {max_decoded_bytes} bytes")
+            chunks.append(chunk)
+
+    return b"".join(chunks), content_type
+
+
+def decode_html(body, content_type=""):
+    """Decodes a raw HTML body with the encoding from the headers, BOM or <meta> tag."""
+    encoding = sniff_encoding(content_type, body[:SNIFF_BYTES])
+    return body.decode(encoding, errors="replace")
+
+
+def fetch_html(url, timeout=REQUEST_TIMEOUT, max_bytes=MAX_BODY_BYTES, max_decoded_bytes=MAX_DECODED_BYTES, session=None):
+    """
+    Downloads a page and returns its decoded HTML (see fetch_page).
+
+    Returns:
+        str: Decoded HTML.
+    """
+    return decode_html(*fetch_page(url, timeout, max_bytes, max_decoded_bytes, session))
@@ -0,0 +1,340 @@
+"""
+On-disk inverted index over extracted article text, for term and phrase search.
+
+Articles are tokenized with the analyzer's tokenizer; stopwords are not indexed
+but still count as positions, so a phrase such as "state of the art" matches
+"state ... art" three tokens apart. Each (term, article) pair stores its token
+positions, and every term keeps its document frequency, so a query only reads
+the postings of its own terms. Articles are indexed as extract_articles saves
+them; sync_index() catches up on anything saved before the index existed.
+"""
+import os
+import re
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+
+from .analyzer import stop_words, tokenize_words
+from .corpus import ARTICLES_DIR, article_version, read_article
+from .metrics import span
+
+FULLTEXT_DB_PATH = os.getenv("ARTICLE_FULLTEXT_DB", os.path.join(".cache", "fulltext_index.sqlite"))
+SYNC_BATCH_SIZE = 500  # articles indexed per transaction
+MAX_CACHED_QUERIES = 32  # results reused across reruns until the index changes
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id INTEGER PRIMARY KEY,
+    url_id TEXT NOT NULL UNIQUE,
+    version TEXT NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS terms (
+    term_id INTEGER PRIMARY KEY,
+    term TEXT NOT NULL UNIQUE,
+    doc_freq INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term_id INTEGER NOT NULL,
+    doc_id INTEGER NOT NULL,
+    positions BLOB NOT NULL,
+    PRIMARY KEY (term_id, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_by_doc ON postings (doc_id);
+"""
+
+QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def index_terms(text):
+    """
+    Positional terms of a text.
+
+    Returns:
+        tuple: ({term: [positions]}, number of tokens)
+    """
+    postings = {}
+    tokens = tokenize_words(text.lower())
+    for position, token in enumerate(tokens):
+        if token not in stop_words:
+            postings.setdefault(token, []).append(position)
+    return postings, len(tokens)
+
+
+def parse_query(query):
+    """
+    Splits a query into phrases; every phrase must match (AND).
+
+    Unquoted words are one-word phrases, "quoted words" must appear in order.
+    Each phrase is a list of (term, offset) pairs; stopwords are dropped but
+    keep their place in the offsets.
+
+    Returns:
+        list: [[(term, offset), ...], ...]
+    """
+    phrases = []
+    for quoted, word in QUERY_PATTERN.findall(query):
+        tokens = tokenize_words((quoted or word).lower())
+        phrase = [(token, offset) for offset, token in enumerate(tokens) if token not in stop_words]
+        if phrase:
+            phrases.append(phrase)
+    return phrases
+
+
+def _decode(blob):
+    positions = array("I")
+    positions.frombytes(blob)
+    return positions
+
+
+class FullTextIndex:
+    def __init__(self, path=FULLTEXT_DB_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self.url_id_of = {}  # doc_id -> URL_ID, filled as queries and writes see documents
+        self.generation = 0  # bumped by every write through this connection
+        self.results = OrderedDict()  # parsed query -> (index state, matching URL_IDs)
+
+    def versions(self):
+        """Returns {URL_ID: version} for every indexed article."""
+        with self.lock:
+            return dict(self.db.execute("SELECT url_id, version FROM documents"))
+
+    def add(self, url_id, text, version=""):
+        """Indexes (or re-indexes) one article."""
+        self.add_many([(url_id, text, version)])
+
+    def add_many(self, articles):
+        """Indexes (or re-indexes) [(url_id, text, version), ...] in one transaction."""
+        tokenized = [(url_id, version, *index_terms(text)) for url_id, text, version in articles]
+        with self.lock, self.db:
+            self.generation += 1
+            for url_id, version, postings, length in tokenized:
+                self._remove(url_id)
+                doc_id = self.db.execute(
+                    "INSERT INTO documents (url_id, version, length) VALUES (?, ?, ?)", (url_id, version or "", length)
+                ).lastrowid
+                self.url_id_of[doc_id] = url_id
+                self.db.executemany(
+                    "INSERT INTO terms (term, doc_freq) VALUES (?, 1) "
+                    "ON CONFLICT(term) DO UPDATE SET doc_freq = doc_freq + 1",
+                    [(term,) for term in postings],
+                )
+                term_ids = self._term_ids(list(postings))
+                self.db.executemany(
+                    "INSERT INTO postings (term_id, doc_id, positions) VALUES (?, ?, ?)",
+                    [(term_ids[term], doc_id, array("I", positions).tobytes()) for term, positions in postings.items()],
+                )
+
+    def remove(self, url_id):
+        with self.lock, self.db:
+            self.generation += 1
+            self._remove(url_id)
+
+    def _remove(self, url_id):
+        row = self.db.execute("SELECT doc_id FROM documents WHERE url_id = ?", (url_id,)).fetchone()
+        if row is None:
+            return
+        doc_id = row[0]
+        self.db.execute(
+            "UPDATE terms SET doc_freq = doc_freq - 1 "
+            "WHERE term_id IN (SELECT term_id FROM postings WHERE doc_id = ?)", (doc_id,)
+        )
+        self.db.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+        self.db.execute("DELETE FROM documents WHERE doc_id = ?", (doc_id,))
+        self.url_id_of.pop(doc_id, None)
+
+    def _lookup(self, sql, values):
+        """Runs `sql` (with one IN ({}) placeholder) over `values` in chunks below SQLite's variable limit."""
+        for start in range(0, len(values), 500):
+            chunk = values[start:start + 500]
+            yield from self.db.execute(sql.format(",".join("?" * len(chunk))), chunk)
+
+    def _term_ids(self, terms):
+        return dict(self._lookup("SELECT term, term_id FROM terms WHERE term IN ({})", terms))
+
+    def _url_ids(self, doc_ids):
+        """URL_IDs of the given articles (None = every article), mostly from the in-memory map."""
+        if doc_ids is None:
+            rows = self.db.execute("SELECT doc_id, url_id FROM documents").fetchall()
+            self.url_id_of.update(rows)
+            return [url_id for _, url_id in rows]
+        # Another process may have added documents since; those are looked up once
+        missing = [doc_id for doc_id in doc_ids if doc_id not in self.url_id_of]
+        if len(missing) > 500:
+            self.url_id_of.update(self.db.execute("SELECT doc_id, url_id FROM documents"))
+        elif missing:
+            self.url_id_of.update(self._lookup("SELECT doc_id, url_id FROM documents WHERE doc_id IN ({})", missing))
+        return [self.url_id_of[doc_id] for doc_id in doc_ids if doc_id in self.url_id_of]
+
+    def document_frequencies(self, terms):
+        """Returns {term: number of articles containing it} (0 for unknown terms and stopwords)."""
+        terms = [term.lower() for term in terms]
+        with self.lock:
+            rows = dict(self._lookup("SELECT term, doc_freq FROM terms WHERE term IN ({})", terms))
+        return {term: rows.get(term, 0) for term in terms}
+
+    def _doc_ids(self, term_id, candidates=None):
+        """Articles containing a term (positions are not read), restricted to `candidates` if given."""
+        if candidates is not None and len(candidates) <= 500:
+            # Few candidates: point lookups on the (term_id, doc_id) key
+            rows = self.db.execute(
+                f"SELECT doc_id FROM postings WHERE term_id = ? AND doc_id IN ({','.join('?' * len(candidates))})",
+                [term_id, *candidates],
+            )
+            return {doc_id for (doc_id,) in rows}
+        found = {doc_id for (doc_id,) in self.db.execute("SELECT doc_id FROM postings WHERE term_id = ?", (term_id,))}
+        return found if candidates is None else found & candidates
+
+    def search(self, query):
+        """
+        URL_IDs of articles matching every term and phrase of `query`.
+
+        Terms are intersected rarest first using article ids only, and a term that
+        occurs in every article is skipped, since it cannot rule any article out.
+        Token positions are read only for phrases. Results are cached until the
+        index changes (here or in another process), so Streamlit reruns repeat no
+        work. Target: a one-word query matching nearly all of 50,000 articles
+        answers in under 50 ms uncached (`python -m benchmarks.perf_suite --stages search`).
+
+        Args:
+            query (str): Words and "quoted phrases", e.g. `climate "carbon tax"`.
+
+        Returns:
+            set: Matching URL_IDs (empty if the query has no indexable terms).
+        """
+        phrases = parse_query(query)
+        if not phrases:
+            return set()
+
+        with self.lock, span("search.query"):
+            key = tuple(tuple(phrase) for phrase in phrases)
+            state = (self.generation, self.db.execute("PRAGMA data_version").fetchone()[0])
+            cached = self.results.get(key)
+            if cached is not None and cached[0] == state:
+                self.results.move_to_end(key)
+                return set(cached[1])
+
+            matches = self._search(phrases)
+            self.results[key] = (state, frozenset(matches))
+            if len(self.results) > MAX_CACHED_QUERIES:
+                self.results.popitem(last=False)
+            return matches
+
+    def _search(self, phrases):
+        """Matching URL_IDs for parsed phrases (the caller holds the lock)."""
+        terms = sorted({term for phrase in phrases for term, _ in phrase})
+        term_ids = self._term_ids(terms)
+        if len(term_ids) < len(terms):
+            return set()  # some term occurs nowhere
+
+        frequencies = dict(self._lookup(
+            "SELECT term_id, doc_freq FROM terms WHERE term_id IN ({})", list(term_ids.values())
+        ))
+        (documents,) = self.db.execute("SELECT COUNT(*) FROM documents").fetchone()
+        candidates = None  # None = every article
+        for term in sorted(terms, key=lambda t: frequencies[term_ids[t]]):
+            if frequencies[term_ids[term]] >= documents:
+                break  # this and every later term occur in every article
+            candidates = self._doc_ids(term_ids[term], candidates)
+            if not candidates:
+                return set()
+
+        for phrase in phrases:
+            if len(phrase) > 1:
+                candidates = self._match_phrase(phrase, term_ids, frequencies, candidates)
+                if not candidates:
+                    return set()
+
+        return set(self._url_ids(candidates))
+
+    def _match_phrase(self, phrase, term_ids, frequencies, candidates):
+        """Candidates (None = every article) where every term of the phrase sits at its offset."""
+        # Rarest term first: its postings drive the join and its position lists are usually the shortest
+        ordered = sorted(phrase, key=lambda item: frequencies[term_ids[item[0]]])
+        joins = "".join(
+            f" JOIN postings p{i} ON p{i}.term_id = ? AND p{i}.doc_id = p0.doc_id" for i in range(1, len(ordered))
+        )
+        columns = ", ".join(f"p{i}.positions" for i in range(len(ordered)))
+        sql = f"SELECT p0.doc_id, {columns} FROM postings p0{joins} WHERE p0.term_id = ?"
+        values = [term_ids[term] for term, _ in ordered[1:]] + [term_ids[ordered[0][0]]]
+        if candidates is not None and len(candidates) <= 500:
+            sql += f" AND p0.doc_id IN ({','.join('?' * len(candidates))})"
+            values += list(candidates)
+
+        offsets = [offset for _, offset in ordered]
+        matches = set()
+        for doc_id, *blobs in self.db.execute(sql, values):
+            if candidates is not None and doc_id not in candidates:
+                continue
+            starts = {p - offsets[0] for p in _decode(blobs[0])}
+            for blob, offset in zip(blobs[1:], offsets[1:]):
+                starts.intersection_update([p - offset for p in _decode(blob)])
+                if not starts:
+                    break
+            if starts:
+                matches.add(doc_id)
+        return matches
+
+
+def sync_index(url_ids, folder=ARTICLES_DIR, index=None):
+    """
+    Indexes the given articles that are missing from the index or changed since.
+
+    Returns:
+        int: Number of articles (re)indexed.
+    """
+    index = index or get_fulltext_index(folder)
+    known = index.versions()
+    pending = []
+    updated = 0
+    with span("search.sync"):
+        for url_id in map(str, url_ids):
+            version = article_version(url_id, folder)
+            if version is None or known.get(url_id) == version:
+                continue
+            text = read_article(url_id, folder)
+            if text is None:
+                continue
+            pending.append((url_id, text, version))
+            if len(pending) >= SYNC_BATCH_SIZE:
+                index.add_many(pending)
+                updated += len(pending)
+                pending = []
+        if pending:
+            index.add_many(pending)
+            updated += len(pending)
+    return updated
+
+
+def index_article(url_id, text, folder=ARTICLES_DIR):
+    """Adds a freshly saved article to its folder's index (called by extract_articles)."""
+    try:
+        get_fulltext_index(folder).add(str(url_id), text, article_version(url_id, folder) or "")
+    except Exception as e:
+        print(f"⚠️ Could not index article {url_id}: {e}")
+
+
+_indexes = {}
+_index_lock = threading.Lock()
+
+
+def get_fulltext_index(folder=ARTICLES_DIR):
+    """
+    Returns the process-wide full-text index for a corpus folder.
+
+    The default corpus uses FULLTEXT_DB_PATH; any other folder (e.g. a job
+    workspace) keeps its own index next to its articles.
+    """
+    key = os.path.abspath(folder)
+    with _index_lock:
+        if key not in _indexes:
+            same_as_default = key == os.path.abspath(ARTICLES_DIR)
+            path = FULLTEXT_DB_PATH if same_as_default else os.path.join(folder, "fulltext_index.sqlite")
+            _indexes[key] = FullTextIndex(path)
+        return _indexes[key]
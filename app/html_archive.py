@@ -0,0 +1,364 @@
+"""
+Raw HTML archive: every downloaded page, kept so articles can be re-extracted offline.
+
+Layout inside the archive directory:
+    pages.warc.gz    append-only WARC/1.0 "resource" records, one gzip member each
+                     (readable by standard WARC tools)
+    index.sqlite     (URL, URL_ID, fetch time) -> offset and length of the record
+
+Every fetch appends a record, so a URL fetched twice has two versions and
+`before` picks the one current at a given time. Re-extraction parses the
+archived pages with the extractor router in a process pool and writes the
+texts back to the corpus, without touching the network. A single process
+should write to an archive at a time.
+
+Re-extraction only replaces texts and their search index entries: reports,
+keyword statistics and cached metrics still describe the old texts until the
+analysis is run again on the same folder (e.g. `python -m app.streaming
+urls.xlsx --folder extracted_articles`, or a fresh upload in the app).
+
+Usage:
+    ARTICLE_HTML_ARCHIVE=.cache/html_archive streamlit run main.py    # archive while extracting
+    python -m app.html_archive stats
+    python -m app.html_archive reextract --folder extracted_articles [--input urls.xlsx] [--before 2026-10-01]
+"""
+import argparse
+import gzip
+import hashlib
+import itertools
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from base64 import b32encode
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+from .corpus import ARTICLES_DIR, write_article
+from .extractor_router import EXTRACTORS, get_router, parse_html
+from .fetcher import decode_html
+from .fulltext_index import index_article
+from .metrics import span, incr
+from .utils import load_input_excel
+
+# Archive directory; empty disables archiving
+HTML_ARCHIVE_DIR = os.getenv("ARTICLE_HTML_ARCHIVE", "")
+# Extract from the archive only, never from the network
+OFFLINE_EXTRACTION = os.getenv("ARTICLE_OFFLINE", "0") == "1"
+REEXTRACT_WORKERS = int(os.getenv("ARTICLE_REEXTRACT_WORKERS", os.cpu_count() or 1))
+REEXTRACT_WINDOW = 32   # pages in flight per worker process
+WARC_FILE = "pages.warc.gz"
+INDEX_FILE = "index.sqlite"
+COMPRESSION_LEVEL = 6
+
+ArchivedPage = namedtuple("ArchivedPage", ["url", "url_id", "fetched_at", "content_type", "body"])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    url_id TEXT,
+    fetched_at REAL NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    content_type TEXT,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_by_url ON records (url, fetched_at);
+CREATE INDEX IF NOT EXISTS records_by_url_id ON records (url_id, fetched_at);
+"""
+
+
+class NotArchived(Exception):
+    """Raised in offline mode when a URL has no archived page."""
+
+
+def _warc_record(url, url_id, fetched_at, content_type, body):
+    """One WARC/1.0 resource record holding the raw page body."""
+    date = datetime.fromtimestamp(fetched_at, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    digest = b32encode(hashlib.sha1(body).digest()).decode("ascii")
+    headers = [
+        "WARC/1.0",
+        "WARC-Type: resource",
+        f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>",
+        f"WARC-Date: {date}",
+        f"WARC-Target-URI: {url}",
+        f"WARC-Payload-Digest: sha1:{digest}",
+        f"X-Article-URL-ID: {url_id or ''}",
+        f"Content-Type: {content_type or 'text/html'}",
+        f"Content-Length: {len(body)}",
+    ]
+    return ("\r\n".join(headers) + "\r\n\r\n").encode("utf-8") + body + b"\r\n\r\n"
+
+
+def _warc_payload(record):
+    """The body of a WARC record (the bytes after the header block, Content-Length long)."""
+    head, _, rest = record.partition(b"\r\n\r\n")
+    for line in head.split(b"\r\n"):
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            return rest[:int(value)]
+    return rest
+
+
+class HtmlArchive:
+    def __init__(self, folder):
+        os.makedirs(folder, exist_ok=True)
+        self.folder = folder
+        self.warc_path = os.path.join(folder, WARC_FILE)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(os.path.join(folder, INDEX_FILE), check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def append(self, url, body, content_type="", url_id=None, fetched_at=None):
+        """Appends one fetched page; returns its record id."""
+        fetched_at = fetched_at or time.time()
+        member = gzip.compress(_warc_record(url, url_id, fetched_at, content_type, body), COMPRESSION_LEVEL)
+        with self.lock:
+            with open(self.warc_path, "ab") as f:
+                offset = f.tell()
+                f.write(member)
+            # Indexed only once the record is fully written
+            cursor = self.db.execute(
+                "INSERT INTO records (url, url_id, fetched_at, offset, length, content_type, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, None if url_id is None else str(url_id), fetched_at, offset, len(member), content_type, len(body)),
+            )
+            self.db.commit()
+        incr("html_archive_records_total")
+        return cursor.lastrowid
+
+    def _read(self, row):
+        url, url_id, fetched_at, content_type, offset, length = row
+        with open(self.warc_path, "rb") as f:
+            f.seek(offset)
+            member = f.read(length)
+        return ArchivedPage(url, url_id, fetched_at, content_type, _warc_payload(gzip.decompress(member)))
+
+    def latest(self, url, before=None):
+        """
+        The most recent archived fetch of `url` (at or before `before`, a Unix time, if given).
+
+        Returns:
+            ArchivedPage: Or None if the URL was never archived.
+        """
+        with self.lock:
+            row = self.db.execute(
+                "SELECT url, url_id, fetched_at, content_type, offset, length FROM records "
+                "WHERE url = ? AND fetched_at <= ? ORDER BY fetched_at DESC LIMIT 1",
+                (url, before or float("inf")),
+            ).fetchone()
+        return self._read(row) if row else None
+
+    def archived_rows(self, before=None):
+        """Every archived (URL_ID, URL) pair (fetched at or before `before`), in URL_ID order."""
+        with self.lock:
+            return self.db.execute(
+                "SELECT DISTINCT url_id, url FROM records WHERE url_id IS NOT NULL AND fetched_at <= ? "
+                "ORDER BY url_id, url",
+                (before or float("inf"),),
+            ).fetchall()
+
+    def latest_pages(self, rows, before=None):
+        """
+        Yields the most recent archived page of each (URL_ID, URL) row, labelled with the row's URL_ID.
+
+        Pages are looked up by URL: URL_IDs are only unique within one input
+        workbook, and other uploads may have archived other URLs under the same ID.
+
+        Args:
+            rows (iterable): (URL_ID, URL) pairs, e.g. from an input workbook.
+            before (float): Ignore fetches after this Unix time.
+
+        Yields:
+            tuple: (URL_ID, URL, ArchivedPage or None if the URL was never archived)
+        """
+        for url_id, url in rows:
+            page = self.latest(str(url), before)
+            yield str(url_id), str(url), page._replace(url_id=str(url_id)) if page is not None else None
+
+    def stats(self):
+        with self.lock:
+            records, urls, raw_bytes = self.db.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT url), COALESCE(SUM(size), 0) FROM records"
+            ).fetchone()
+        stored = os.path.getsize(self.warc_path) if os.path.exists(self.warc_path) else 0
+        return {"records": records, "urls": urls, "raw_bytes": raw_bytes, "stored_bytes": stored}
+
+
+_archives = {}
+_archive_lock = threading.Lock()
+
+
+def get_html_archive(folder=None):
+    """Returns the process-wide archive for a directory (HTML_ARCHIVE_DIR by default), or None if disabled."""
+    folder = folder or HTML_ARCHIVE_DIR
+    if not folder:
+        return None
+    key = os.path.abspath(folder)
+    with _archive_lock:
+        if key not in _archives:
+            _archives[key] = HtmlArchive(folder)
+        return _archives[key]
+
+
+def archive_page(url_id, url, body, content_type=""):
+    """Archives a freshly downloaded page when archiving is enabled (called by extract_articles)."""
+    archive = get_html_archive()
+    if archive is None:
+        return
+    try:
+        with span("scraper.archive"):
+            archive.append(url, body, content_type, url_id)
+    except Exception as e:
+        print(f"⚠️ Could not archive page for {url_id}: {e}")
+
+
+def load_archived_html(url):
+    """
+    Decoded HTML of the latest archived fetch of `url` (offline mode).
+
+    Raises:
+        NotArchived: If archiving is disabled or the URL was never archived.
+    """
+    archive = get_html_archive()
+    page = archive.latest(url) if archive is not None else None
+    if page is None:
+        raise NotArchived(f"{url} is not in the HTML archive (offline mode)")
+    return decode_html(page.body, page.content_type)
+
+
+# ♻️ Offline re-extraction
+def _parse_page(html, url, plan):
+    """Process-pool entry point: parse one page, return the text and the tries."""
+    text, name, attempts, last_error = parse_html(html, url, plan)
+    return text, name, attempts, None if last_error is None else str(last_error)
+
+
+def reextract(rows=None, save_dir=ARTICLES_DIR, archive=None, before=None, workers=REEXTRACT_WORKERS,
+              extractors=None):
+    """
+    Re-runs extraction on archived pages and saves the texts, without any downloads.
+
+    Pages are parsed in a process pool (parsing is CPU-bound); texts are saved
+    and indexed by this process, which also records the tries in the extractor router.
+    Metrics are not recomputed: rerun the analysis on `save_dir` afterwards.
+
+    Args:
+        rows (iterable): (URL_ID, URL) pairs to re-extract, e.g. from the input workbook.
+            By default every archived pair; URL_IDs archived for several URLs
+            (reused by different uploads) are then skipped, as their text is ambiguous.
+        save_dir (str): Corpus folder the texts are written to.
+        archive (HtmlArchive): Defaults to the HTML_ARCHIVE_DIR archive.
+        before (float): Use the latest fetch at or before this Unix time.
+        workers (int): Parser processes (1 parses in this process).
+        extractors (list): Extractor names to try, in order; defaults to the router's plan per URL.
+
+    Returns:
+        list: [(URL_ID, status message), ...]; skipped rows are reported too.
+    """
+    archive = archive or get_html_archive()
+    if archive is None:
+        raise ValueError("No HTML archive configured (set ARTICLE_HTML_ARCHIVE)")
+    router = get_router()
+    messages = []
+
+    if rows is None:
+        urls_by_id = {}
+        for url_id, url in archive.archived_rows(before):
+            urls_by_id.setdefault(url_id, []).append(url)
+        rows = []
+        for url_id, urls in urls_by_id.items():
+            if len(urls) == 1:
+                rows.append((url_id, urls[0]))
+            else:
+                messages.append((url_id, f"⚠️ Archived for {len(urls)} different URLs; use --input to pick one"))
+
+    def tasks():
+        for url_id, url, page in archive.latest_pages(rows, before):
+            if page is None:
+                messages.append((url_id, "⚠️ Page not in the archive"))
+                continue
+            plan = list(extractors) if extractors else router.plan(page.url)
+            yield url_id, page.url, decode_html(page.body, page.content_type), plan
+
+    def save(url_id, url, outcome):
+        text, name, attempts, error = outcome
+        for attempt in attempts:
+            router.record(url, *attempt)
+        if name is None:
+            return url_id, f"❌ Failed to extract content: {error}" if error else "⚠️ Extracted content too short"
+        write_article(url_id, text, folder=save_dir)
+        index_article(url_id, text, folder=save_dir)
+        return url_id, f"✅ Re-extracted with {EXTRACTORS[name].label}"
+
+    with span("archive.reextract"):
+        if workers > 1:
+            # Pages are decoded and sent to the pool a window at a time, bounding memory
+            pending = tasks()
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                while True:
+                    window = list(itertools.islice(pending, workers * REEXTRACT_WINDOW))
+                    if not window:
+                        break
+                    outcomes = pool.map(
+                        _parse_page,
+                        [html for _, _, html, _ in window], [url for _, url, _, _ in window],
+                        [plan for _, _, _, plan in window], chunksize=8,
+                    )
+                    for (url_id, url, _, _), outcome in zip(window, outcomes):
+                        messages.append(save(url_id, url, outcome))
+        else:
+            for url_id, url, html, plan in tasks():
+                messages.append(save(url_id, url, _parse_page(html, url, plan)))
+    router.save()
+    return messages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Raw HTML archive and offline re-extraction.")
+    parser.add_argument("--archive", default=HTML_ARCHIVE_DIR or os.path.join(".cache", "html_archive"))
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("stats", help="Show archive size.")
+
+    redo = commands.add_parser(
+        "reextract", help="Re-extract article texts from archived pages (rerun the analysis afterwards)."
+    )
+    redo.add_argument("--folder", default=ARTICLES_DIR, help="Corpus folder to write the texts to.")
+    redo.add_argument("--input", help="Workbook whose URL_ID/URL rows to re-extract (default: all archived).")
+    redo.add_argument("--before", help="Use the latest fetch at or before this date (ISO format).")
+    redo.add_argument("--workers", type=int, default=REEXTRACT_WORKERS)
+    redo.add_argument("--extractors", help=f"Comma-separated extractors to try, in order ({', '.join(EXTRACTORS)}).")
+    args = parser.parse_args(argv)
+
+    archive = HtmlArchive(args.archive)
+    if args.command == "stats":
+        stats = archive.stats()
+        ratio = stats["raw_bytes"] / max(stats["stored_bytes"], 1)
+        print(f"📦 {stats['records']} records, {stats['urls']} URLs, "
+              f"{stats['raw_bytes'] / 1e6:.1f} MB raw -> {stats['stored_bytes'] / 1e6:.1f} MB stored ({ratio:.1f}x)")
+    elif args.command == "reextract":
+        rows = None
+        if args.input:
+            df = load_input_excel(args.input).dropna(subset=["URL_ID", "URL"])
+            rows = list(zip(df["URL_ID"].astype(str), df["URL"]))
+        before = datetime.fromisoformat(args.before).timestamp() if args.before else None
+        extractors = args.extractors.split(",") if args.extractors else None
+        unknown = set(extractors or ()) - set(EXTRACTORS)
+        if unknown:
+            parser.error(f"unknown extractors: {', '.join(sorted(unknown))}")
+        start = time.perf_counter()
+        messages = reextract(rows, args.folder, archive, before, args.workers, extractors)
+        extracted = sum(message.startswith("✅") for _, message in messages)
+        print(f"✅ Re-extracted {extracted}/{len(messages)} articles in {time.perf_counter() - start:.1f}s")
+        print(f"ℹ️ Rerun the analysis on {args.folder} to update metrics and reports for the new texts.")
+
+
+if __name__ == "__main__":
+    main()
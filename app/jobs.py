@@ -0,0 +1,358 @@
+"""
+Background jobs: article extraction and analysis outside the Streamlit script run.
+
+A job is tracked by ID in a process-wide JobRegistry (shared by every session via
+st.cache_resource), so it keeps running across reruns and is never started twice
+for the same input. Articles are processed on a shared worker pool; each finished
+article adds its result row to the job immediately, and cancelling stops every
+article that has not started yet. Per-URL extraction and metrics come from the
+shared article cache, so overlapping uploads from different sessions scrape and
+analyze each URL once. Every job writes into its own workspace (article refs
+and report), so concurrent jobs never touch each other's files.
+"""
+import contextvars
+import hashlib
+import os
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import pandas as pd
+import streamlit as st
+
+from .approx_summary import Reservoir
+from .analyzer import OUTPUT_COLUMNS, METRIC_COLUMNS, analyze_text, profile_columns
+from .corpus import has_article, article_version, get_store
+from .dedupe import NearDuplicateIndex, DEDUPE_ENABLED
+from .extractor_router import get_router
+from .keyword_extractor import KEYWORD_BACKEND, extract_keywords_batch
+from .tfidf_keywords import DocumentFrequencies
+from .fulltext_index import index_article
+from .metrics import span
+from .scraper import extract_article_text
+from .shared_cache import ArticleRecord, get_shared_cache
+from .workspace import REPORT_NAME, atomic_path, job_dir
+
+JOB_WORKERS = int(os.getenv("ARTICLE_JOB_WORKERS", 4))
+MAX_FINISHED_JOBS = 20
+
+QUEUED, RUNNING, CANCELLING = "queued", "running", "cancelling"
+DONE, CANCELLED, FAILED = "done", "cancelled", "failed"
+FINISHED = (DONE, CANCELLED, FAILED)
+
+
+def input_fingerprint(path):
+    """Content hash of an input file; identical uploads map to the same job."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def job_key(path, profile=None):
+    """Identity of a job: the input's content and the metrics it computes."""
+    return f"{input_fingerprint(path)}:{','.join(profile_columns(profile))}"
+
+
+class Job:
+    def __init__(self, job_id, key, label, rows, articles_dir, report_path, columns=tuple(METRIC_COLUMNS),
+                 keyword_backend=None):
+        self.id = job_id
+        self.key = key
+        self.label = label
+        self.rows_in = rows              # [(URL_ID, URL), ...] in input order
+        self.total = len(rows)
+        self.articles_dir = articles_dir
+        self.report_path = report_path
+        self.columns = columns           # metrics this job computes (its analysis profile)
+        self.lock = threading.Lock()
+        self.cancel_event = threading.Event()
+        self.status = QUEUED
+        self.completed = 0
+        self.extracted = 0
+        self.results = {}                # input position -> result row
+        self.messages = []               # (URL_ID, extraction status)
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.futures = []
+        self.dedupe = NearDuplicateIndex() if DEDUPE_ENABLED else None
+        self.metrics_by_id = {}
+        self.leases = []                 # URLs referenced in the shared article cache
+        self.frame = None
+        self.sample = Reservoir(seed=job_id)  # (URL_ID, polarity) of finished articles, for approximate summaries
+        self.keyword_backend = keyword_backend or KEYWORD_BACKEND  # extracted for sampled articles by workers
+        self.sample_keywords = {}        # keyword backend -> {URL_ID: keywords}, for sampled articles only
+        self.sample_frequencies = {}     # keyword backend -> DocumentFrequencies of every sampled article (TF-IDF)
+
+    @property
+    def finished(self):
+        return self.status in FINISHED
+
+    def cancel(self):
+        """Stops articles that have not started; running ones finish and keep their rows."""
+        self.cancel_event.set()
+        for future in self.futures:
+            future.cancel()
+        with self.lock:
+            if not self.finished:
+                self.status = CANCELLING
+
+    def progress(self):
+        with self.lock:
+            return self.completed / max(self.total, 1)
+
+    def snapshot(self):
+        """Consistent copy of the job's state for display."""
+        with self.lock:
+            return {
+                "id": self.id,
+                "label": self.label,
+                "status": self.status,
+                "completed": self.completed,
+                "extracted": self.extracted,
+                "total": self.total,
+                "messages": list(self.messages),
+                "error": self.error,
+                "elapsed": (self.finished_at or time.time()) - self.created_at,
+            }
+
+    def result_frame(self):
+        """
+        Completed result rows so far, in input order.
+
+        Once the job has finished the frame is built once and the same object is
+        returned to every session, so sessions attached to one job share its memory.
+        """
+        if self.frame is not None:
+            return self.frame
+        with self.lock:
+            rows = [self.results[position] for position in sorted(self.results)]
+            finished = self.finished
+        df = pd.DataFrame(rows, columns=OUTPUT_COLUMNS)
+        df["URL_ID"] = df["URL_ID"].astype(str)
+        df[METRIC_COLUMNS] = df[METRIC_COLUMNS].apply(pd.to_numeric, errors="coerce")
+        if finished:
+            self.frame = df
+        return df
+
+    def _record(self, url_id, success, message, position=None, row=None):
+        """Counts a finished article; returns True if its row entered the summary sample."""
+        with self.lock:
+            self.completed += 1
+            self.extracted += bool(success)
+            self.messages.append((url_id, message))
+            if row is not None:
+                self.results[position] = row
+        if row is not None:
+            return self.sample.add((url_id, row[OUTPUT_COLUMNS.index("POLARITY SCORE")]))
+        return False
+
+    def _sample_keywords(self, url_id, text):
+        """Extracts a newly sampled article's keywords in the worker, so the progress panel does not have to."""
+        try:
+            with span("summary.sample_keywords"):
+                frequencies = self.sample_frequencies.setdefault(self.keyword_backend, DocumentFrequencies())
+                keywords = extract_keywords_batch(
+                    [text or ""], backend=self.keyword_backend, document_frequencies=frequencies
+                )[0]
+        except Exception as e:
+            print(f"⚠️ Could not extract keywords for sampled article {url_id}: {e}")
+            return
+        self.sample_keywords.setdefault(self.keyword_backend, {})[url_id] = keywords
+
+
+def _extract_and_analyze(url_id, url, save_dir, columns=None):
+    """
+    Computes the shared, immutable record for one URL (metrics outside `columns` are None).
+
+    The text is saved to the job's content-addressed corpus by the extraction;
+    the record only keeps its hash.
+    """
+    try:
+        success, message, text = extract_article_text(url_id, url, save_dir=save_dir)
+    except Exception as e:
+        return ArticleRecord(url, False, f"❌ Failed to extract article: {e}", None, None)
+
+    if text is None:
+        return ArticleRecord(url, False, message, None, None)
+
+    digest = article_version(url_id, save_dir)
+    try:
+        return ArticleRecord(url, True, message, digest, tuple(analyze_text(text, columns)))
+    except Exception as e:
+        return ArticleRecord(url, False, f"❌ Failed to analyze article {url_id}: {e}", digest, None)
+
+
+def _process_article(job, cache, position, url_id, url, save_dir):
+    """Fetches one article's record from the shared cache and adds its row to the job."""
+    if job.cancel_event.is_set():
+        return
+
+    record = cache.acquire(url, lambda: _extract_and_analyze(url_id, url, save_dir, job.columns))
+    with job.lock:
+        job.leases.append(url)
+
+    if record.digest is None or record.metrics is None:
+        job._record(url_id, record.digest is not None, record.message)
+        return
+
+    # The text is read back from the object store only by the steps that need it
+    store = get_store(save_dir)
+    text = None
+
+    # A record cached by a job with a narrower profile: compute only what this job adds
+    record_metrics = record.metrics
+    if any(record_metrics[METRIC_COLUMNS.index(column)] is None for column in job.columns):
+        text = store.read_object(record.digest)
+        try:
+            record_metrics = tuple(analyze_text(text, job.columns, list(record_metrics)))
+        except Exception as e:
+            job._record(url_id, True, f"❌ Failed to analyze article {url_id}: {e}")
+            return
+
+    # Records computed for another session's URL_ID are linked under this one too
+    if not has_article(url_id, save_dir):
+        text = text if text is not None else store.read_object(record.digest)
+        if text is None:
+            job._record(url_id, False, f"❌ Article text for {url_id} is no longer in the object store")
+            return
+        store.link(url_id, record.digest)
+        index_article(url_id, text, folder=save_dir)
+
+    duplicate_of, metrics = None, None
+    if job.dedupe is not None:
+        text = text if text is not None else store.read_object(record.digest)
+        with job.lock, span("analyzer.dedupe"):
+            duplicate_of = job.dedupe.add(url_id, text or "")
+            metrics = job.metrics_by_id.get(duplicate_of)
+    if metrics is None:
+        duplicate_of = None
+        metrics = record_metrics
+        with job.lock:
+            job.metrics_by_id[url_id] = metrics
+
+    row = [url_id, url] + list(metrics) + [duplicate_of or ""]
+    if job._record(url_id, True, record.message, position, row):
+        job._sample_keywords(url_id, text if text is not None else store.read_object(record.digest))
+
+
+class JobRegistry:
+    def __init__(self, max_workers=JOB_WORKERS, cache=None):
+        self.cache = cache if cache is not None else get_shared_cache()
+        self.executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="article-job")
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def running_ids(self):
+        """IDs of jobs that have not finished (their workspaces must not be cleaned up)."""
+        with self.lock:
+            return [job_id for job_id, job in self.jobs.items() if not job.finished]
+
+    def find(self, key):
+        """Latest running or completed job for an input, ignoring cancelled and failed ones."""
+        with self.lock:
+            for job in reversed(self.jobs.values()):
+                if job.key == key and job.status not in (CANCELLED, FAILED, CANCELLING):
+                    return job
+        return None
+
+    def submit(self, path, profile=None, keyword_backend=None):
+        """
+        Starts extraction + analysis of an input workbook, or returns the job already doing it.
+
+        The job's article texts (content-addressed refs) and Excel report live in
+        its own workspace: Job.articles_dir and Job.report_path.
+
+        Args:
+            path (str): Input workbook with URL_ID and URL columns.
+            profile (str): Analysis profile; defaults to ANALYSIS_PROFILE.
+            keyword_backend (str): Backend the workers extract sampled articles' keywords with.
+
+        Returns:
+            Job: The new or existing job.
+        """
+        key = job_key(path, profile)
+        existing = self.find(key)
+        if existing is not None:
+            return existing
+
+        df = pd.read_excel(path)
+        rows = list(zip(df["URL_ID"].astype(str), df["URL"]))
+        job_id = uuid.uuid4().hex[:12]
+        articles_dir = job_dir(job_id, "articles")
+        get_store(articles_dir, backend="cas")
+        job = Job(
+            job_id, key, os.path.basename(path), rows, articles_dir,
+            os.path.join(job_dir(job_id), REPORT_NAME), profile_columns(profile), keyword_backend,
+        )
+        with self.lock:
+            self.jobs[job.id] = job
+            self._prune()
+
+        # The job runs in a copy of the submitting run's context, so its spans reach that
+        # run's timing, memory and profiling collectors
+        threading.Thread(
+            target=contextvars.copy_context().run, args=(self._run, job), name=f"job-{job.id}", daemon=True,
+        ).start()
+        return job
+
+    def _run(self, job):
+        with job.lock:
+            if job.status == QUEUED:
+                job.status = RUNNING
+        try:
+            # Shuffled, so the articles finished at any moment are a random subset of the batch
+            order = list(enumerate(job.rows_in))
+            random.Random(job.id).shuffle(order)
+            job.futures = [
+                self.executor.submit(
+                    contextvars.copy_context().run,
+                    _process_article, job, self.cache, position, url_id, url, job.articles_dir,
+                )
+                for position, (url_id, url) in order
+            ]
+            wait(job.futures)
+
+            # Partial results of a cancelled job are still written out
+            with span("report.excel_write"), atomic_path(job.report_path) as tmp_path:
+                job.result_frame().to_excel(tmp_path, index=False)
+            get_router().save()
+
+            with job.lock:
+                job.status = CANCELLED if job.cancel_event.is_set() else DONE
+        except Exception as e:
+            with job.lock:
+                job.status = FAILED
+                job.error = str(e)
+        finally:
+            wait(job.futures)
+            self._release(job)
+            with job.lock:
+                job.finished_at = time.time()
+
+    def _release(self, job):
+        """Drops the job's references in the shared cache; its rows and report no longer need them."""
+        with job.lock:
+            leases, job.leases = job.leases, []
+        for url in leases:
+            self.cache.release(url)
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            self.jobs.pop(job_id)
+
+
+@st.cache_resource
+def get_job_registry():
+    """Returns the job registry shared by all sessions of this server process."""
+    return JobRegistry()
@@ -1,14 +1,20 @@
+import os
 import re
 import string
-import yake
 import nltk
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
 from collections import defaultdict
 
 from .nltk_setup import ensure_nltk_resources
+from .metrics import span
+from .nlp_models import get_yake_extractor
+from .long_documents import cap_text
 ensure_nltk_resources()
 
+KEYWORD_BACKENDS = ("yake", "tfidf")
+KEYWORD_BACKEND = os.getenv("ARTICLE_KEYWORD_BACKEND", "yake")
+
 # Initialize resources
 stop_words = set(stopwords.words("english"))
 lemmatizer = WordNetLemmatizer()
@@ -59,10 +65,11 @@ def extract_keywords_from_text(text, max_keywords=10, language="en", min_char_le
     if not text or not isinstance(text, str):
         return []
 
-    text = normalize_keyword(text)
+    text = normalize_keyword(cap_text(text))
 
-    kw_extractor = yake.KeywordExtractor(lan=language, n=2, top=max_keywords * 4)
-    raw_keywords = kw_extractor.extract_keywords(text)
+    with span("keywords.yake"):
+        kw_extractor = get_yake_extractor(language, 2, max_keywords * 4)
+        raw_keywords = kw_extractor.extract_keywords(text)
 
     seen = set()
     keyword_freq = defaultdict(int)
@@ -99,4 +106,41 @@ def extract_keywords_from_text(text, max_keywords=10, language="en", min_char_le
     return (
         sorted(keyword_freq.items(), key=lambda x: -x[1]) if return_with_freq
         else list(keyword_freq.keys())
-    )
\ No newline at end of file
+    )
+
+
+# 📚 Batch: pick a keyword backend for many documents at once
+def extract_keywords_batch(texts, max_keywords=10, backend=None, min_char_length=3, min_word_count=1,
+                           document_frequencies=None, count_documents=None):
+    """
+    Extracts keywords for a batch of texts with the selected backend.
+
+    "yake" scores each document on its own (highest fidelity); "tfidf" ranks
+    terms over one sparse matrix for the whole batch (much faster on large batches),
+    with IDF from `document_frequencies` (see app.tfidf_keywords) when given.
+
+    Args:
+        texts (list[str]): Input texts.
+        max_keywords (int): Maximum number of keywords per text.
+        backend (str): "yake" or "tfidf"; defaults to KEYWORD_BACKEND.
+        min_char_length (int): Minimum character length for keyword.
+        min_word_count (int): Minimum number of words in phrase.
+        document_frequencies: Corpus-level document frequency store (tfidf only).
+        count_documents (list[bool]): Texts to add to that store first (tfidf only).
+
+    Returns:
+        List[List[str]]: Keywords per text, in input order.
+    """
+    backend = backend or KEYWORD_BACKEND
+    if backend == "tfidf":
+        from .tfidf_keywords import extract_keywords_tfidf
+        return extract_keywords_tfidf(
+            [cap_text(text) for text in texts], max_keywords, min_char_length, min_word_count,
+            document_frequencies, count_documents,
+        )
+    if backend != "yake":
+        raise ValueError(f"Unknown keyword backend: {backend!r} (expected one of {KEYWORD_BACKENDS})")
+    return [
+        extract_keywords_from_text(text, max_keywords, min_char_length=min_char_length, min_word_count=min_word_count)
+        for text in texts
+    ]
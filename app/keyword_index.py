@@ -0,0 +1,288 @@
+"""
+Persistent, incrementally maintained keyword counts for the article corpus.
+
+Every keyword backend has its own aggregate (a separate SQLite file), so
+switching backends neither recounts nor mixes the other backend's keywords.
+Each article's keywords are stored once together with the corpus version they
+were extracted from, and a running total per keyword is kept alongside. Adding,
+changing or removing an article only touches that article's keywords, and
+top-k queries (corpus-wide or for a set of URL_IDs) never read article text.
+
+The aggregate also keeps corpus-level document frequencies, from which the
+TF-IDF backend takes IDF, so articles are ranked against the whole corpus
+rather than against the batch they were synced in. Each URL_ID's terms are
+counted when it first enters the aggregate; rewritten or removed articles are
+not subtracted, which only shifts IDF slightly for a churning corpus.
+"""
+import os
+import sqlite3
+import threading
+from collections import Counter, OrderedDict
+
+from .corpus import ARTICLES_DIR, article_version, read_article
+from .keyword_extractor import KEYWORD_BACKEND, extract_keywords_batch
+from .metrics import span
+
+KEYWORD_DB_PATH = os.getenv("ARTICLE_KEYWORD_DB", os.path.join(".cache", "keyword_aggregate.sqlite"))
+SYNC_BATCH_SIZE = 500  # articles extracted together (one TF-IDF matrix per batch, IDF from the whole corpus)
+MAX_CACHED_SELECTIONS = 8  # filtered top-k results kept per aggregate (one per frame and k)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    url_id TEXT PRIMARY KEY,
+    version TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS article_keywords (
+    url_id TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (url_id, keyword)
+);
+CREATE INDEX IF NOT EXISTS article_keywords_by_keyword ON article_keywords (keyword);
+CREATE TABLE IF NOT EXISTS keyword_totals (
+    keyword TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS keyword_totals_by_count ON keyword_totals (count DESC, keyword);
+CREATE TABLE IF NOT EXISTS document_frequency (
+    term TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS corpus_stats (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+class KeywordAggregate:
+    def __init__(self, path=KEYWORD_DB_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript(SCHEMA)
+        self.generation = 0              # bumped by every change; invalidates cached selections
+        self.url_ids = None              # URL_IDs in the aggregate, loaded on first use
+        self.selections = OrderedDict()  # (URL_ID set, k) -> (generation, top-k rows)
+
+    def versions(self):
+        """Returns {URL_ID: version} for every article in the aggregate."""
+        with self.lock:
+            return dict(self.db.execute("SELECT url_id, version FROM articles"))
+
+    def keywords_for(self, url_id):
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT keyword FROM article_keywords WHERE url_id = ? ORDER BY count DESC, keyword", (str(url_id),)
+            )
+            return [keyword for (keyword,) in rows]
+
+    def update(self, url_id, version, keywords):
+        """Replaces an article's keywords and adjusts the running totals."""
+        url_id = str(url_id)
+        counts = {}
+        for keyword in keywords:
+            counts[keyword] = counts.get(keyword, 0) + 1
+
+        with self.lock, self.db:
+            self._subtract(url_id)
+            self.db.executemany(
+                "INSERT INTO article_keywords (url_id, keyword, count) VALUES (?, ?, ?)",
+                [(url_id, keyword, n) for keyword, n in counts.items()],
+            )
+            self.db.executemany(
+                "INSERT INTO keyword_totals (keyword, count) VALUES (?, ?) "
+                "ON CONFLICT(keyword) DO UPDATE SET count = count + excluded.count",
+                list(counts.items()),
+            )
+            self.db.execute(
+                "INSERT INTO articles (url_id, version) VALUES (?, ?) "
+                "ON CONFLICT(url_id) DO UPDATE SET version = excluded.version",
+                (url_id, version),
+            )
+            self._changed(url_id, present=True)
+
+    def remove(self, url_id):
+        with self.lock, self.db:
+            self._subtract(str(url_id))
+            self.db.execute("DELETE FROM articles WHERE url_id = ?", (str(url_id),))
+            self._changed(str(url_id), present=False)
+
+    def _changed(self, url_id, present):
+        self.generation += 1
+        if self.url_ids is not None:
+            (self.url_ids.add if present else self.url_ids.discard)(url_id)
+
+    def _subtract(self, url_id):
+        old = self.db.execute("SELECT keyword, count FROM article_keywords WHERE url_id = ?", (url_id,)).fetchall()
+        if not old:
+            return
+        self.db.executemany("UPDATE keyword_totals SET count = count - ? WHERE keyword = ?", [(n, k) for k, n in old])
+        self.db.execute("DELETE FROM keyword_totals WHERE count <= 0")
+        self.db.execute("DELETE FROM article_keywords WHERE url_id = ?", (url_id,))
+
+    def count_documents(self, term_sets):
+        """Adds documents (each given as the set of its terms) to the corpus document frequencies."""
+        frequencies = Counter(term for terms in term_sets for term in set(terms))
+        with self.lock, self.db:
+            self.db.executemany(
+                "INSERT INTO document_frequency (term, count) VALUES (?, ?) "
+                "ON CONFLICT(term) DO UPDATE SET count = count + excluded.count",
+                list(frequencies.items()),
+            )
+            self.db.execute(
+                "INSERT INTO corpus_stats (key, value) VALUES ('documents', ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = value + excluded.value",
+                (len(term_sets),),
+            )
+
+    def document_frequencies(self, terms):
+        """Returns ([document frequency of each term], number of documents counted)."""
+        with self.lock, self.db:
+            self.db.execute("CREATE TEMP TABLE IF NOT EXISTS lookup_terms (term TEXT PRIMARY KEY)")
+            self.db.execute("DELETE FROM lookup_terms")
+            self.db.executemany("INSERT OR IGNORE INTO lookup_terms VALUES (?)", [(t,) for t in terms])
+            found = dict(self.db.execute(
+                "SELECT df.term, df.count FROM document_frequency df JOIN lookup_terms l ON l.term = df.term"
+            ))
+            row = self.db.execute("SELECT value FROM corpus_stats WHERE key = 'documents'").fetchone()
+        return [found.get(term, 0) for term in terms], row[0] if row else 0
+
+    def top_k(self, k=10, url_ids=None):
+        """
+        Most common keywords across the corpus, or across `url_ids` only.
+
+        A selection that covers every article in the aggregate (e.g. a job's whole
+        result frame) is answered from the running totals. Other selections are
+        summed once and cached until the aggregate changes, so re-rendering the
+        same frame does not re-read its URL_IDs' keywords.
+
+        Returns:
+            list: [(keyword, count), ...] sorted by count, then keyword.
+        """
+        selected = None if url_ids is None else frozenset(str(u) for u in url_ids)
+        with self.lock:
+            if self.url_ids is None:
+                self.url_ids = {url_id for (url_id,) in self.db.execute("SELECT url_id FROM articles")}
+            if selected is None or selected >= self.url_ids:
+                rows = self.db.execute(
+                    "SELECT keyword, count FROM keyword_totals ORDER BY count DESC, keyword LIMIT ?", (k,)
+                )
+                return list(rows)
+
+            cached = self.selections.get((selected, k))
+            if cached is not None and cached[0] == self.generation:
+                self.selections.move_to_end((selected, k))
+                return cached[1]
+
+            with self.db:
+                self.db.execute("CREATE TEMP TABLE IF NOT EXISTS selected (url_id TEXT PRIMARY KEY)")
+                self.db.execute("DELETE FROM selected")
+                self.db.executemany("INSERT OR IGNORE INTO selected VALUES (?)", [(u,) for u in selected])
+                rows = self.db.execute(
+                    "SELECT ak.keyword, SUM(ak.count) AS total FROM article_keywords ak "
+                    "JOIN selected s ON s.url_id = ak.url_id "
+                    "GROUP BY ak.keyword ORDER BY total DESC, ak.keyword LIMIT ?", (k,)
+                ).fetchall()
+            self.selections[(selected, k)] = (self.generation, rows)
+            if len(self.selections) > MAX_CACHED_SELECTIONS:
+                self.selections.popitem(last=False)
+            return rows
+
+
+def sync_keywords(url_ids, duplicate_of=None, folder=ARTICLES_DIR, aggregate=None, backend=None):
+    """
+    Brings the aggregate up to date for `url_ids`, extracting keywords only for
+    articles that are new or changed since they were last counted.
+
+    Args:
+        url_ids (iterable): Articles that should be represented.
+        duplicate_of (dict): {URL_ID: canonical URL_ID}; duplicates copy the canonical's keywords.
+        folder (str): Corpus folder.
+        aggregate (KeywordAggregate): Defaults to the process-wide aggregate of `backend`.
+        backend (str): Keyword backend ("yake" or "tfidf"); defaults to KEYWORD_BACKEND.
+
+    Returns:
+        int: Number of articles whose keywords were (re)computed.
+    """
+    backend = backend or KEYWORD_BACKEND
+    aggregate = aggregate or get_keyword_aggregate(folder, backend)
+    duplicate_of = duplicate_of or {}
+    known = aggregate.versions()
+    updated = 0
+
+    stale_originals, stale_duplicates = [], []
+    for url_id in (str(u) for u in url_ids):
+        corpus_version = article_version(url_id, folder)
+        if corpus_version is None:
+            if url_id in known:
+                aggregate.remove(url_id)
+            continue
+        version = f"{backend}:{corpus_version}"
+        if known.get(url_id) != version:
+            (stale_duplicates if url_id in duplicate_of else stale_originals).append((url_id, version))
+
+    # Originals first, in batches, so duplicates can copy their freshly extracted keywords
+    for start in range(0, len(stale_originals), SYNC_BATCH_SIZE):
+        batch = []
+        for url_id, version in stale_originals[start:start + SYNC_BATCH_SIZE]:
+            text = read_article(url_id, folder)
+            if text is not None:
+                batch.append((url_id, version, text))
+
+        with span("keywords.aggregate_update"):
+            keywords_per_article = extract_keywords_batch(
+                [text for _, _, text in batch], backend=backend,
+                document_frequencies=aggregate, count_documents=[url_id not in known for url_id, _, _ in batch],
+            )
+
+        for (url_id, version, _), keywords in zip(batch, keywords_per_article):
+            aggregate.update(url_id, version, keywords)
+            known[url_id] = version
+            updated += 1
+
+    for url_id, version in stale_duplicates:
+        canonical = duplicate_of[url_id]
+        if canonical in known:
+            keywords = aggregate.keywords_for(canonical)
+        else:
+            text = read_article(url_id, folder)
+            if text is None:
+                continue
+            with span("keywords.aggregate_update"):
+                keywords = extract_keywords_batch(
+                    [text], backend=backend, document_frequencies=aggregate, count_documents=[url_id not in known]
+                )[0]
+
+        aggregate.update(url_id, version, keywords)
+        known[url_id] = version
+        updated += 1
+    return updated
+
+
+_aggregates = {}
+_aggregate_lock = threading.Lock()
+
+
+def get_keyword_aggregate(folder=ARTICLES_DIR, backend=None):
+    """
+    Returns the process-wide keyword aggregate of a keyword backend for a corpus folder.
+
+    The default corpus uses KEYWORD_DB_PATH; any other folder (e.g. a job
+    workspace) keeps its own aggregates next to its articles, so URL_IDs of
+    different workspaces never mix. Each backend gets its own file, named
+    after the backend (keyword_aggregate.yake.sqlite, ...).
+
+    Args:
+        folder (str): Corpus folder.
+        backend (str): Keyword backend; defaults to KEYWORD_BACKEND.
+    """
+    backend = backend or KEYWORD_BACKEND
+    key = (os.path.abspath(folder), backend)
+    with _aggregate_lock:
+        if key not in _aggregates:
+            same_as_default = key[0] == os.path.abspath(ARTICLES_DIR)
+            path = KEYWORD_DB_PATH if same_as_default else os.path.join(folder, "keyword_aggregate.sqlite")
+            root, ext = os.path.splitext(path)
+            _aggregates[key] = KeywordAggregate(f"{root}.{backend}{ext}")
+        return _aggregates[key]
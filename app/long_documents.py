@@ -0,0 +1,136 @@
+"""
+Long-document mode: capping and sentence-aligned chunking of very long texts.
+
+Long reports and full transcripts are analyzed chunk by chunk instead of as one
+giant string. Chunks end where the punkt sentence tokenizer starts a sentence,
+each chunk is scored on its own (in a small process pool, since the scoring is
+pure Python), and the analyzer merges the per-chunk counts and sentiment totals.
+Text beyond MAX_ANALYZED_CHARS is not analyzed at all.
+"""
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .metrics import incr
+from .nlp_models import get_model
+
+# Documents longer than this are analyzed in chunks
+LONG_DOCUMENT_CHARS = int(os.getenv("ARTICLE_LONG_DOCUMENT_CHARS", 200_000))
+CHUNK_CHARS = int(os.getenv("ARTICLE_CHUNK_CHARS", 50_000))
+# Text analyzed per document (0 = no cap); applies to metrics and keywords
+MAX_ANALYZED_CHARS = int(os.getenv("ARTICLE_MAX_ANALYZED_CHARS", 2_000_000))
+CHUNK_WORKERS = int(os.getenv("ARTICLE_CHUNK_WORKERS", min(4, os.cpu_count() or 1)))
+
+# Preferred cut points, best first: paragraph break, line break, end of sentence
+BOUNDARY_PATTERNS = (
+    re.compile(r"\n\s*\n"),
+    re.compile(r"\n"),
+    re.compile(r"[.!?][\"'”’)\]]*\s+"),
+)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _cut_point(text, start, limit):
+    """End of the last boundary in text[start:limit], trying each kind of boundary in turn."""
+    window = text[start:limit]
+    for pattern in BOUNDARY_PATTERNS:
+        ends = [match.end() for match in pattern.finditer(window, len(window) // 2)]
+        if ends:
+            return start + ends[-1]
+    space = window.rfind(" ", len(window) // 2)
+    return start + space + 1 if space > 0 else limit
+
+
+def _sentence_cut(text, start, limit):
+    """
+    A sentence start chosen by the punkt tokenizer in the second half of text[start:limit].
+
+    Cutting where punkt itself starts a sentence means each chunk tokenizes into the
+    same sentences as the whole text does. The last two sentences of the window are
+    skipped, since the window may end in the middle of one. Falls back to _cut_point
+    when the window holds no usable boundary (e.g. one very long sentence).
+    """
+    middle = start + (limit - start) // 2
+    spans = list(get_model("punkt").span_tokenize(text[middle:limit]))
+    if len(spans) >= 3:
+        return middle + spans[-2][0]
+    return _cut_point(text, start, limit)
+
+
+def cap_text(text, max_chars=None):
+    """
+    Truncates a text to at most `max_chars` characters, at a boundary.
+
+    Args:
+        text (str): Document text.
+        max_chars (int): Cap; defaults to MAX_ANALYZED_CHARS (0 disables it).
+
+    Returns:
+        str: The text, or its leading part if it was longer than the cap.
+    """
+    max_chars = MAX_ANALYZED_CHARS if max_chars is None else max_chars
+    if not max_chars or len(text) <= max_chars:
+        return text
+    incr("analyzer_truncated_documents_total")
+    return text[:_sentence_cut(text, max(0, max_chars - CHUNK_CHARS), max_chars)]
+
+
+def split_chunks(text, chunk_chars=CHUNK_CHARS):
+    """
+    Splits a text into consecutive chunks of about `chunk_chars` characters.
+
+    Each chunk ends where the punkt sentence tokenizer starts a new sentence (see
+    _sentence_cut), so the chunks split into the same sentences as the whole text.
+
+    Returns:
+        list[str]: Chunks whose concatenation is `text`.
+    """
+    chunks, start = [], 0
+    while len(text) - start > chunk_chars:
+        end = _sentence_cut(text, start, start + chunk_chars)
+        chunks.append(text[start:end])
+        start = end
+    chunks.append(text[start:])
+    return chunks
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a process that runs server threads can copy held locks
+            _pool = ProcessPoolExecutor(max_workers=CHUNK_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def map_chunks(func, chunks, *args):
+    """
+    Applies `func(chunk, *args)` to every chunk, in parallel when CHUNK_WORKERS > 1.
+
+    `func` must be a module-level function so worker processes can import it.
+    If the pool cannot start or a worker dies, the pool is shut down (and
+    rebuilt for the next long document) and the chunks are processed in this
+    process. Exceptions raised by `func` itself reach the caller.
+
+    Returns:
+        list: Results in chunk order.
+    """
+    global _pool
+    if CHUNK_WORKERS > 1 and len(chunks) > 1:
+        pool = None
+        try:
+            pool = _get_pool()
+            return list(pool.map(func, chunks, *([arg] * len(chunks) for arg in args)))
+        except (BrokenProcessPool, OSError) as e:
+            with _pool_lock:
+                if _pool is pool:
+                    _pool = None
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+            print(f"⚠️ Chunk pool unavailable, scoring chunks in-process: {e}")
+    return [func(chunk, *args) for chunk in chunks]
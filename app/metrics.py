@@ -0,0 +1,315 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from .profiling import thread_profiler
+from .workspace import atomic_write
+
+
+# ⚙️ Export locations
+METRICS_DIR = os.getenv("ARTICLE_METRICS_DIR", os.path.join("output", "metrics"))
+SPAN_LOG_FILE = "spans.jsonl"
+PROMETHEUS_FILE = "metrics.prom"
+
+# Histogram buckets in seconds (Prometheus "le" boundaries)
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+MAX_PENDING_EVENTS = 10000
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape_label_value(value):
+    """Escapes a label value for the Prometheus text format (backslash, quote, newline)."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    """Cumulative bucket counts plus sum/count, Prometheus style."""
+
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.total += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class MetricsRegistry:
+    """
+    Process-wide store of counters, histograms and not-yet-exported span events.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = defaultdict(float)
+        self.histograms = {}
+        self.events = deque(maxlen=MAX_PENDING_EVENTS)
+
+    def incr(self, name, value=1, **labels):
+        with self.lock:
+            self.counters[(name, _label_key(labels))] += value
+
+    def observe(self, name, value, **labels):
+        key = (name, _label_key(labels))
+        with self.lock:
+            if key not in self.histograms:
+                self.histograms[key] = Histogram()
+            self.histograms[key].observe(value)
+
+    def record_span(self, name, seconds, labels):
+        self.observe("article_stage_seconds", seconds, stage=name, **labels)
+        with self.lock:
+            self.events.append({"ts": round(time.time(), 3), "span": name, "seconds": round(seconds, 6), **labels})
+
+    def prometheus_text(self):
+        """Renders all metrics in the Prometheus text exposition format."""
+        def fmt(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{k}="{_escape_label_value(v)}"' for k, v in pairs) + "}"
+
+        lines = []
+        with self.lock:
+            seen = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                if name not in seen:
+                    lines.append(f"# TYPE {name} counter")
+                    seen.add(name)
+                lines.append(f"{name}{fmt(labels)} {value:g}")
+
+            for (name, labels), hist in sorted(self.histograms.items()):
+                if name not in seen:
+                    lines.append(f"# TYPE {name} histogram")
+                    seen.add(name)
+                for bound, count in zip(hist.buckets, hist.counts):
+                    lines.append(f"{name}_bucket{fmt(labels, [('le', f'{bound:g}')])} {count}")
+                lines.append(f"{name}_bucket{fmt(labels, [('le', '+Inf')])} {hist.count}")
+                lines.append(f"{name}_sum{fmt(labels)} {hist.total:.6f}")
+                lines.append(f"{name}_count{fmt(labels)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def drain_events(self):
+        with self.lock:
+            events = list(self.events)
+            self.events.clear()
+        return events
+
+
+registry = MetricsRegistry()
+
+
+# ---------------- Per-run breakdown ----------------
+class RunTimings:
+    """Collects span durations for a single app run (one Streamlit script execution)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stages = defaultdict(lambda: [0, 0.0])
+
+    def add(self, name, seconds):
+        with self.lock:
+            self.stages[name][0] += 1
+            self.stages[name][1] += seconds
+
+    def breakdown(self):
+        with self.lock:
+            rows = [
+                {"Stage": name, "Calls": calls, "Total (s)": round(total, 3), "Mean (ms)": round(1000 * total / calls, 2)}
+                for name, (calls, total) in self.stages.items()
+            ]
+        return sorted(rows, key=lambda row: -row["Total (s)"])
+
+
+_current_run = ContextVar("current_run", default=None)
+
+
+def start_run():
+    """Starts collecting span timings for the current run and returns the collector."""
+    run = RunTimings()
+    _current_run.set(run)
+    return run
+
+
+# ---------------- Per-stage peak memory ----------------
+class MemoryReport:
+    """
+    Peak traced memory (tracemalloc) each span added on top of what was in use when it started.
+
+    The peak is process-wide. It is only reset when a span starts while no
+    other tracked span is running (the previous high-water mark is folded into
+    traced_peak() first), so sequential spans are measured exactly. A span that
+    overlaps another one is measured from the rise of the shared high-water mark,
+    or from its start and end usage if that mark does not rise, and its figure
+    also includes memory held by the other in-flight articles.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.peaks = {}
+        self.overall_peak = 0
+
+    def add(self, name, peak):
+        with self.lock:
+            self.peaks[name] = max(self.peaks.get(name, 0), peak)
+            self.overall_peak = max(self.overall_peak, peak)
+
+    def rows(self):
+        with self.lock:
+            rows = [{"Stage": name, "Peak (KB)": round(peak / 1024, 1)} for name, peak in self.peaks.items()]
+        return sorted(rows, key=lambda row: -row["Peak (KB)"])
+
+
+_current_memory = ContextVar("current_memory", default=None)
+
+
+_peak_lock = threading.Lock()
+_tracked_spans = 0
+_folded_peak = 0
+
+
+def _start_tracing():
+    """Starts tracemalloc if needed; returns True if this call started it."""
+    global _folded_peak
+    with _peak_lock:
+        if tracemalloc.is_tracing():
+            return False
+        _folded_peak = 0
+        tracemalloc.start()
+        return True
+
+
+def traced_peak():
+    """Highest traced memory since tracing started, including peaks reset by spans."""
+    with _peak_lock:
+        return max(_folded_peak, tracemalloc.get_traced_memory()[1])
+
+
+def _memory_baseline():
+    """Enters a tracked span: resets the peak if no other tracked span is running."""
+    global _tracked_spans, _folded_peak
+    with _peak_lock:
+        if _tracked_spans == 0:
+            _folded_peak = max(_folded_peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        _tracked_spans += 1
+        return tracemalloc.get_traced_memory()
+
+
+def _memory_growth(baseline):
+    """Leaves a tracked span: peak memory it added on top of `baseline` (see MemoryReport)."""
+    global _tracked_spans
+    start_current, start_peak = baseline
+    with _peak_lock:
+        _tracked_spans -= 1
+        current, peak = tracemalloc.get_traced_memory()
+    high = peak if peak > start_peak else max(start_current, current)
+    return high - start_current
+
+
+@contextmanager
+def track_memory():
+    """
+    Traces allocations with tracemalloc and records the peak of every span in the block.
+
+    Yields:
+        MemoryReport: Filled in as spans complete.
+    """
+    report = MemoryReport()
+    token = _current_memory.set(report)
+    started = _start_tracing()
+    start_current = tracemalloc.get_traced_memory()[0]
+    try:
+        yield report
+    finally:
+        report.add("total", max(report.overall_peak, traced_peak() - start_current))
+        _current_memory.reset(token)
+        if started:
+            tracemalloc.stop()
+
+
+# ---------------- Tracing API ----------------
+@contextmanager
+def span(name, **labels):
+    """
+    Times a block of work as a named stage.
+
+    Usage:
+        with span("analyzer.tokenize"):
+            ...
+    """
+    memory = _current_memory.get()
+    baseline = _memory_baseline() if memory is not None else None
+
+    profiler = thread_profiler()
+    start = time.perf_counter()
+    try:
+        if profiler is None:
+            yield
+        else:
+            with profiler.thread():
+                yield
+    finally:
+        seconds = time.perf_counter() - start
+        if memory is not None:
+            memory.add(name, _memory_growth(baseline))
+        registry.record_span(name, seconds, labels)
+        run = _current_run.get()
+        if run is not None:
+            run.add(name, seconds)
+
+
+def timed(name):
+    """Decorator form of span()."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def incr(name, value=1, **labels):
+    registry.incr(name, value, **labels)
+
+
+def observe(name, value, **labels):
+    registry.observe(name, value, **labels)
+
+
+# ---------------- Export ----------------
+def export_metrics(metrics_dir=METRICS_DIR):
+    """
+    Appends pending span events to the JSON log and rewrites the Prometheus text file.
+
+    Returns:
+        tuple: (span log path, Prometheus file path)
+    """
+    os.makedirs(metrics_dir, exist_ok=True)
+    log_path = os.path.join(metrics_dir, SPAN_LOG_FILE)
+    prom_path = os.path.join(metrics_dir, PROMETHEUS_FILE)
+
+    events = registry.drain_events()
+    if events:
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(event) + "\n" for event in events)
+
+    # A unique temp file per call: concurrent sessions share this process
+    atomic_write(prom_path, registry.prometheus_text())
+
+    return log_path, prom_path
@@ -0,0 +1,167 @@
+"""
+Process-wide registry of the heavy NLP resources.
+
+Every model is loaded at most once per server process and the same instance is
+handed to the analyzer, keyword and benchmark code: the VADER analyzer, the
+TextBlob pattern lexicon, the Punkt sentence tokenizer, WordNet (for the
+lemmatizer) and YAKE extractors. Loads are timed; warmup() loads everything up
+front so the first request after a deploy does not pay for it.
+
+Usage:
+    python -m app.nlp_models          # load every model and print load times
+"""
+import os
+import threading
+import time
+
+import nltk
+import yake
+from nltk.corpus import wordnet
+from nltk.sentiment import SentimentIntensityAnalyzer
+from textblob.en import sentiment as pattern_sentiment
+
+from .nltk_setup import ensure_nltk_resources
+from .metrics import span
+
+ensure_nltk_resources()
+
+# Load every model in a background thread when the app starts
+WARMUP_MODELS = os.getenv("ARTICLE_WARMUP_MODELS", "1") != "0"
+
+
+def _load_pattern_lexicon():
+    if not dict.__len__(pattern_sentiment):
+        pattern_sentiment.load()
+    return pattern_sentiment
+
+
+def _load_punkt():
+    """The tokenizer sent_tokenize uses (cached by nltk itself on newer versions)."""
+    try:
+        from nltk.tokenize import _get_punkt_tokenizer
+    except ImportError:  # nltk < 3.8.2
+        return nltk.data.load("tokenizers/punkt/english.pickle")
+    return _get_punkt_tokenizer("english")
+
+
+def _load_wordnet():
+    wordnet.ensure_loaded()
+    wordnet.morphy("warming")  # builds the lemmatizer's exception maps
+    return wordnet
+
+
+class ModelRegistry:
+    def __init__(self):
+        self.loaders = {}
+        self.instances = {}
+        self.load_seconds = {}
+        self.locks = {}
+        self.lock = threading.Lock()
+
+    def register(self, name, loader):
+        """Registers `loader()` as the way to build model `name`."""
+        with self.lock:
+            self.loaders[name] = loader
+            self.locks[name] = threading.Lock()
+
+    def get(self, name):
+        """Returns the shared instance of `name`, loading it on first use (once, even under concurrency)."""
+        instance = self.instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self.locks[name]:
+            if name not in self.instances:
+                start = time.perf_counter()
+                with span("models.load", model=name):
+                    self.instances[name] = self.loaders[name]()
+                self.load_seconds[name] = time.perf_counter() - start
+        return self.instances[name]
+
+    def warmup(self, names=None):
+        """
+        Loads the given models (all registered ones by default).
+
+        A model that fails to load is reported and skipped; it is retried on its next get().
+
+        Returns:
+            dict: {name: load time in seconds} for the models that loaded
+            (0.0 for models that were already loaded).
+        """
+        names = list(names) if names is not None else self._names()
+        for name in names:
+            try:
+                self.get(name)
+            except Exception as e:
+                print(f"⚠️ Could not load NLP model {name}: {e}")
+        return {name: self.load_seconds.get(name, 0.0) for name in names if name in self.instances}
+
+    def report(self):
+        """Load status and time per model, for display."""
+        return [
+            {
+                "Model": name,
+                "Loaded": name in self.instances,
+                "Load time (s)": round(self.load_seconds[name], 3) if name in self.load_seconds else None,
+            }
+            for name in self._names()
+        ]
+
+    def _names(self):
+        """Registered model names, copied under the lock (get_yake_extractor may register concurrently)."""
+        with self.lock:
+            return list(self.loaders)
+
+
+def _yake_loader(language, n, top):
+    return lambda: yake.KeywordExtractor(lan=language, n=n, top=top)
+
+
+models = ModelRegistry()
+models.register("vader", SentimentIntensityAnalyzer)
+models.register("pattern_lexicon", _load_pattern_lexicon)
+models.register("punkt", _load_punkt)
+models.register("wordnet", _load_wordnet)
+# The configurations the app asks for (top 5 and top 10 keywords)
+for _top in (20, 40):
+    models.register(f"yake:en:2:{_top}", _yake_loader("en", 2, _top))
+
+_registry_lock = threading.Lock()
+
+
+def get_model(name):
+    return models.get(name)
+
+
+def get_yake_extractor(language="en", n=2, top=40):
+    """Shared YAKE extractor per configuration (other configurations are registered on first request)."""
+    name = f"yake:{language}:{n}:{top}"
+    with _registry_lock:
+        if name not in models.loaders:
+            models.register(name, _yake_loader(language, n, top))
+    return models.get(name)
+
+
+_warmup_thread = None
+
+
+def start_warmup():
+    """Loads every model in a background thread, once per process; returns immediately."""
+    global _warmup_thread
+    with _registry_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=models.warmup, name="nlp-warmup", daemon=True)
+            _warmup_thread.start()
+    return _warmup_thread
+
+
+def main():
+    start = time.perf_counter()
+    loaded = models.warmup()
+    for name, seconds in loaded.items():
+        print(f"  - {name:<18} {seconds:>8.3f}s")
+    print(f"✅ Loaded {len(loaded)}/{len(models.loaders)} models in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
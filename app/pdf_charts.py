@@ -5,12 +5,12 @@ import pandas as pd
 import numpy as np
 
 
-def ensure_charts_dir():
-    os.makedirs("charts", exist_ok=True)
+def ensure_charts_dir(chart_dir="charts"):
+    os.makedirs(chart_dir, exist_ok=True)
 
 
-def save_sentiment_distribution_matplotlib(df, session_id=""):
-    ensure_charts_dir()
+def save_sentiment_distribution_matplotlib(df, session_id="", chart_dir="charts"):
+    ensure_charts_dir(chart_dir)
     df = df.copy()
     df["SentimentGroup"] = df["POLARITY SCORE"].apply(
         lambda x: "Positive" if x > 0.1 else "Negative" if x < -0.1 else "Neutral"
@@ -29,14 +29,14 @@ def save_sentiment_distribution_matplotlib(df, session_id=""):
     plt.legend(title="Sentiment", loc="center left", bbox_to_anchor=(1, 0.5))
     plt.tight_layout()
 
-    path = f"charts/{session_id}_sentiment_distribution.png"
+    path = os.path.join(chart_dir, f"{session_id}_sentiment_distribution.png")
     plt.savefig(path)
     plt.close()
     return path
 
 
-def save_word_count_vs_complexity_matplotlib(df, session_id=""):
-    ensure_charts_dir()
+def save_word_count_vs_complexity_matplotlib(df, session_id="", chart_dir="charts"):
+    ensure_charts_dir(chart_dir)
     plt.figure(figsize=(8, 5))
     plt.scatter(df["WORD COUNT"], df["PERCENTAGE OF COMPLEX WORDS"], color='royalblue')
 
@@ -49,14 +49,14 @@ def save_word_count_vs_complexity_matplotlib(df, session_id=""):
     plt.ylabel("% of Complex Words")
     plt.tight_layout()
 
-    path = f"charts/{session_id}_word_count_vs_complexity.png"
+    path = os.path.join(chart_dir, f"{session_id}_word_count_vs_complexity.png")
     plt.savefig(path)
     plt.close()
     return path
 
 
-def save_personal_pronouns_barchart_matplotlib(df, session_id=""):
-    ensure_charts_dir()
+def save_personal_pronouns_barchart_matplotlib(df, session_id="", chart_dir="charts"):
+    ensure_charts_dir(chart_dir)
     df_clean = df[["URL_ID", "PERSONAL PRONOUNS"]].dropna()
     df_clean["PERSONAL PRONOUNS"] = pd.to_numeric(df_clean["PERSONAL PRONOUNS"], errors="coerce").fillna(0)
 
@@ -73,7 +73,7 @@ def save_personal_pronouns_barchart_matplotlib(df, session_id=""):
     plt.xticks(rotation=90)
     plt.tight_layout()
 
-    path = f"charts/{session_id}_personal_pronouns_barchart.png"
+    path = os.path.join(chart_dir, f"{session_id}_personal_pronouns_barchart.png")
     plt.savefig(path)
     plt.close()
     return path
\ No newline at end of file
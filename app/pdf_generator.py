@@ -8,11 +8,14 @@ import streamlit as st
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib.pagesizes import landscape, letter
+from app.corpus import ARTICLES_DIR
 from app.pipeline.summary import compute_summary_insights
+from app.metrics import span
 
 
 @st.cache_data
-def export_analysis_to_pdf(df, chart_paths_dict, input_path, session_id=None, output_dir="output"):
+def export_analysis_to_pdf(df, chart_paths_dict, input_path, session_id=None, output_dir="output",
+                           folder=ARTICLES_DIR, keyword_backend=None):
     """
     Generate a PDF report summarizing article analysis with pre-saved chart images.
 
@@ -22,12 +25,13 @@ def export_analysis_to_pdf(df, chart_paths_dict, input_path, session_id=None, ou
         input_path (str): Path of uploaded input file (used for naming output).
         session_id (str): Unique ID to prevent file collisions (optional).
         output_dir (str): Directory to store the generated PDF.
+        folder (str): Corpus folder the top keywords are counted for.
+        keyword_backend (str): Keyword backend whose counts are used.
         
     Returns:
         str: Full path to the generated PDF.
     """
     os.makedirs(output_dir, exist_ok=True)
-    os.makedirs("charts", exist_ok=True)
 
     filename_base = os.path.splitext(os.path.basename(input_path))[0]  # sample_input
     if session_id:
@@ -49,7 +53,7 @@ def export_analysis_to_pdf(df, chart_paths_dict, input_path, session_id=None, ou
     elements = []
 
     # Page 1: Summary
-    summary = compute_summary_insights(df)
+    summary = compute_summary_insights(df, folder, keyword_backend)
     elements.append(Paragraph("--Article Analysis Summary--", styles["Title"]))
     elements.append(Spacer(1, 12))
 
@@ -104,5 +108,6 @@ def export_analysis_to_pdf(df, chart_paths_dict, input_path, session_id=None, ou
             elements.append(Paragraph(f"⚠️ Could not load chart for '{title}'", styles["Normal"]))
             elements.append(Spacer(1, 12))
 
-    doc.build(elements)
+    with span("report.pdf_build"):
+        doc.build(elements)
     return output_path
\ No newline at end of file
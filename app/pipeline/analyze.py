@@ -1,14 +1,29 @@
+import os
+import pandas as pd
 import streamlit as st
-from app.analyzer import analyze_articles
+from app.analyzer import analyze_articles, fill_missing_metrics, missing_metrics
+from app.corpus import ARTICLES_DIR
+from app.streaming import analyze_articles_streaming
+
+# "streaming" keeps memory bounded for very large batches; "pipelined" overlaps
+# extraction and analysis (see app.pipelined)
+ANALYSIS_MODE = os.getenv("ARTICLE_ANALYSIS_MODE", "standard")
+
+# Metrics behind the sentiment / complexity / pronoun charts (on screen and in the PDF)
+CHART_COLUMNS = ("POLARITY SCORE", "WORD COUNT", "PERCENTAGE OF COMPLEX WORDS", "PERSONAL PRONOUNS")
 
 @st.cache_data(show_spinner=False)
-def analyze_and_cache_results(path, df):
+def analyze_and_cache_results(path, df, profile=None, folder=ARTICLES_DIR,
+                              output_path="output/Output Data Structure.xlsx"):
     """
     Analyze extracted articles and cache the result.
 
     Args:
         path (str): Path to the uploaded Excel file.
         df (DataFrame): DataFrame containing extracted URL_IDs.
+        profile (str): Analysis profile; metrics outside it are left empty.
+        folder (str): Corpus folder holding the extracted texts.
+        output_path (str): Excel report to write.
 
     Returns:
         DataFrame: Analyzed article metrics.
@@ -16,9 +31,38 @@ def analyze_and_cache_results(path, df):
     st.markdown("### 📊 Step 2: Analyzing Articles")
 
     with st.spinner("🔍 Analyzing article content..."):
-        result_df = analyze_articles(path)
+        if ANALYSIS_MODE == "streaming":
+            analyze_articles_streaming(path, output_path, folder, profile=profile)
+            result_df = pd.read_excel(output_path, dtype={"URL_ID": str, "DUPLICATE OF": str})
+        else:
+            result_df = analyze_articles(path, output_path, profile, folder)
 
         # Ensure URL_ID is treated as string (critical for joining/tracking)
         result_df["URL_ID"] = result_df["URL_ID"].astype(str)
+        result_df["DUPLICATE OF"] = result_df["DUPLICATE OF"].fillna("").astype(str)
+
+    return result_df
+
+
+def ensure_metrics(df_result, columns, folder=ARTICLES_DIR, key="metrics"):
+    """
+    Makes sure a view has the metric columns it needs, computing them on demand.
+
+    Metrics the analysis profile skipped are computed only when the user asks
+    for them. `df_result` may be a filtered view; the gaps are filled in the full
+    st.session_state.df_result, which the filled frame replaces.
+
+    Returns:
+        bool: True if every column is available.
+    """
+    missing = missing_metrics(df_result, columns)
+    if not missing:
+        return True
 
-    return result_df
\ No newline at end of file
+    st.info(f"ℹ️ The selected analysis profile did not compute: {', '.join(missing)}.")
+    if st.button("🧮 Compute missing metrics", key=f"fill_{key}"):
+        with st.spinner("🔍 Computing missing metrics..."):
+            full = st.session_state.get("df_result", df_result)
+            st.session_state.df_result = fill_missing_metrics(full, missing, folder)
+        st.rerun()
+    return False
@@ -0,0 +1,107 @@
+import os
+
+import pandas as pd
+import streamlit as st
+
+from app.jobs import get_job_registry, input_fingerprint, CANCELLED, FAILED
+from app.utils import clear_old_charts, clean_old_pdfs
+from app.workspace import session_dir
+from app.pipeline.analyze import ANALYSIS_MODE
+from app.pipeline.summary import display_approximate_summary
+
+# Extraction + analysis run as background jobs unless disabled; choosing an
+# analysis mode (streaming, pipelined) turns them off unless they are enabled explicitly
+BACKGROUND_JOBS = os.getenv("ARTICLE_BACKGROUND_JOBS", "1" if ANALYSIS_MODE == "standard" else "0") != "0"
+PROGRESS_REFRESH_SECONDS = float(os.getenv("ARTICLE_PROGRESS_REFRESH", 1.0))
+
+
+def collect_job_results(path, profile=None, keyword_backend=None):
+    """
+    Runs extraction and analysis for `path` as a background job and returns its results.
+
+    The job survives reruns: this session (and any other session uploading the
+    same file) attaches to the running job instead of starting a new one.
+
+    Args:
+        path (str): Path to the uploaded Excel file.
+        profile (str): Analysis profile; metrics outside it are left empty.
+        keyword_backend (str): Keyword backend for the approximate summary shown while running.
+
+    Returns:
+        DataFrame: Analyzed article metrics once the job has finished, otherwise None.
+        The job's article folder and report path are kept in st.session_state
+        as `articles_dir` and `report_path`. Selecting another profile for the
+        same input keeps the job; the caller fills the metrics it adds.
+    """
+    registry = get_job_registry()
+    job = registry.get(st.session_state.get("job_id"))
+
+    if job is None or not job.key.startswith(f"{input_fingerprint(path)}:"):
+        clear_old_charts(session_dir("charts"))  # clean old charts
+        clean_old_pdfs(folder=session_dir("output"), max_age_minutes=30)
+        st.session_state.pop("pdf_path", None)
+        job = registry.submit(path, profile, keyword_backend)
+        st.session_state.job_id = job.id
+
+    if not job.finished:
+        show_job_progress(job.id, keyword_backend)
+        return None
+
+    # Results are built once per finished job
+    if st.session_state.get("result_job_id") == job.id and "df_result" in st.session_state:
+        df_result = st.session_state.df_result
+    else:
+        df_result = job.result_frame()
+        st.session_state.df_result = df_result
+        st.session_state.result_job_id = job.id
+        st.session_state.articles_dir = job.articles_dir
+        st.session_state.report_path = job.report_path
+
+    snapshot = job.snapshot()
+    if job.status == FAILED:
+        st.error(f"❌ Failed to process articles: {snapshot['error']}")
+        return None
+
+    if job.status == CANCELLED:
+        st.warning(f"⏹️ Job cancelled after {snapshot['completed']}/{snapshot['total']} articles — showing partial results.")
+        if st.button("🔁 Restart analysis"):
+            st.session_state.pop("job_id", None)
+            st.rerun()
+    else:
+        st.success(f"✅ Extraction complete: {snapshot['extracted']}/{snapshot['total']} articles extracted.")
+
+    with st.expander("🗂️ Extraction Summary"):
+        st.dataframe(pd.DataFrame(snapshot["messages"], columns=["URL_ID", "Status"]))
+
+    return df_result if not df_result.empty else None
+
+
+@st.fragment(run_every=PROGRESS_REFRESH_SECONDS)
+def show_job_progress(job_id, keyword_backend=None):
+    """Live progress, cancel button, approximate summary and completed rows of a running job (refreshes on its own)."""
+    job = get_job_registry().get(job_id)
+    if job is None:
+        return
+
+    if job.finished:
+        st.rerun()  # hand the finished results to the full script
+
+    snapshot = job.snapshot()
+    st.markdown("### 🧪 Extracting & Analyzing Articles")
+    st.progress(
+        snapshot["completed"] / max(snapshot["total"], 1),
+        text=f"{snapshot['completed']}/{snapshot['total']} articles processed "
+             f"({snapshot['extracted']} extracted) — {snapshot['elapsed']:.0f}s",
+    )
+
+    if snapshot["status"] == "cancelling":
+        st.info("⏹️ Cancelling — waiting for articles already in progress...")
+    elif st.button("⏹️ Cancel", key=f"cancel_{job_id}"):
+        job.cancel()
+
+    display_approximate_summary(job, keyword_backend)
+
+    partial = job.result_frame()
+    if not partial.empty:
+        st.caption("Completed rows so far:")
+        st.dataframe(partial, use_container_width=True)
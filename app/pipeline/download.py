@@ -1,6 +1,5 @@
 import streamlit as st
 import os
-import uuid
 from PIL import Image
 
 from app.pdf_charts import (  # <-- Static matplotlib charts for PDF
@@ -9,9 +8,13 @@ from app.pdf_charts import (  # <-- Static matplotlib charts for PDF
     save_personal_pronouns_barchart_matplotlib
 )
 from app.pdf_generator import export_analysis_to_pdf
+from app.metrics import span
+from app.workspace import session_id as current_session_id, session_dir
+from app.corpus import ARTICLES_DIR
+from app.pipeline.analyze import CHART_COLUMNS, ensure_metrics
 
 
-def show_download_section(excel_path, df_result, sample_path):
+def show_download_section(excel_path, df_result, sample_path, folder=ARTICLES_DIR, keyword_backend=None):
     """
     Renders the download section for Excel and PDF output files in the Streamlit app.
     """
@@ -34,20 +37,22 @@ def show_download_section(excel_path, df_result, sample_path):
         st.warning("⚠️ Excel path or data not provided.")
 
     # ---------------- PDF Generation ----------------
+    # The PDF charts need metrics a narrower analysis profile may have skipped
+    if not ensure_metrics(df_result, CHART_COLUMNS, folder, key="pdf"):
+        return
+
     if "pdf_path" not in st.session_state:
         with st.spinner("📄 Generating PDF Report..."):
 
-            # Generate a unique session ID
-            if "session_id" not in st.session_state:
-                st.session_state.session_id = str(uuid.uuid4())[:8]
-
-            session_id = st.session_state.session_id
-            os.makedirs("charts", exist_ok=True)
+            # Charts and PDF go to this session's workspace
+            session_id = current_session_id()
+            chart_dir = session_dir("charts")
 
             # Generate and save matplotlib charts with unique filenames
-            sentiment_path = save_sentiment_distribution_matplotlib(df_result, session_id)
-            wc_path = save_word_count_vs_complexity_matplotlib(df_result, session_id)
-            pronoun_path = save_personal_pronouns_barchart_matplotlib(df_result, session_id)
+            with span("report.charts"):
+                sentiment_path = save_sentiment_distribution_matplotlib(df_result, session_id, chart_dir)
+                wc_path = save_word_count_vs_complexity_matplotlib(df_result, session_id, chart_dir)
+                pronoun_path = save_personal_pronouns_barchart_matplotlib(df_result, session_id, chart_dir)
 
             # Dict of saved chart image paths
             charts = {
@@ -57,7 +62,10 @@ def show_download_section(excel_path, df_result, sample_path):
             }
 
             # Generate PDF
-            pdf_path = export_analysis_to_pdf(df_result, charts, input_path=sample_path, session_id=session_id)
+            pdf_path = export_analysis_to_pdf(
+                df_result, charts, input_path=sample_path, session_id=session_id, output_dir=session_dir("output"),
+                folder=folder, keyword_backend=keyword_backend,
+            )
             st.session_state.pdf_path = pdf_path
 
     else:
@@ -79,4 +87,40 @@ def show_download_section(excel_path, df_result, sample_path):
                 os.remove(path)
 
     except Exception as e:
-        st.error(f"❌ Failed to generate PDF report: {e}")
\ No newline at end of file
+        st.error(f"❌ Failed to generate PDF report: {e}")
+
+
+def show_profile_report(report):
+    """
+    Renders the hot functions and allocation sites of a profiled run, with downloads.
+
+    Args:
+        report (ProfileReport): Report produced by app.profiling.profile_run.
+    """
+    st.markdown("### 🔬 Profiling Report")
+    st.caption(f"Mode: `{report.mode}` — profiled run took {report.seconds:.2f}s")
+
+    hot_functions = report.hot_functions()
+    if hot_functions:
+        st.markdown("**🔥 Hot functions (own time)**")
+        st.dataframe(hot_functions, hide_index=True)
+    if report.allocation_sites:
+        st.markdown(f"**🧠 Top allocation sites** (peak traced: {report.memory_peak / 1024:.1f} KB)")
+        st.dataframe(report.allocation_sites, hide_index=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            label="📥 Download Profile Report",
+            data=report.text(),
+            file_name="profile_report.txt",
+            mime="text/plain",
+        )
+    if report.stats is not None:
+        with col2:
+            st.download_button(
+                label="📥 Download pstats Dump",
+                data=report.pstats_dump(),
+                file_name="profile.prof",
+                mime="application/octet-stream",
+            )
@@ -1,14 +1,38 @@
+import contextvars
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import streamlit as st
 import pandas as pd
 from app.scraper import extract_articles  # function should accept (url_id, url)
+from app.extractor_router import get_router
+from app.workspace import atomic_path
+from app.pipelined import extract_and_analyze
+
+# Extraction is network-bound, so a few threads overlap page downloads
+EXTRACT_WORKERS = int(os.getenv("ARTICLE_EXTRACT_WORKERS", 4))
+
 
+def _timed_extract(context, url_id, url, save_dir):
+    start = time.perf_counter()
+    success, msg = context.run(extract_articles, url_id, url, save_dir=save_dir)
+    return success, msg, time.perf_counter() - start
 
-def extract_articles_from_file(path):
+
+def extract_articles_from_file(path, max_workers=EXTRACT_WORKERS, save_dir="extracted_articles", timings=None,
+                               normalized_path=None):
     """
     Extracts articles from the URLs listed in the uploaded Excel file.
 
     Args:
         path (str): Path to the uploaded Excel file.
+        max_workers (int): Number of URLs fetched concurrently.
+        save_dir (str): Directory to save extracted articles.
+        timings (list): If given, receives (URL_ID, status message, seconds) for every URL.
+        normalized_path (str): Where the input is saved with URL_IDs as text, for the
+            analysis to read; defaults to rewriting `path`. Pass a session workspace
+            path for shared inputs such as the sample file.
 
     Returns:
         DataFrame: The original dataframe with URL_IDs and URLs, or None on failure.
@@ -17,7 +41,8 @@ def extract_articles_from_file(path):
         # Load and sanitize data
         df = pd.read_excel(path)
         df["URL_ID"] = df["URL_ID"].astype(str)
-        df.to_excel(path, index=False)
+        with atomic_path(normalized_path or path) as tmp_path:
+            df.to_excel(tmp_path, index=False)
 
         st.markdown("### 🧪 Step 1: Extracting Articles")
         status_list = []
@@ -25,12 +50,23 @@ def extract_articles_from_file(path):
 
         # Spinner while processing
         with st.spinner("⏳ Extracting all articles..."):
-            for _, row in df.iterrows():
-                url_id, url = row["URL_ID"], row["URL"]
-                success, msg = extract_articles(url_id, url)
-                if success:
-                    extracted_count += 1
-                status_list.append((url_id, msg))
+            rows = list(zip(df["URL_ID"], df["URL"]))
+            # Each download runs in a copy of this run's context, so spans reach its collectors
+            contexts = [contextvars.copy_context() for _ in rows]
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                outcomes = executor.map(
+                    lambda context, row: _timed_extract(context, row[0], row[1], save_dir),
+                    contexts, rows,
+                )
+                for (url_id, _), (success, msg, seconds) in zip(rows, outcomes):
+                    if success:
+                        extracted_count += 1
+                    status_list.append((url_id, msg))
+                    if timings is not None:
+                        timings.append((url_id, msg, seconds))
+
+        # Persist what the extractor router learned during this batch
+        get_router().save()
 
         st.success(f"✅ Extraction complete: {extracted_count}/{len(df)} articles extracted.")
 
@@ -43,4 +79,41 @@ def extract_articles_from_file(path):
 
     except Exception as e:
         st.error(f"❌ Failed to extract articles: {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+def extract_and_analyze_from_file(path, profile=None, save_dir="extracted_articles",
+                                  output_path="output/Output Data Structure.xlsx"):
+    """
+    Extracts and analyzes the uploaded articles in one pipelined pass.
+
+    Analysis starts as soon as the first article is extracted instead of after
+    the whole batch (see app.pipelined).
+
+    Args:
+        path (str): Path to the uploaded Excel file.
+        profile (str): Analysis profile; metrics outside it are left empty.
+        save_dir (str): Directory to save extracted articles.
+        output_path (str): Excel report to write.
+
+    Returns:
+        DataFrame: Analyzed article metrics, or None on failure.
+    """
+    try:
+        st.markdown("### 🧪 Extracting & Analyzing Articles")
+        with st.spinner("⏳ Extracting and analyzing articles..."):
+            df_result, status_list, extracted_count = extract_and_analyze(
+                path, output_path, save_dir=save_dir, profile=profile
+            )
+            df_result["URL_ID"] = df_result["URL_ID"].astype(str)
+            df_result["DUPLICATE OF"] = df_result["DUPLICATE OF"].fillna("").astype(str)
+
+        st.success(f"✅ Extraction complete: {extracted_count}/{len(status_list)} articles extracted.")
+        with st.expander("🗂️ Extraction Summary"):
+            st.dataframe(pd.DataFrame(status_list, columns=["URL_ID", "Status"]))
+
+        return df_result
+
+    except Exception as e:
+        st.error(f"❌ Failed to extract articles: {e}")
+        return None
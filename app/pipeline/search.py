@@ -0,0 +1,47 @@
+import streamlit as st
+from app.corpus import ARTICLES_DIR
+from app.fulltext_index import get_fulltext_index, parse_query, sync_index
+
+
+def show_search_box(df_result, folder=ARTICLES_DIR):
+    """
+    Full-text search over the analyzed articles.
+
+    Args:
+        df_result (pd.DataFrame): DataFrame with article metrics.
+        folder (str): Corpus folder holding the articles' texts.
+
+    Returns:
+        pd.DataFrame: Rows of `df_result` whose article matches the query (all rows if empty).
+    """
+    # Articles saved before the index existed are indexed once per result
+    synced_key = (id(df_result), folder)
+    if st.session_state.get("search_synced") != synced_key:
+        with st.spinner("🔎 Updating search index..."):
+            sync_index(df_result["URL_ID"], folder)
+        st.session_state.search_synced = synced_key
+
+    query = st.text_input(
+        "🔎 Search article text",
+        placeholder='Words and "quoted phrases", e.g. climate "carbon tax"',
+        key="fulltext_query",
+    )
+    if not query.strip():
+        return df_result
+
+    index = get_fulltext_index(folder)
+    # The same query returns the same frame object, so views keyed on it stay cached
+    cached = st.session_state.get("search_result")
+    if cached is not None and cached[0] is df_result and cached[1] == query:
+        df_matches = cached[2]
+    else:
+        df_matches = df_result[df_result["URL_ID"].astype(str).isin(index.search(query))]
+        st.session_state.search_result = (df_result, query, df_matches)
+
+    terms = sorted({term for phrase in parse_query(query) for term, _ in phrase})
+    frequencies = index.document_frequencies(terms)
+    st.caption(
+        f"{len(df_matches)} of {len(df_result)} articles match — document frequency: "
+        + (", ".join(f"`{term}` {count}" for term, count in frequencies.items()) or "no searchable terms (stopwords only)")
+    )
+    return df_matches
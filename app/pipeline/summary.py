@@ -1,15 +1,23 @@
-import os
-from collections import Counter
+import pandas as pd
 import streamlit as st
-from app.keyword_extractor import extract_keywords_from_text
+from app.corpus import ARTICLES_DIR
+from app.keyword_index import get_keyword_aggregate, sync_keywords
+from app.approx_summary import (
+    MIN_SAMPLE, POLARITY_BINS, approximate_summary, approximate_top_keywords, estimated_population,
+    refine_sample_keywords,
+)
+from app.keyword_extractor import KEYWORD_BACKEND
+from app.tfidf_keywords import DocumentFrequencies
 
 
-def compute_summary_insights(df_result):
+def compute_summary_insights(df_result, folder=ARTICLES_DIR, backend=None):
     """
     Computes summary metrics and top keywords from the analyzed articles.
 
     Args:
         df_result (pd.DataFrame): DataFrame with article metrics.
+        folder (str): Corpus folder holding the articles' texts.
+        backend (str): Keyword backend whose aggregate is read; defaults to KEYWORD_BACKEND.
 
     Returns:
         dict: Dictionary containing total count, polarity stats, and top keywords.
@@ -24,42 +32,56 @@ def compute_summary_insights(df_result):
         ].shape[0],
     }
 
-    # Collect keywords from each article file
-    all_keywords = []
-    for _, row in df_result.iterrows():
-        file_path = f"extracted_articles/{row['URL_ID']}.txt"
-        if os.path.exists(file_path):
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    text = f.read()
-                keywords = extract_keywords_from_text(text)
-                all_keywords.extend(keywords)
-            except Exception:
-                continue  # Skip corrupt files silently
-
-    summary["top_keywords"] = Counter(all_keywords).most_common(10)
+    # Keyword counts come from the incrementally maintained aggregate, not from article text
+    summary["top_keywords"] = get_keyword_aggregate(folder, backend).top_k(10, url_ids=df_result["URL_ID"])
     return summary
 
 
-def display_summary(df_result):
+def refresh_keyword_aggregate(df_result, backend=None, folder=ARTICLES_DIR):
+    """
+    Updates the keyword aggregate for new or changed articles in `df_result`.
+
+    Args:
+        df_result (pd.DataFrame): DataFrame with article metrics.
+        backend (str): Keyword backend ("yake" or "tfidf"); defaults to KEYWORD_BACKEND.
+        folder (str): Corpus folder holding the articles' texts.
+    """
+    # Near-duplicates reuse the keywords of the article they duplicate
+    duplicate_of = {}
+    if "DUPLICATE OF" in df_result.columns:
+        duplicate_of = {
+            url_id: canonical for url_id, canonical in zip(df_result["URL_ID"], df_result["DUPLICATE OF"])
+            if isinstance(canonical, str) and canonical
+        }
+
+    with st.spinner("🔑 Updating keyword statistics..."):
+        sync_keywords(df_result["URL_ID"], duplicate_of=duplicate_of, folder=folder, backend=backend)
+
+
+def display_summary(df_result, folder=ARTICLES_DIR, backend=None):
     """
     Displays high-level summary insights in the Streamlit interface.
 
     Args:
         df_result (pd.DataFrame): DataFrame containing the analysis results.
+        folder (str): Corpus folder holding the articles' texts.
+        backend (str): Keyword backend for the top keywords.
     """
     st.markdown("### 📌 Summary Insights")
 
     with st.expander("📊 High-Level Dataset Insights"):
         try:
-            summary = compute_summary_insights(df_result)
+            summary = compute_summary_insights(df_result, folder, backend)
 
             # Display core statistics
             st.markdown(f"- **Total Articles Analyzed**: `{summary['total_articles']}`")
-            st.markdown(f"- **Average Polarity Score**: `{summary['avg_polarity']}`")
-            st.markdown(f"- **Positive Articles**: `{summary['positive_articles']}`")
-            st.markdown(f"- **Negative Articles**: `{summary['negative_articles']}`")
-            st.markdown(f"- **Neutral Articles**: `{summary['neutral_articles']}`")
+            if df_result["POLARITY SCORE"].notna().any():
+                st.markdown(f"- **Average Polarity Score**: `{summary['avg_polarity']}`")
+                st.markdown(f"- **Positive Articles**: `{summary['positive_articles']}`")
+                st.markdown(f"- **Negative Articles**: `{summary['negative_articles']}`")
+                st.markdown(f"- **Neutral Articles**: `{summary['neutral_articles']}`")
+            else:
+                st.caption("Sentiment was not computed by the selected analysis profile.")
 
             # Display top keywords
             if summary["top_keywords"]:
@@ -68,4 +90,53 @@ def display_summary(df_result):
                     st.markdown(f"- {kw} ({freq} times)")
 
         except Exception as e:
-            st.error(f"❌ Could not compute summary: {e}")
\ No newline at end of file
+            st.error(f"❌ Could not compute summary: {e}")
+
+
+def display_approximate_summary(job, backend=None, keyword_seconds=0.2):
+    """
+    Displays summary estimates for a job that is still running (or still being indexed).
+
+    Estimates come from the job's reservoir sample of finished articles and carry
+    95% confidence intervals. Workers extract keywords as articles enter the
+    sample; for another backend, every call extracts keywords for more sampled
+    articles for at most `keyword_seconds`, so the panel refines as it refreshes.
+
+    Args:
+        job (Job): The background job.
+        backend (str): Keyword backend for the sampled articles.
+        keyword_seconds (float): Time this call may spend extracting sampled articles' keywords.
+    """
+    completed = job.snapshot()["completed"]
+    sample, finished = job.sample.snapshot()
+    population = estimated_population(finished, completed, job.total)
+    url_ids = [url_id for url_id, _ in sample]
+    keywords = job.sample_keywords.setdefault(backend or KEYWORD_BACKEND, {})
+    frequencies = job.sample_frequencies.setdefault(backend or KEYWORD_BACKEND, DocumentFrequencies())
+    refine_sample_keywords(keywords, url_ids, job.articles_dir, backend, keyword_seconds, frequencies)
+    summary = approximate_summary([polarity for _, polarity in sample], finished, population)
+    top_keywords = approximate_top_keywords(keywords, url_ids, population)
+
+    st.markdown("### 📌 Summary Insights (approximate)")
+    if summary is None and not top_keywords:
+        st.caption(f"Estimates appear once {MIN_SAMPLE} articles have finished.")
+        return
+
+    st.caption(
+        f"Estimated for the ~{population} of {job.total} articles expected to succeed (at the success rate so far), "
+        f"from a random sample of {len(sample)} of the {finished} analyzed so far (95% confidence intervals). "
+        "The exact summary replaces this when ready."
+    )
+    if summary is not None:
+        mean, low, high = summary["avg_polarity"]
+        st.markdown(f"- **Average Polarity Score**: `{mean}` ({low} – {high})")
+        for band, (estimate, low, high) in summary["bands"].items():
+            st.markdown(f"- **{band} Articles**: `~{estimate}` ({low} – {high})")
+
+        labels = [f"{a:.1f} to {b:.1f}" for a, b in zip(POLARITY_BINS[:-1], POLARITY_BINS[1:])]
+        st.bar_chart(pd.DataFrame({"Sampled articles": summary["histogram"]}, index=labels))
+
+    if top_keywords:
+        st.markdown("#### 🔑 Top Keywords (estimated articles mentioning each):")
+        for keyword, estimate, low, high in top_keywords:
+            st.markdown(f"- {keyword} (~{estimate}, {low} – {high})")
@@ -1,4 +1,3 @@
-import os
 import pandas as pd
 import streamlit as st
 from app.visualizer import (
@@ -11,11 +10,17 @@ from app.visualizer import (
     plot_sentiment_difference,
     plot_sentiment_agreement_pie
 )
-from app.keyword_extractor import extract_keywords_from_text
+from app.keyword_index import get_keyword_aggregate
+from app.metrics import span
+from app.corpus import ARTICLES_DIR
+from app.pipeline.analyze import CHART_COLUMNS, ensure_metrics
+from app.ui.browser import show_article_browser, page_keywords, render_keyword_chips
 from app.benchmark import benchmark_sentiments, benchmark_readability, benchmarking_tools_page
 
+WORDCLOUD_KEYWORDS = 100
 
-def show_visual_tabs(df_result):
+
+def show_visual_tabs(df_result, keyword_backend=None, folder=ARTICLES_DIR):
     """Displays all visualization tabs for article analysis."""
     tab1, tab2, tab3, tab4 = st.tabs([
         "📋 Table", "📈 Visuals", "🔑 Keywords", "🧪 Benchmarks"
@@ -23,64 +28,58 @@ def show_visual_tabs(df_result):
 
     # --- 📋 Data Table Tab ---
     with tab1:
-        st.dataframe(df_result)
+        st.dataframe(show_article_browser(df_result, key="table"), use_container_width=True)
 
     # --- 📈 Visual Charts Tab ---
     with tab2:
-        st.subheader("📊 Sentiment Distribution")
-        st.plotly_chart(sentiment_distribution(df_result), use_container_width=True)
+        if ensure_metrics(df_result, CHART_COLUMNS, folder, key="charts"):
+            with span("visuals.charts"):
+                st.subheader("📊 Sentiment Distribution")
+                st.plotly_chart(sentiment_distribution(df_result), use_container_width=True)
 
-        st.subheader("🧠 Word Count vs. Complexity")
-        st.plotly_chart(word_count_vs_complexity(df_result), use_container_width=True)
+                st.subheader("🧠 Word Count vs. Complexity")
+                st.plotly_chart(word_count_vs_complexity(df_result), use_container_width=True)
 
-        st.subheader("🗣️ Personal Pronouns BarChart")
-        st.plotly_chart(personal_pronouns_barchart(df_result), use_container_width=True)
+                st.subheader("🗣️ Personal Pronouns BarChart")
+                st.plotly_chart(personal_pronouns_barchart(df_result), use_container_width=True)
 
     # --- 🔑 Keywords Tab ---
     with tab3:
         st.subheader("🔎 Top 5 Keywords per Article")
 
-        all_keywords = []
-        for _, row in df_result.iterrows():
-            file_path = f"extracted_articles/{row['URL_ID']}.txt"
-            if os.path.exists(file_path):
-                try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        text = f.read()
-                    keywords = extract_keywords_from_text(text, max_keywords=5)
-                    all_keywords.extend(keywords)
-
-                    # Display keywords as styled chips
-                    with st.expander(f"📰 Article ID: {row['URL_ID']}"):
-                        styled = " ".join([
-                            f'<span style="background-color:#e0f3ff; color:#333; '
-                            f'padding:5px 10px; border-radius:12px; margin:4px; '
-                            f'display:inline-block;">{kw}</span>'
-                            for kw in keywords
-                        ])
-                        st.markdown(styled, unsafe_allow_html=True)
-                except Exception:
-                    continue
+        # Keywords are extracted and rendered for the visible page only
+        page = show_article_browser(df_result, key="keywords")
+        url_ids = tuple(page["URL_ID"])
+        try:
+            keywords_per_article = page_keywords(url_ids, folder, keyword_backend)
+        except Exception:
+            keywords_per_article = [[] for _ in url_ids]
+
+        for url_id, keywords in zip(url_ids, keywords_per_article):
+            with st.expander(f"📰 Article ID: {url_id}"):
+                render_keyword_chips(keywords)
 
+        # The word cloud comes from the keyword aggregate, without reading article text
         st.subheader("☁️ Common Keyword WordCloud")
-        st.pyplot(generate_wordcloud(all_keywords))
+        top_keywords = get_keyword_aggregate(folder, keyword_backend).top_k(WORDCLOUD_KEYWORDS, url_ids=df_result["URL_ID"])
+        st.pyplot(generate_wordcloud([kw for kw, count in top_keywords for _ in range(count)]))
 
         # --- 🧪 Benchmark Tab ---
     with tab4:
-        st.subheader("📊 Benchmarking Tools (TextBlob vs VADER, FOG vs Flesch)")
+        st.subheader("📊 Benchmarking Tools (TextBlob vs VADER, readability formulas)")
 
         with st.expander("ℹ️ Why Benchmarks?"):
             st.markdown("""
             - Benchmarking helps validate your NLP pipeline.
             - TextBlob vs VADER → compare ML vs rule-based sentiment.
-            - FOG vs Flesch → test readability from complexity and ease perspectives.
+            - Readability formulas → FOG, Flesch and others side by side, from the same counts as the report.
             """)
 
         # Run benchmarking directly with sliders
         top_n = st.slider("📌 Select number of articles to benchmark:", min_value=2, max_value=20, value=5)
 
-        sentiment_results = benchmark_sentiments(df_result, top_n=top_n)
-        readability_results = benchmark_readability(df_result, top_n=top_n)
+        sentiment_results = benchmark_sentiments(df_result, folder=folder, top_n=top_n)
+        readability_results = benchmark_readability(df_result, folder=folder, top_n=top_n)
 
         if sentiment_results:
             st.subheader("🧪 Sentiment Comparison")
@@ -103,7 +102,8 @@ def show_visual_tabs(df_result):
         st.markdown("---")
 
         if readability_results:
-            st.subheader("📚 Readability Comparison")
+            st.subheader("📚 Readability Formulas")
+            st.caption("Scores come from the report's own readability engine, so they show how the formulas differ, not an independent check of the report.")
             st.plotly_chart(plot_readability_comparison(readability_results), use_container_width=True)
 
             readability_df = pd.DataFrame(readability_results)
@@ -0,0 +1,174 @@
+"""
+Pipelined extraction and analysis.
+
+Fetch workers download and extract articles and hand each text straight to
+analysis workers through a bounded queue, so network-bound fetching and
+CPU-bound analysis overlap instead of running one after the other. Saving the
+text to the corpus (and the full-text index) still happens in the fetch worker,
+as a side effect; the analyzer never reads it back from disk. When analysis
+falls behind, the full queue makes fetch workers wait, which bounds the number
+of texts held in memory to about `queue_size + fetch_workers`.
+
+Usage:
+    python -m app.pipelined input/urls.xlsx --fetch-workers 8 --queue-size 16
+"""
+import argparse
+import contextvars
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from .analyzer import OUTPUT_COLUMNS, METRIC_COLUMNS, ANALYSIS_PROFILES, analyze_text, profile_columns
+from .corpus import ARTICLES_DIR
+from .dedupe import NearDuplicateIndex, DEDUPE_ENABLED
+from .extractor_router import get_router
+from .metrics import span
+from .scraper import extract_article_text
+from .workspace import atomic_path
+
+FETCH_WORKERS = int(os.getenv("ARTICLE_EXTRACT_WORKERS", 4))
+ANALYZE_WORKERS = int(os.getenv("ARTICLE_ANALYZE_WORKERS", 1))
+PIPELINE_QUEUE_SIZE = int(os.getenv("ARTICLE_PIPELINE_QUEUE_SIZE", 16))
+
+_DONE = object()
+
+
+def run_pipelined(rows, save_dir=ARTICLES_DIR, fetch_workers=FETCH_WORKERS, analyze_workers=ANALYZE_WORKERS,
+                  queue_size=PIPELINE_QUEUE_SIZE, columns=None, dedupe=DEDUPE_ENABLED):
+    """
+    Extracts and analyzes articles with fetching and analysis overlapped.
+
+    Args:
+        rows (list): [(URL_ID, URL), ...] in input order.
+        save_dir (str): Corpus folder the extracted texts are saved to.
+        fetch_workers (int): Concurrent downloads.
+        analyze_workers (int): Analysis threads consuming the handoff queue.
+        queue_size (int): Extracted texts waiting for analysis before fetchers block.
+        columns (iterable): Metrics to compute; defaults to all.
+        dedupe (bool): Reuse the metrics of an already analyzed near-duplicate.
+
+    Returns:
+        tuple: (result rows in input order, [(URL_ID, extraction status), ...] in input order,
+        number of articles extracted)
+    """
+    handoff = queue.Queue(maxsize=max(1, queue_size))
+    lock = threading.Lock()
+    messages = [None] * len(rows)
+    extracted = [False] * len(rows)
+    results = {}
+    dedupe_index = NearDuplicateIndex() if dedupe else None
+    metrics_by_id = {}
+
+    def fetch(position, url_id, url):
+        try:
+            success, message, text = extract_article_text(url_id, url, save_dir=save_dir)
+        except Exception as e:
+            success, message, text = False, f"❌ Failed to extract article: {e}", None
+        messages[position] = (url_id, message)
+        extracted[position] = success
+        if success and text is not None:
+            with span("pipeline.handoff_wait"):
+                handoff.put((position, url_id, url, text))  # blocks while analysis is behind
+
+    def analyze():
+        while True:
+            item = handoff.get()
+            if item is _DONE:
+                return
+            position, url_id, url, text = item
+            try:
+                duplicate_of, metrics = None, None
+                if dedupe_index is not None:
+                    with lock, span("analyzer.dedupe"):
+                        duplicate_of = dedupe_index.add(url_id, text)
+                        metrics = metrics_by_id.get(duplicate_of)
+                if metrics is None:
+                    duplicate_of = None
+                    metrics = analyze_text(text, columns)
+                    with lock:
+                        metrics_by_id[url_id] = metrics
+            except Exception as e:
+                # Keep consuming: a dead analyzer would leave fetchers blocked on a full queue
+                messages[position] = (url_id, f"❌ Failed to analyze article {url_id}: {e}")
+                continue
+
+            with lock:
+                results[position] = [url_id, url] + metrics + [duplicate_of or ""]
+
+    # Each worker runs in a copy of the caller's context, so spans reach its collectors
+    analyzers = [
+        threading.Thread(target=contextvars.copy_context().run, args=(analyze,), name=f"pipeline-analyze-{i}", daemon=True)
+        for i in range(max(1, analyze_workers))
+    ]
+    for thread in analyzers:
+        thread.start()
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, fetch_workers), thread_name_prefix="pipeline-fetch") as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, fetch, position, url_id, url)
+                for position, (url_id, url) in enumerate(rows)
+            ]
+            for future in futures:
+                future.result()
+    finally:
+        for _ in analyzers:
+            handoff.put(_DONE)
+        for thread in analyzers:
+            thread.join()
+
+    return [results[position] for position in sorted(results)], messages, sum(extracted)
+
+
+def extract_and_analyze(path, output_path="output/Output Data Structure.xlsx", save_dir=ARTICLES_DIR,
+                        profile=None, **options):
+    """
+    Pipelined counterpart of extraction followed by analyze_articles.
+
+    Args:
+        path (str): Input workbook with URL_ID and URL columns.
+        output_path (str): Excel report to write.
+        save_dir (str): Corpus folder the extracted texts are saved to.
+        profile (str): Analysis profile (see ANALYSIS_PROFILES); defaults to ANALYSIS_PROFILE.
+        **options: fetch_workers, analyze_workers, queue_size (see run_pipelined).
+
+    Returns:
+        tuple: (result DataFrame, [(URL_ID, extraction status), ...], number of articles extracted)
+    """
+    df = pd.read_excel(path)
+    df = df.dropna(subset=["URL_ID", "URL"])
+    rows = list(zip(df["URL_ID"].astype(str), df["URL"]))
+
+    result_rows, messages, extracted = run_pipelined(rows, save_dir, columns=profile_columns(profile), **options)
+    get_router().save()
+
+    df_out = pd.DataFrame(result_rows, columns=OUTPUT_COLUMNS)
+    df_out[METRIC_COLUMNS] = df_out[METRIC_COLUMNS].apply(pd.to_numeric, errors="coerce")
+    with span("report.excel_write"), atomic_path(output_path) as tmp_path:
+        df_out.to_excel(tmp_path, index=False)
+    return df_out, messages, extracted
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract and analyze articles with fetching and analysis overlapped.")
+    parser.add_argument("input", help="Input workbook with URL_ID and URL columns.")
+    parser.add_argument("--output", default="output/Output Data Structure.xlsx")
+    parser.add_argument("--folder", default=ARTICLES_DIR)
+    parser.add_argument("--fetch-workers", type=int, default=FETCH_WORKERS)
+    parser.add_argument("--analyze-workers", type=int, default=ANALYZE_WORKERS)
+    parser.add_argument("--queue-size", type=int, default=PIPELINE_QUEUE_SIZE)
+    parser.add_argument("--profile", choices=sorted(ANALYSIS_PROFILES), help="Metrics to compute (default: full).")
+    args = parser.parse_args(argv)
+
+    df_out, messages, extracted = extract_and_analyze(
+        args.input, args.output, args.folder, args.profile,
+        fetch_workers=args.fetch_workers, analyze_workers=args.analyze_workers, queue_size=args.queue_size,
+    )
+    print(f"✅ Extracted {extracted}/{len(messages)} articles, wrote {len(df_out)} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
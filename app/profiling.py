@@ -0,0 +1,202 @@
+"""
+On-demand profiling of an app run.
+
+Off by default. Set ARTICLE_PROFILE (or open the app with ?profile=...) to
+"cpu" (cProfile), "memory" (tracemalloc) or "all". The script thread is
+profiled for the whole run; worker threads are profiled while they run a
+metrics span (scraper, analyzer, keyword, chart and PDF stages are all
+spans), as long as they run in a copy of the run's context. The report holds
+a pstats dump, the top-N hot functions and the top allocation sites. When
+profiling is off, a span pays for one context variable lookup.
+
+Usage:
+    python -m app.profiling output/profile.prof      # print the hot functions of a saved dump
+"""
+import argparse
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+PROFILE_MODES = ("cpu", "memory", "all")
+PROFILE_MODE = os.getenv("ARTICLE_PROFILE", "")
+PROFILE_TOP_N = int(os.getenv("ARTICLE_PROFILE_TOP_N", 30))
+
+_current_session = ContextVar("current_profile_session", default=None)
+
+
+def profiling_mode(requested=None):
+    """
+    The profiling mode for this run: `requested` (e.g. a query parameter) if valid, else ARTICLE_PROFILE.
+
+    Returns:
+        str: One of PROFILE_MODES, or None when profiling is off.
+    """
+    for mode in (requested, PROFILE_MODE):
+        if mode and mode.lower() in PROFILE_MODES:
+            return mode.lower()
+    return None
+
+
+class ProfileReport:
+    """Results of one profiled run."""
+
+    def __init__(self, mode, seconds, stats, allocation_sites, memory_peak, top_n):
+        self.mode = mode
+        self.seconds = seconds
+        self.stats = stats
+        self.allocation_sites = allocation_sites
+        self.memory_peak = memory_peak
+        self.top_n = top_n
+
+    def hot_functions(self, sort="tottime"):
+        """Top-N functions by own time ("tottime") or cumulative time ("cumtime")."""
+        if self.stats is None:
+            return []
+        rows = [
+            {
+                "Function": f"{os.path.basename(filename)}:{line}({name})",
+                "Calls": calls,
+                "Own (s)": round(own, 4),
+                "Cumulative (s)": round(cumulative, 4),
+            }
+            for (filename, line, name), (_, calls, own, cumulative, _) in self.stats.stats.items()
+        ]
+        key = "Own (s)" if sort == "tottime" else "Cumulative (s)"
+        return sorted(rows, key=lambda row: -row[key])[:self.top_n]
+
+    def pstats_dump(self):
+        """The profile in pstats' file format (load with pstats.Stats or snakeviz)."""
+        return marshal.dumps(self.stats.stats) if self.stats is not None else b""
+
+    def text(self):
+        """Plain-text report: hot functions by own and cumulative time, then allocation sites."""
+        out = io.StringIO()
+        out.write(f"Profile mode: {self.mode}, run time: {self.seconds:.2f}s\n\n")
+        if self.stats is not None:
+            for sort in ("tottime", "cumulative"):
+                out.write(f"=== Top {self.top_n} functions by {sort} ===\n")
+                self.stats.stream = out
+                self.stats.sort_stats(sort).print_stats(self.top_n)
+        if self.allocation_sites:
+            out.write(f"=== Top {self.top_n} allocation sites (peak traced: {self.memory_peak / 1024:.1f} KB) ===\n")
+            for site in self.allocation_sites:
+                out.write(f"{site['Size (KB)']:>12.1f} KB {site['Blocks']:>10}  {site['Site']}\n")
+        return out.getvalue()
+
+
+class ProfileSession:
+    def __init__(self, mode, top_n=PROFILE_TOP_N):
+        self.mode = mode
+        self.cpu = mode in ("cpu", "all")
+        self.memory = mode in ("memory", "all")
+        self.top_n = top_n
+        self.thread_id = threading.get_ident()
+        self.profiles = []
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def thread(self):
+        """Profiles a worker thread for the duration of its outermost span."""
+        if not self.cpu or threading.get_ident() == self.thread_id or getattr(self.local, "profile", None):
+            yield
+            return
+        profile = self.local.profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self.local.profile = None
+            with self.lock:
+                self.profiles.append(profile)
+
+    def stats(self):
+        with self.lock:
+            profiles = [profile for profile in self.profiles if profile.getstats()]
+        if not profiles:
+            return None
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        return stats
+
+
+def thread_profiler():
+    """The profiling session of the current run, if any (used by metrics.span)."""
+    return _current_session.get()
+
+
+def _allocation_sites(snapshot, top_n):
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ))
+    return [
+        {
+            "Site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "Size (KB)": round(stat.size / 1024, 1),
+            "Blocks": stat.count,
+        }
+        for stat in snapshot.statistics("lineno")[:top_n]
+    ]
+
+
+@contextmanager
+def profile_run(mode, top_n=PROFILE_TOP_N):
+    """
+    Profiles the block in `mode`; does nothing when `mode` is None.
+
+    Yields:
+        dict: Gets a "report" (ProfileReport) when the block exits.
+    """
+    result = {}
+    if mode is None:
+        yield result
+        return
+
+    session = ProfileSession(mode, top_n)
+    token = _current_session.set(session)
+    from .metrics import _start_tracing, traced_peak  # metrics imports this module
+
+    started_tracing = session.memory and _start_tracing()
+    main_profile = cProfile.Profile() if session.cpu else None
+    start = time.perf_counter()
+    if main_profile is not None:
+        main_profile.enable()
+    try:
+        yield result
+    finally:
+        if main_profile is not None:
+            main_profile.disable()
+            with session.lock:
+                session.profiles.append(main_profile)
+        seconds = time.perf_counter() - start
+        sites, peak = [], 0
+        if session.memory and tracemalloc.is_tracing():
+            peak = traced_peak()
+            sites = _allocation_sites(tracemalloc.take_snapshot(), top_n)
+        if started_tracing:
+            tracemalloc.stop()
+        _current_session.reset(token)
+        result["report"] = ProfileReport(mode, seconds, session.stats(), sites, peak, top_n)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print the hot functions of a saved profile.")
+    parser.add_argument("path", help="pstats dump downloaded from the app.")
+    parser.add_argument("--sort", default="tottime", choices=["tottime", "cumulative", "calls"])
+    parser.add_argument("--top", type=int, default=PROFILE_TOP_N)
+    args = parser.parse_args(argv)
+    pstats.Stats(args.path).sort_stats(args.sort).print_stats(args.top)
+
+
+if __name__ == "__main__":
+    main()
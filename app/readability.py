@@ -0,0 +1,162 @@
+"""
+One-pass readability engine.
+
+Each document is sentence-split, tokenized and syllable-counted once into a
+ReadabilityCounts record; every readability score (FOG, Flesch Reading Ease,
+Flesch-Kincaid, SMOG, Coleman-Liau, ARI) and the analyzer's report columns
+are then plain arithmetic on those counts.
+"""
+import math
+from collections import namedtuple
+
+from nltk.corpus import stopwords
+from nltk.tokenize import word_tokenize
+
+from .nltk_setup import ensure_nltk_resources
+from .metrics import span
+from .nlp_models import get_model
+from .utils import count_syllables
+
+ensure_nltk_resources()
+stop_words = set(stopwords.words("english"))
+
+SYLLABLE_CACHE_SIZE = 200_000
+
+ReadabilityCounts = namedtuple("ReadabilityCounts", [
+    "sentences",         # sentence count (nltk punkt)
+    "words",             # alphabetic tokens
+    "letters",           # letters in alphabetic tokens
+    "syllables",         # syllables in alphabetic tokens
+    "complex_words",     # alphabetic tokens with 3+ syllables
+    "clean_words",       # alphabetic, non-stopword tokens (the analyzer's word count)
+    "clean_letters",
+    "clean_syllables",
+    "clean_complex_words",
+])
+
+_syllable_cache = {}
+
+
+def _syllables(word):
+    count = _syllable_cache.get(word)
+    if count is None:
+        if len(_syllable_cache) >= SYLLABLE_CACHE_SIZE:
+            _syllable_cache.clear()
+        count = _syllable_cache[word] = count_syllables(word)
+    return count
+
+
+# 🔢 Counting: the only pass over the text
+def collect_counts(text):
+    """
+    Collects every count the readability formulas need in a single pass.
+
+    Sentences are split once and each sentence is word-tokenized on its own,
+    which yields the same tokens as word_tokenize(text) without splitting
+    sentences a second time.
+
+    Returns:
+        ReadabilityCounts: Counts for the whole document.
+    """
+    with span("readability.tokenize"):
+        sentences = get_model("punkt").tokenize(text)  # what sent_tokenize does, minus the lookup
+        tokens = [token for sentence in sentences for token in word_tokenize(sentence, preserve_line=True)]
+
+    words = letters = syllables = complex_words = 0
+    clean_words = clean_letters = clean_syllables = clean_complex = 0
+
+    with span("readability.syllables"):
+        for token in tokens:
+            if not token.isalpha():
+                continue
+            word = token.lower()
+            n = _syllables(word)
+            words += 1
+            letters += len(word)
+            syllables += n
+            complex_words += n > 2
+            if word not in stop_words:
+                clean_words += 1
+                clean_letters += len(word)
+                clean_syllables += n
+                clean_complex += n > 2
+
+    return ReadabilityCounts(
+        len(sentences), words, letters, syllables, complex_words,
+        clean_words, clean_letters, clean_syllables, clean_complex,
+    )
+
+
+# 📐 Standard formulas (over all words)
+def gunning_fog(c):
+    return 0.4 * (c.words / max(c.sentences, 1) + 100 * c.complex_words / max(c.words, 1))
+
+
+def flesch_reading_ease(c):
+    return 206.835 - 1.015 * (c.words / max(c.sentences, 1)) - 84.6 * (c.syllables / max(c.words, 1))
+
+
+def flesch_kincaid_grade(c):
+    return 0.39 * (c.words / max(c.sentences, 1)) + 11.8 * (c.syllables / max(c.words, 1)) - 15.59
+
+
+def smog_index(c):
+    return 1.043 * math.sqrt(c.complex_words * 30 / max(c.sentences, 1)) + 3.1291
+
+
+def coleman_liau_index(c):
+    per_100_words = 100 / max(c.words, 1)
+    return 0.0588 * c.letters * per_100_words - 0.296 * c.sentences * per_100_words - 15.8
+
+
+def automated_readability_index(c):
+    return 4.71 * (c.letters / max(c.words, 1)) + 0.5 * (c.words / max(c.sentences, 1)) - 21.43
+
+
+SCORES = {
+    "FOG": gunning_fog,
+    "Flesch": flesch_reading_ease,
+    "Flesch-Kincaid": flesch_kincaid_grade,
+    "SMOG": smog_index,
+    "Coleman-Liau": coleman_liau_index,
+    "ARI": automated_readability_index,
+}
+
+
+def readability_scores(counts, ndigits=2):
+    """Computes every score in SCORES from one document's counts."""
+    return {name: round(formula(counts), ndigits) for name, formula in SCORES.items()}
+
+
+# 📋 Analyzer report columns (stopwords excluded, as in the original report)
+def analyzer_metrics(c):
+    """
+    The readability columns of the analyzer report.
+
+    Returns:
+        dict: AVG SENTENCE LENGTH, PERCENTAGE OF COMPLEX WORDS, FOG INDEX,
+        COMPLEX WORD COUNT, WORD COUNT, SYLLABLE PER WORD and AVG WORD LENGTH.
+    """
+    word_count = c.clean_words
+    avg_sentence_len = round(word_count / max(c.sentences, 1), 3)
+    percent_complex = round(c.clean_complex_words / max(word_count, 1), 3)
+    return {
+        "AVG SENTENCE LENGTH": avg_sentence_len,
+        "PERCENTAGE OF COMPLEX WORDS": percent_complex,
+        "FOG INDEX": round(0.4 * (avg_sentence_len + percent_complex), 3),
+        "COMPLEX WORD COUNT": c.clean_complex_words,
+        "WORD COUNT": word_count,
+        "SYLLABLE PER WORD": round(c.clean_syllables / max(word_count, 1), 3),
+        "AVG WORD LENGTH": round(c.clean_letters / max(word_count, 1), 3),
+    }
+
+
+# 📚 Batch mode
+def score_documents(texts, ndigits=2):
+    """
+    Counts and scores many documents, sharing the syllable cache across them.
+
+    Returns:
+        list[dict]: readability_scores() per text, in input order.
+    """
+    return [readability_scores(collect_counts(text), ndigits) for text in texts]
@@ -1,14 +1,15 @@
-import os
-import requests
-from newspaper import Article
-from readability import Document
-from bs4 import BeautifulSoup
+from .fetcher import fetch_page, decode_html, FetchRejected
+from .extractor_router import EXTRACTORS, get_router, parse_html
+from .html_archive import OFFLINE_EXTRACTION, archive_page, load_archived_html
+from .metrics import span, incr
+from .corpus import write_article
+from .fulltext_index import index_article
 
 
 def extract_articles(url_id, url, save_dir="extracted_articles"):
     """
-    Extracts main text content from a given URL using Newspaper3k or Readability fallback.
-    
+    Extracts main text content from a given URL and saves it (see extract_article_text).
+
     Args:
         url_id (str): Unique identifier for the article.
         url (str): The article URL.
@@ -17,43 +18,65 @@ def extract_articles(url_id, url, save_dir="extracted_articles"):
     Returns:
         tuple: (True/False, status message)
     """
+    success, message, _ = extract_article_text(url_id, url, save_dir)
+    return success, message
+
+
+def extract_article_text(url_id, url, save_dir="extracted_articles", index=True):
+    """
+    Extracts main text content from a given URL using the cheapest extractor known to work.
+
+    The page is downloaded once through a streamed, size-capped fetch. The extractor
+    router then tries Newspaper3k, Readability and an lxml fast path in the order it
+    has learned for the URL's domain, recording success and parse time for each try.
+    
+    Args:
+        url_id (str): Unique identifier for the article.
+        url (str): The article URL.
+        save_dir (str): Directory to save extracted articles.
+        index (bool): Also add the text to the folder's full-text index.
+
+    Returns:
+        tuple: (True/False, status message, saved text or None), so callers can
+        hand the text on without reading it back from disk.
+    """
     def save_to_file(text):
         try:
-            os.makedirs(save_dir, exist_ok=True)
-            file_path = os.path.join(save_dir, f"{url_id}.txt")
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(text.strip())
+            write_article(url_id, text.strip(), folder=save_dir)
+            if index:
+                index_article(url_id, text.strip(), folder=save_dir)
             return True, "✅ Article saved successfully"
         except Exception as e:
             return False, f"❌ Failed to save file: {e}"
 
-    # --------- Method 1: Try Newspaper3k ---------
+    # --------- Download: streamed, size-capped, HTML only (or from the archive when offline) ---------
     try:
-        article = Article(url)
-        article.download()
-        article.parse()
-        text = article.text.strip()
-
-        if len(text) >= 300:
-            saved, msg = save_to_file(text)
-            return saved, f"✅ Extracted with Newspaper3k | {msg}"
-    except Exception:
-        pass  # Fall back to next method
-
-    # --------- Method 2: Try Readability + BeautifulSoup fallback ---------
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-
-        doc = Document(response.text)
-        soup = BeautifulSoup(doc.summary(), "html.parser")
-        paragraphs = [p.get_text(strip=True) for p in soup.find_all("p")]
-        text = "\n".join(paragraphs)
-
-        if len(text) >= 100:
-            saved, msg = save_to_file(text)
-            return saved, f"✅ Extracted with Readability | {msg}"
-        else:
-            return False, "⚠️ Readability fallback content too short"
+        with span("scraper.fetch"):
+            if OFFLINE_EXTRACTION:
+                html = load_archived_html(url)
+            else:
+                body, content_type = fetch_page(url)
+                archive_page(url_id, url, body, content_type)
+                html = decode_html(body, content_type)
+    except FetchRejected as e:
+        incr("articles_extracted_total", status="rejected")
+        return False, f"⛔ Skipped non-article response: {e}", None
     except Exception as e:
-        return False, f"❌ Failed to extract content: {e}"
\ No newline at end of file
+        incr("articles_extracted_total", status="download_error")
+        return False, f"❌ Failed to download page: {e}", None
+
+    # --------- Parse: extractors in the order learned for this domain ---------
+    router = get_router()
+    text, name, attempts, last_error = parse_html(html, url, router.plan(url))
+    for attempt in attempts:
+        router.record(url, *attempt)
+
+    if name is not None:
+        incr("articles_extracted_total", status="ok", extractor=name)
+        saved, msg = save_to_file(text)
+        return saved, f"✅ Extracted with {EXTRACTORS[name].label} | {msg}", text if saved else None
+
+    incr("articles_extracted_total", status="too_short")
+    if last_error is not None:
+        return False, f"❌ Failed to extract content: {last_error}", None
+    return False, "⚠️ Extracted content too short", None
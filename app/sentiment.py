@@ -0,0 +1,261 @@
+"""
+Fused sentiment scoring: TextBlob (pattern) polarity/subjectivity and VADER compound from one tokenization.
+
+Both lexicons are loaded once per process. Each text is split on whitespace
+once; TextBlob's sub-tokens are derived per whitespace token (and cached, since
+vocabularies repeat across a corpus) and VADER's tokens are derived from the same
+split. The scoring rules themselves are the reference libraries' own, so results
+match TextBlob(text).sentiment and SentimentIntensityAnalyzer().polarity_scores(text)
+within SCORE_TOLERANCE.
+
+The fused path relies on textblob and nltk internals, which is why both are
+pinned in requirements.txt. If those internals are missing after an upgrade,
+scoring falls back to the public APIs (slower, same scores).
+
+Usage:
+    python -m app.sentiment check extracted_articles   # compare against the reference libraries
+"""
+import argparse
+import string
+import sys
+from collections import namedtuple
+from types import SimpleNamespace
+
+from nltk.sentiment import SentimentIntensityAnalyzer
+from textblob import TextBlob
+from textblob.en import sentiment as pattern_sentiment
+
+from .nltk_setup import ensure_nltk_resources
+from .metrics import span
+from .nlp_models import models
+
+ensure_nltk_resources()
+
+SCORE_TOLERANCE = 1e-9   # max absolute difference from the reference libraries
+TOKEN_CACHE_SIZE = 200_000
+
+SentimentScores = namedtuple("SentimentScores", ["polarity", "subjectivity", "compound"])
+
+try:
+    from textblob._text import (
+        PUNCTUATION, ABBREVIATIONS, RE_ABBR1, RE_ABBR2, RE_ABBR3,
+        RE_SARCASM, RE_EMOTICONS, replacements,
+    )
+    _LEADING = tuple(PUNCTUATION.replace(".", ""))
+    _TRAILING = _LEADING + (".",)
+    FUSED_TEXTBLOB = hasattr(pattern_sentiment, "assessments")
+except ImportError:
+    FUSED_TEXTBLOB = False
+# VADER's per-word scoring steps, called directly by the fused path
+FUSED_VADER = all(
+    hasattr(SentimentIntensityAnalyzer, name) for name in ("sentiment_valence", "_but_check", "score_valence")
+)
+if not (FUSED_TEXTBLOB and FUSED_VADER):
+    print("⚠️ textblob/nltk internals changed; sentiment falls back to TextBlob(text).sentiment and polarity_scores")
+
+_QUOTES = ("“", "”", "‘", "’", "'", '"')
+_STRIP_PUNCTUATION = str.maketrans("", "", string.punctuation)
+
+_token_cache = {}
+
+
+def _analyzers():
+    """The shared VADER analyzer, with the pattern lexicon loaded (see app.nlp_models)."""
+    models.get("pattern_lexicon")
+    return models.get("vader")
+
+
+# ---------------- TextBlob tokens ----------------
+def _split_punctuation(t):
+    """Splits leading/trailing punctuation off one token, as textblob's find_tokens does."""
+    tokens, tail = [], []
+    while t.startswith(_LEADING) and t not in replacements:
+        tokens.append(t[0])
+        t = t[1:]
+    while t.endswith(_TRAILING) and t not in replacements:
+        if t.endswith(_LEADING):
+            tail.append(t[-1])
+            t = t[:-1]
+        if t.endswith("..."):
+            tail.append("...")
+            t = t[:-3].rstrip(".")
+        if t.endswith("."):
+            if t in ABBREVIATIONS or RE_ABBR1.match(t) or RE_ABBR2.match(t) or RE_ABBR3.match(t):
+                break
+            tail.append(t[-1])
+            t = t[:-1]
+    if t != "":
+        tokens.append(t)
+    tokens.extend(reversed(tail))
+    return tokens
+
+
+def _textblob_tokens(word):
+    """TextBlob sub-tokens of one whitespace token (contractions, quotes, punctuation split off)."""
+    tokens = _token_cache.get(word)
+    if tokens is None:
+        piece = word
+        for contraction, spaced in replacements.items():
+            piece = piece.replace(contraction, spaced)
+        for quote in _QUOTES:
+            piece = piece.replace(quote, f" {quote} ")
+        tokens = [t for part in piece.split() for t in _split_punctuation(part)]
+        if len(_token_cache) >= TOKEN_CACHE_SIZE:
+            _token_cache.clear()
+        _token_cache[word] = tokens
+    return tokens
+
+
+def _textblob_totals(words):
+    """Sums of TextBlob polarity and subjectivity over the assessments, and their count."""
+    tokens = [t for word in words for t in _textblob_tokens(word)]
+    joined = " ".join(tokens)
+    if "(" in joined:
+        joined = RE_SARCASM.sub("(!)", joined)
+    joined = RE_EMOTICONS.sub(lambda m: m.group(1).replace(" ", "") + m.group(2), joined)
+
+    assessments = pattern_sentiment.assessments(((w.lower(), None) for w in joined.split()), True)
+    return sum(p for _, p, _, _ in assessments), sum(s for _, _, s, _ in assessments), len(assessments)
+
+
+def _textblob_scores(words):
+    polarity, subjectivity, n = _textblob_totals(words)
+    return polarity / float(n or 1), subjectivity / float(n or 1)
+
+
+# ---------------- VADER tokens ----------------
+def _vader_compound(sia, words, text):
+    punc_list = sia.constants.PUNC_LIST
+    words_only = {w for w in (word.translate(_STRIP_PUNCTUATION) for word in words) if len(w) > 1}
+
+    # Same mapping as SentiText._words_plus_punc, without building the punctuation x word product
+    mapped = {}
+    wes = []
+    for we in words:
+        if len(we) <= 1:
+            continue
+        if we not in mapped:
+            mapped[we] = we
+            for p in punc_list:
+                if we.startswith(p) and we[len(p):] in words_only:
+                    mapped[we] = we[len(p):]
+                    break
+                if we.endswith(p) and we[:-len(p)] in words_only:
+                    mapped[we] = we[:-len(p)]
+                    break
+        wes.append(mapped[we])
+
+    allcaps = sum(1 for we in wes if we.isupper())
+    sentitext = SimpleNamespace(text=text, words_and_emoticons=wes, is_cap_diff=0 < len(wes) - allcaps < len(wes))
+
+    # VADER looks words up by their first occurrence (list.index); keep that, in O(1)
+    first_index = {}
+    for i, we in enumerate(wes):
+        first_index.setdefault(we, i)
+
+    boosters = sia.constants.BOOSTER_DICT
+    sentiments = []
+    for item in wes:
+        i = first_index[item]
+        lowered = item.lower()
+        if (i < len(wes) - 1 and lowered == "kind" and wes[i + 1].lower() == "of") or lowered in boosters:
+            sentiments.append(0)
+            continue
+        sentiments = sia.sentiment_valence(0, sentitext, item, i, sentiments)
+
+    sentiments = sia._but_check(wes, sentiments)
+    return sia.score_valence(sentiments, text)["compound"]
+
+
+# ---------------- Public API ----------------
+def score_text(text, vader=True):
+    """
+    Scores one text with both sentiment models.
+
+    Args:
+        text (str): Article text.
+        vader (bool): Also compute the VADER compound score (None otherwise).
+
+    Returns:
+        SentimentScores: (polarity, subjectivity, compound).
+    """
+    sia = _analyzers()
+    words = text.split()
+
+    with span("sentiment.textblob"):
+        if FUSED_TEXTBLOB:
+            polarity, subjectivity = _textblob_scores(words)
+        else:
+            polarity, subjectivity = TextBlob(text).sentiment
+
+    compound = None
+    if vader:
+        with span("sentiment.vader"):
+            if FUSED_VADER and hasattr(sia, "constants"):
+                compound = _vader_compound(sia, words, text)
+            else:
+                compound = sia.polarity_scores(text)["compound"]
+    return SentimentScores(polarity, subjectivity, compound)
+
+
+def textblob_totals(text):
+    """
+    TextBlob sentiment of one text as mergeable totals.
+
+    Polarity and subjectivity are means over the text's assessments, so the
+    totals of consecutive chunks of a document add up to the document's own:
+    polarity = sum of polarity totals / sum of counts.
+
+    Returns:
+        tuple: (polarity total, subjectivity total, number of assessments).
+    """
+    _analyzers()
+    with span("sentiment.textblob"):
+        if FUSED_TEXTBLOB:
+            return _textblob_totals(text.split())
+        assessments = TextBlob(text).sentiment_assessments.assessments
+        return sum(a[1] for a in assessments), sum(a[2] for a in assessments), len(assessments)
+
+
+def score_texts(texts, vader=True):
+    """Scores a batch of texts; the lexicons and token cache are shared across the batch."""
+    return [score_text(text, vader) for text in texts]
+
+
+def check_against_reference(texts):
+    """
+    Compares the fused scores with TextBlob and VADER run separately.
+
+    Returns:
+        dict: Largest absolute difference per score.
+    """
+    sia = _analyzers()
+    worst = {"polarity": 0.0, "subjectivity": 0.0, "compound": 0.0}
+    for text in texts:
+        fused = score_text(text)
+        reference = TextBlob(text).sentiment
+        worst["polarity"] = max(worst["polarity"], abs(fused.polarity - reference.polarity))
+        worst["subjectivity"] = max(worst["subjectivity"], abs(fused.subjectivity - reference.subjectivity))
+        worst["compound"] = max(worst["compound"], abs(fused.compound - sia.polarity_scores(text)["compound"]))
+    return worst
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check fused sentiment scores against TextBlob and VADER.")
+    parser.add_argument("command", choices=["check"])
+    parser.add_argument("folder", nargs="?", default="extracted_articles")
+    args = parser.parse_args(argv)
+
+    from .corpus import get_store
+    store = get_store(args.folder)
+    texts = [text for text in (store.read(url_id) for url_id in store.keys()) if text is not None]
+    worst = check_against_reference(texts)
+    ok = all(diff <= SCORE_TOLERANCE for diff in worst.values())
+    print(f"{'✅' if ok else '❌'} {len(texts)} article(s), max difference: "
+          + ", ".join(f"{name} {diff:.2e}" for name, diff in worst.items()))
+    if not ok:
+        sys.exit(1)  # usable as a CI regression gate
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Process-wide cache of per-URL extraction and analysis records, shared by all sessions.
+
+Records are immutable. The first session to ask for a URL computes its record;
+sessions asking for the same URL meanwhile wait for that result instead of
+scraping it again. Every holder takes a reference (lease) on the records it uses,
+and least-recently-used records are evicted only once no job references them.
+"""
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+import streamlit as st
+
+from .metrics import incr
+
+SHARED_CACHE_ENTRIES = int(os.getenv("ARTICLE_SHARED_CACHE_ENTRIES", 2000))
+SHARED_CACHE_BYTES = int(os.getenv("ARTICLE_SHARED_CACHE_MB", 256)) * 1024 * 1024
+
+# digest is the content hash of the extracted text in the shared object store (the text itself
+# is not kept in memory); metrics is a tuple in OUTPUT_COLUMNS order (without URL_ID, URL,
+# DUPLICATE OF), or None
+ArticleRecord = namedtuple("ArticleRecord", ["url", "success", "message", "digest", "metrics"])
+
+
+def record_size(record):
+    return len(record.digest or "") + len(record.message or "") + 256
+
+
+class SharedArticleCache:
+    def __init__(self, max_entries=SHARED_CACHE_ENTRIES, max_bytes=SHARED_CACHE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.records = OrderedDict()     # url -> ArticleRecord, least recently used first
+        self.refcounts = {}
+        self.inflight = {}               # url -> threading.Event while being computed
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self, url, compute):
+        """
+        Returns the record for `url` and takes a reference on it.
+
+        `compute()` runs at most once at a time per URL across all sessions; failed
+        records (success=False) are returned but not cached, so they are retried later.
+        Call release(url) once for every acquire.
+        """
+        while True:
+            with self.lock:
+                record = self.records.get(url)
+                if record is not None:
+                    self.records.move_to_end(url)
+                    self.refcounts[url] = self.refcounts.get(url, 0) + 1
+                    self.hits += 1
+                    incr("shared_cache_requests_total", result="hit")
+                    return record
+
+                event = self.inflight.get(url)
+                owner = event is None
+                if owner:
+                    event = self.inflight[url] = threading.Event()
+
+            if not owner:
+                # Another session is computing it; a failed attempt leaves nothing cached and we compute it ourselves
+                event.wait()
+                continue
+
+            try:
+                record = compute()
+            finally:
+                with self.lock:
+                    self.inflight.pop(url, None)
+                event.set()
+
+            with self.lock:
+                self.misses += 1
+                incr("shared_cache_requests_total", result="miss")
+                self.refcounts[url] = self.refcounts.get(url, 0) + 1
+                if record.success and url not in self.records:
+                    self.records[url] = record
+                    self.bytes += record_size(record)
+                    self._evict()
+            return record
+
+    def release(self, url):
+        """Drops one reference; unreferenced records become eligible for eviction."""
+        with self.lock:
+            count = self.refcounts.get(url, 0) - 1
+            if count > 0:
+                self.refcounts[url] = count
+            else:
+                self.refcounts.pop(url, None)
+            self._evict()
+
+    def _evict(self):
+        if len(self.records) <= self.max_entries and self.bytes <= self.max_bytes:
+            return
+        for url in list(self.records):
+            if len(self.records) <= self.max_entries and self.bytes <= self.max_bytes:
+                break
+            if self.refcounts.get(url):
+                continue  # still referenced by a job
+            self.bytes -= record_size(self.records.pop(url))
+
+    def stats(self):
+        with self.lock:
+            return {
+                "entries": len(self.records),
+                "bytes": self.bytes,
+                "referenced": sum(1 for url in self.records if self.refcounts.get(url)),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+@st.cache_resource
+def get_shared_cache():
+    """Returns the article record cache shared by all sessions of this server process."""
+    return SharedArticleCache()
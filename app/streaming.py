@@ -0,0 +1,214 @@
+"""
+Bounded-memory streaming analysis.
+
+Input rows, article texts and result rows all flow through generators: at most
+`max_in_flight` article texts are held in memory at once, and result rows are
+written to the Excel report as they complete instead of being collected first.
+
+Usage:
+    python -m app.streaming input/urls.xlsx --max-in-flight 4 --memory-report
+    python -m app.streaming input/urls.xlsx --profile sentiment
+"""
+import argparse
+import contextvars
+import os
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from openpyxl import Workbook, load_workbook
+
+from .analyzer import OUTPUT_COLUMNS, ANALYSIS_PROFILES, analyze_text, profile_columns
+from .metrics import span, track_memory
+from .corpus import read_article
+from .dedupe import NearDuplicateIndex, DEDUPE_ENABLED
+from .workspace import atomic_path
+
+MAX_IN_FLIGHT = int(os.getenv("ARTICLE_MAX_IN_FLIGHT", 4))
+# Originals kept for near-duplicate reuse: their metrics plus their MinHash signature and
+# LSH bucket entries (a few KB per article, not texts or futures)
+MAX_CANONICAL_METRICS = int(os.getenv("ARTICLE_MAX_CANONICAL_METRICS", 10_000))
+
+
+# 📥 Input: (URL_ID, URL) pairs straight from the workbook
+def iter_input_rows(path):
+    """
+    Streams (URL_ID, URL) pairs from an input workbook without loading it into a DataFrame.
+
+    Like load_input_excel, a first row without URL_ID/URL headers is treated as data.
+    Rows missing either value are skipped.
+    """
+    workbook = load_workbook(path, read_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        first = next(rows, None)
+        if first is None:
+            return
+
+        header = [str(cell).strip() if cell is not None else "" for cell in first]
+        if "URL_ID" in header and "URL" in header:
+            id_col, url_col = header.index("URL_ID"), header.index("URL")
+        else:
+            id_col, url_col = 0, 1
+            rows = _prepend(first, rows)
+
+        for row in rows:
+            if row is None or len(row) <= max(id_col, url_col):
+                continue
+            url_id, url = row[id_col], row[url_col]
+            if url_id is None or url is None:
+                continue
+            yield str(url_id), str(url)
+    finally:
+        workbook.close()
+
+
+def _prepend(first, rows):
+    yield first
+    yield from rows
+
+
+# 📄 Texts: read one article at a time
+def iter_article_texts(rows, folder="extracted_articles"):
+    """Yields (URL_ID, URL, text) for every row that has an extracted article."""
+    for url_id, url in rows:
+        with span("analyzer.read"):
+            text = read_article(url_id, folder)
+        if text is not None:
+            yield url_id, url, text
+
+
+# ⚙️ Analysis: bounded number of articles in flight
+def stream_analyze(items, max_in_flight=MAX_IN_FLIGHT, dedupe=DEDUPE_ENABLED, columns=None):
+    """
+    Analyzes (URL_ID, URL, text) items and yields result rows in input order.
+
+    Only the metrics in `columns` are computed (all of them by default).
+
+    New items are only pulled from `items` once a slot frees up, so memory is
+    bounded by `max_in_flight` texts regardless of corpus size. Near-duplicates
+    reuse the metrics of the first copy while it is in flight or among the
+    MAX_CANONICAL_METRICS most recently used originals. Originals evicted from
+    that LRU, or whose analysis failed, are dropped from the near-duplicate index
+    as well, so dedupe memory is bounded too; the next copy of one is analyzed
+    again and becomes the original of its group. Articles that fail to analyze
+    are skipped.
+    """
+    max_in_flight = max(1, max_in_flight)
+    pending = deque()
+    dedupe_index = NearDuplicateIndex() if dedupe else None
+    in_flight = {}              # URL_ID -> future, for originals still being analyzed
+    canonical = OrderedDict()   # URL_ID -> metrics of finished originals, most recently used last
+
+    def next_row():
+        url_id, url, duplicate_of, future = pending.popleft()
+        row = _row_or_none(url_id, url, duplicate_of, future)
+        if in_flight.pop(url_id, None) is None:
+            return row
+        if row is None:
+            dedupe_index.remove(url_id)  # the next copy is analyzed and becomes the original
+        else:
+            canonical[url_id] = row[2:-1]
+            if len(canonical) > MAX_CANONICAL_METRICS:
+                evicted, _ = canonical.popitem(last=False)
+                dedupe_index.remove(evicted)
+        return row
+
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        for url_id, url, text in items:
+            duplicate_of = None
+            if dedupe_index is not None:
+                with span("analyzer.dedupe"):
+                    duplicate_of = dedupe_index.add(url_id, text)
+
+            if duplicate_of in in_flight:
+                future = in_flight[duplicate_of]
+            elif duplicate_of in canonical:
+                canonical.move_to_end(duplicate_of)
+                future = Future()
+                future.set_result(canonical[duplicate_of])
+            else:
+                duplicate_of = None
+                context = contextvars.copy_context()  # keep span/memory collectors in worker threads
+                future = executor.submit(context.run, analyze_text, text, columns)
+                if dedupe_index is not None:
+                    in_flight[url_id] = future
+            del text
+
+            pending.append((url_id, url, duplicate_of, future))
+            if len(pending) >= max_in_flight:
+                row = next_row()
+                if row is not None:
+                    yield row
+
+        while pending:
+            row = next_row()
+            if row is not None:
+                yield row
+
+
+def _row_or_none(url_id, url, duplicate_of, future):
+    try:
+        return [url_id, url] + future.result() + [duplicate_of or ""]
+    except Exception as e:
+        print(f"❌ Failed to analyze article {url_id}: {e}")
+        return None
+
+
+# 💾 Output: rows go straight to disk
+def analyze_articles_streaming(path, output_path="output/Output Data Structure.xlsx",
+                               folder="extracted_articles", max_in_flight=MAX_IN_FLIGHT, profile=None):
+    """
+    Streaming counterpart of analyze_articles: same columns, bounded memory.
+
+    Args:
+        path (str): Input workbook with URL_ID and URL columns.
+        output_path (str): Excel file the result rows are streamed into.
+        folder (str): Directory holding the extracted article texts.
+        max_in_flight (int): Maximum number of articles held and analyzed at once.
+        profile (str): Analysis profile (see ANALYSIS_PROFILES); defaults to ANALYSIS_PROFILE.
+
+    Returns:
+        int: Number of result rows written.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(OUTPUT_COLUMNS)
+
+    columns = profile_columns(profile)
+    written = 0
+    texts = iter_article_texts(iter_input_rows(path), folder)
+    for row in stream_analyze(texts, max_in_flight, columns=columns):
+        with span("report.excel_write"):
+            sheet.append(row)
+        written += 1
+
+    with span("report.excel_write"), atomic_path(output_path) as tmp_path:
+        workbook.save(tmp_path)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze extracted articles with bounded memory.")
+    parser.add_argument("input", help="Input workbook with URL_ID and URL columns.")
+    parser.add_argument("--output", default="output/Output Data Structure.xlsx")
+    parser.add_argument("--folder", default="extracted_articles")
+    parser.add_argument("--max-in-flight", type=int, default=MAX_IN_FLIGHT)
+    parser.add_argument("--profile", choices=sorted(ANALYSIS_PROFILES), help="Metrics to compute (default: full).")
+    parser.add_argument("--memory-report", action="store_true", help="Report tracemalloc peak memory per stage.")
+    args = parser.parse_args(argv)
+
+    if not args.memory_report:
+        written = analyze_articles_streaming(args.input, args.output, args.folder, args.max_in_flight, args.profile)
+        print(f"✅ Wrote {written} rows to {args.output}")
+        return
+
+    with track_memory() as report:
+        written = analyze_articles_streaming(args.input, args.output, args.folder, args.max_in_flight, args.profile)
+    print(f"✅ Wrote {written} rows to {args.output}")
+    print("🧠 Peak traced memory per stage:")
+    for row in report.rows():
+        print(f"  - {row['Stage']:<24} {row['Peak (KB)']:>12.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Batch TF-IDF keyword backend.
+
+Builds one sparse document x term matrix (unigrams and adjacent bigrams) for a
+whole batch of texts and ranks every document's terms by TF-IDF with numpy,
+instead of scoring each document separately like YAKE. Terms go through the
+same normalization, stopword, domain stopword and lemmatization filters as
+extract_keywords_from_text.
+
+IDF comes from corpus-level document frequencies when a store of them is
+passed in (the keyword aggregate keeps one per corpus, DocumentFrequencies
+keeps one in memory), so a document's keywords do not depend on which batch
+it was ranked in. Without one, IDF is computed over the batch itself.
+"""
+import threading
+from collections import Counter
+
+import numpy as np
+
+from .keyword_extractor import (
+    normalize_keyword, lemmatizer, stop_words, domain_stopwords, contractions
+)
+from .metrics import span
+
+
+def _document_terms(text, lemma_cache, min_char_length):
+    """Returns the filtered, lemmatized unigram and bigram terms of one text."""
+    tokens = normalize_keyword(text).split()
+
+    lemmas = []
+    for token in tokens:
+        if not token.isalpha() or token in stop_words or token in contractions:
+            lemmas.append(None)  # keeps positions so bigrams never span a removed word
+            continue
+        lemma = lemma_cache.get(token)
+        if lemma is None:
+            lemma = lemma_cache[token] = lemmatizer.lemmatize(token)
+        lemmas.append(lemma)
+
+    terms = []
+    for i, lemma in enumerate(lemmas):
+        if lemma is None:
+            continue
+        if len(lemma) >= min_char_length and lemma not in domain_stopwords:
+            terms.append(lemma)
+        if i + 1 < len(lemmas) and lemmas[i + 1] is not None:
+            raw_bigram = f"{tokens[i]} {tokens[i + 1]}"
+            bigram = f"{lemma} {lemmas[i + 1]}"
+            if raw_bigram not in domain_stopwords and bigram not in domain_stopwords:
+                terms.append(bigram)
+    return terms
+
+
+class DocumentFrequencies:
+    """In-memory running document frequencies, for corpora without a keyword aggregate (e.g. samples)."""
+
+    def __init__(self):
+        self.counts = Counter()
+        self.documents = 0
+        self.lock = threading.Lock()
+
+    def count_documents(self, term_sets):
+        """Adds documents, each given as the set of its terms."""
+        with self.lock:
+            for terms in term_sets:
+                self.counts.update(terms)
+                self.documents += 1
+
+    def document_frequencies(self, terms):
+        """Returns ([document frequency of each term], number of documents counted)."""
+        with self.lock:
+            return [self.counts.get(term, 0) for term in terms], self.documents
+
+
+def extract_keywords_tfidf(texts, max_keywords=10, min_char_length=3, min_word_count=1,
+                           document_frequencies=None, count_documents=None):
+    """
+    Extracts the top TF-IDF terms for every text in a batch.
+
+    Args:
+        texts (list[str]): Documents to rank.
+        max_keywords (int): Maximum number of keywords per document.
+        min_char_length (int): Minimum character length for a unigram keyword.
+        min_word_count (int): Minimum number of words in a keyword (1 or 2).
+        document_frequencies: Corpus-level store (count_documents / document_frequencies
+            methods) IDF is taken from; IDF is computed over `texts` if None.
+        count_documents (list[bool]): Which texts to add to the store before ranking
+            (texts new to the corpus); all of them by default.
+
+    Returns:
+        List[List[str]]: Keywords per document, best first.
+    """
+    vocabulary = {}
+    lemma_cache = {}
+    indptr, indices, counts = [0], [], []
+
+    # ---- Sparse count matrix (CSR) ----
+    with span("keywords.tfidf_tokenize"):
+        for text in texts:
+            row = {}
+            if text and isinstance(text, str):
+                for term in _document_terms(text, lemma_cache, min_char_length):
+                    if min_word_count > 1 and term.count(" ") + 1 < min_word_count:
+                        continue
+                    column = vocabulary.setdefault(term, len(vocabulary))
+                    row[column] = row.get(column, 0) + 1
+            indices.extend(row.keys())
+            counts.extend(row.values())
+            indptr.append(len(indices))
+
+    if not indices:
+        return [[] for _ in texts]
+
+    with span("keywords.tfidf_rank"):
+        indptr = np.asarray(indptr, dtype=np.int64)
+        indices = np.asarray(indices, dtype=np.int64)
+        counts = np.asarray(counts, dtype=np.float64)
+
+        terms = np.empty(len(vocabulary), dtype=object)
+        for term, column in vocabulary.items():
+            terms[column] = term
+
+        n_docs = 0
+        if document_frequencies is not None:
+            new = [
+                terms[indices[start:end]].tolist()
+                for i, (start, end) in enumerate(zip(indptr[:-1], indptr[1:]))
+                if count_documents is None or count_documents[i]
+            ]
+            if new:
+                document_frequencies.count_documents(new)
+            frequencies, n_docs = document_frequencies.document_frequencies(terms.tolist())
+            document_frequency = np.asarray(frequencies, dtype=np.float64)
+        if not n_docs:
+            n_docs = len(texts)
+            document_frequency = np.bincount(indices, minlength=len(vocabulary))
+
+        # ---- Vectorized TF-IDF (smoothed IDF, log-scaled TF) ----
+        idf = np.log((1 + n_docs) / (1 + document_frequency)) + 1
+        scores = (1 + np.log(counts)) * idf[indices]
+
+        # ---- Top-k per row ----
+        results = []
+        for start, end in zip(indptr[:-1], indptr[1:]):
+            row_scores = scores[start:end]
+            if len(row_scores) > max_keywords:
+                top = np.argpartition(-row_scores, max_keywords)[:max_keywords]
+            else:
+                top = np.arange(len(row_scores))
+            top = top[np.argsort(-row_scores[top], kind="stable")]
+            results.append(list(terms[indices[start:end][top]]))
+    return results
@@ -0,0 +1,146 @@
+import math
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from app.corpus import ARTICLES_DIR, read_article
+from app.keyword_extractor import KEYWORD_BACKEND, extract_keywords_batch
+from app.keyword_index import get_keyword_aggregate
+
+SENTIMENT_BANDS = ("Positive", "Neutral", "Negative", "Not scored")
+PAGE_SIZES = (25, 50, 100)
+SORT_COLUMNS = ("URL_ID", "POLARITY SCORE", "SUBJECTIVITY SCORE", "WORD COUNT", "FOG INDEX")
+
+
+# 🗂️ Indexed frame: derived columns are computed once per result, not per rerun
+def prepare_browser_frame(df_result):
+    """
+    Adds the columns the browser filters and sorts on (sentiment band, lowercase
+    URL_ID, and URL_ID as a number when every ID is numeric).
+
+    The prepared frame is kept in session state per result frame, so filters,
+    sorting and paging on reruns only run vectorized masks over it.
+    """
+    cached = st.session_state.get("_browser_frame")
+    if cached is not None and cached[0] is df_result:
+        return cached[1]
+
+    frame = df_result.reset_index(drop=True)
+    polarity = frame["POLARITY SCORE"]
+    frame["SENTIMENT"] = np.select(
+        [polarity.isna(), polarity > 0.1, polarity < -0.1], ["Not scored", "Positive", "Negative"], "Neutral"
+    )
+    frame["_url_id_lower"] = frame["URL_ID"].astype(str).str.lower()
+    # "10" sorts after "9" when all IDs are numbers; mixed IDs keep string order
+    numeric_ids = pd.to_numeric(frame["URL_ID"], errors="coerce")
+    frame["_url_id_sort"] = numeric_ids if numeric_ids.notna().all() else frame["URL_ID"].astype(str)
+    st.session_state["_browser_frame"] = (df_result, frame)
+    return frame
+
+
+def filter_articles(frame, bands=SENTIMENT_BANDS, word_range=None, search=""):
+    """Rows matching the sentiment bands, word-count range and URL_ID substring."""
+    mask = frame["SENTIMENT"].isin(bands)
+    if word_range is not None:
+        mask &= frame["WORD COUNT"].between(*word_range) | frame["WORD COUNT"].isna()
+    if search:
+        mask &= frame["_url_id_lower"].str.contains(search.strip().lower(), regex=False)
+    return frame[mask]
+
+
+def sort_articles(frame, column="URL_ID", ascending=True):
+    """Rows sorted by `column`; URL_IDs sort numerically when they are all numbers."""
+    if column == "URL_ID" and "_url_id_sort" in frame.columns:
+        column = "_url_id_sort"
+    return frame.sort_values(column, ascending=ascending, kind="stable")
+
+
+def paginate(frame, page, page_size):
+    """
+    Returns one page of rows.
+
+    Returns:
+        tuple: (page rows, number of pages)
+    """
+    page_count = max(1, math.ceil(len(frame) / page_size))
+    page = min(max(1, page), page_count)
+    start = (page - 1) * page_size
+    return frame.iloc[start:start + page_size], page_count
+
+
+# 🖥️ Browser widget
+def show_article_browser(df_result, key):
+    """
+    Renders filter, sort and paging controls and returns the visible page.
+
+    Args:
+        df_result (pd.DataFrame): Analysis results.
+        key (str): Widget key prefix, so several browsers can coexist.
+
+    Returns:
+        pd.DataFrame: The rows of the current page (result columns only).
+    """
+    frame = prepare_browser_frame(df_result)
+    if frame.empty:
+        st.info("No articles to show.")
+        return df_result.iloc[0:0]
+
+    # Metrics an analysis profile skipped get no filter or sort option
+    present_bands = [band for band in SENTIMENT_BANDS if (frame["SENTIMENT"] == band).any()]
+    sort_columns = [column for column in SORT_COLUMNS if frame[column].notna().any()]
+
+    col1, col2, col3 = st.columns([2, 2, 2])
+    with col1:
+        bands = st.multiselect("Sentiment", present_bands, default=present_bands, key=f"{key}_bands")
+    with col2:
+        word_range = None
+        if frame["WORD COUNT"].notna().any():
+            low, high = int(frame["WORD COUNT"].min()), int(frame["WORD COUNT"].max())
+            word_range = st.slider("Word count", low, max(high, low + 1), (low, max(high, low + 1)), key=f"{key}_words")
+    with col3:
+        search = st.text_input("🔎 Search URL_ID", key=f"{key}_search")
+
+    col4, col5, col6, col7 = st.columns([2, 1, 1, 1])
+    with col4:
+        sort_column = st.selectbox("Sort by", sort_columns, key=f"{key}_sort")
+    with col5:
+        ascending = st.radio("Order", ["Ascending", "Descending"], key=f"{key}_order") == "Ascending"
+    with col6:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, key=f"{key}_page_size")
+
+    filtered = sort_articles(filter_articles(frame, bands, word_range, search), sort_column, ascending)
+    page_count = max(1, math.ceil(len(filtered) / page_size))
+    if st.session_state.get(f"{key}_page", 1) > page_count:
+        st.session_state[f"{key}_page"] = page_count  # filters shrank the result
+    with col7:
+        page = st.number_input("Page", min_value=1, max_value=page_count, step=1, key=f"{key}_page")
+
+    rows, page_count = paginate(filtered, page, page_size)
+    st.caption(f"Showing {len(rows)} of {len(filtered)} matching articles ({len(frame)} total) — page {page} of {page_count}")
+    return rows[df_result.columns]
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def page_keywords(url_ids, folder=ARTICLES_DIR, backend=None, max_keywords=5):
+    """
+    Keywords for one page of articles (cached per page, so paging back is free).
+
+    TF-IDF ranks against the folder's corpus document frequencies without adding the page to them.
+    """
+    texts = [read_article(url_id, folder) or "" for url_id in url_ids]
+    frequencies = get_keyword_aggregate(folder, backend) if (backend or KEYWORD_BACKEND) == "tfidf" else None
+    return extract_keywords_batch(
+        texts, max_keywords=max_keywords, backend=backend,
+        document_frequencies=frequencies, count_documents=[False] * len(texts),
+    )
+
+
+def render_keyword_chips(keywords):
+    styled = " ".join([
+        f'<span style="background-color:#e0f3ff; color:#333; '
+        f'padding:5px 10px; border-radius:12px; margin:4px; '
+        f'display:inline-block;">{kw}</span>'
+        for kw in keywords
+    ])
+    st.markdown(styled, unsafe_allow_html=True)
@@ -2,6 +2,8 @@ import streamlit as st
 import pandas as pd
 import os
 
+from app.workspace import atomic_path, atomic_write, session_dir
+
 @st.cache_data
 def generate_sample_file():
     """Creates and caches a sample input Excel file."""
@@ -13,9 +15,9 @@ def generate_sample_file():
             "https://en.wikipedia.org/wiki/Natural_language_processing"
         ]
     })
-    os.makedirs("input", exist_ok=True)
     sample_path = "input/sample_input.xlsx"
-    df.to_excel(sample_path, index=False)
+    with atomic_path(sample_path) as tmp_path:
+        df.to_excel(tmp_path, index=False)
     return sample_path
 
 
@@ -43,11 +45,9 @@ def handle_file_upload():
     # 👉 Upload user file
     uploaded_file = st.file_uploader("Upload your file", type=["xlsx", "csv"])
     if uploaded_file:
-        upload_dir = "input"
-        os.makedirs(upload_dir, exist_ok=True)
-        save_path = os.path.join(upload_dir, uploaded_file.name)
-        with open(save_path, "wb") as f:
-            f.write(uploaded_file.read())
+        # Each session keeps its own uploads, so equal file names never collide
+        save_path = os.path.join(session_dir("input"), os.path.basename(uploaded_file.name))
+        atomic_write(save_path, uploaded_file.getvalue())
         st.success(f"Uploaded: `{uploaded_file.name}`")
         return save_path
 
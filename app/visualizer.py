@@ -144,8 +144,8 @@ def plot_sentiment_comparison(sentiment_data):
 
 
 def plot_readability_comparison(readability_data):
-    """ Bar chart comparing FOG index and Flesch Reading Ease. """
-    df = pd.DataFrame(readability_data)
+    """ Bar chart of FOG index and Flesch Reading Ease, both from the report's readability engine. """
+    df = pd.DataFrame(readability_data)[["URL_ID", "FOG", "Flesch"]]
     df_melted = df.melt(id_vars='URL_ID', var_name='Metric', value_name='Score')
 
     fig = px.bar(
@@ -154,7 +154,7 @@ def plot_readability_comparison(readability_data):
         y="Score",
         color="Metric",
         barmode="group",
-        title="📚 Readability Comparison: FOG vs Flesch",
+        title="📚 Readability Formulas: FOG vs Flesch (same counts)",
         labels={"Score": "Readability Score", "URL_ID": "Article ID"}
     )
     return wrap_plotly(fig)
@@ -0,0 +1,390 @@
+"""
+Distributed batch runs: a shared SQLite work queue of (URL_ID, URL) tasks.
+
+A coordinator loads an input workbook into a queue file on storage every node
+can reach. Any number of worker processes, on any number of hosts, claim small
+batches of tasks under a time-limited lease, extract and analyze each article,
+and write its result row back. Workers renew their leases with heartbeats
+while they work; if a worker dies, its leases expire and other workers reclaim
+the tasks. A task whose page cannot be fetched or extracted, or whose worker
+raises, is retried up to MAX_ATTEMPTS times.
+
+Each worker saves texts to its own corpus, <folder>/<worker id>, and does not
+index them, so no two processes ever write the same corpus or SQLite index.
+The coordinator finally merges the per-article results into the standard
+output frame, in input order, and copies the texts into its own corpus, where
+they are indexed for search.
+
+Usage:
+    python -m app.work_queue init input/urls.xlsx --queue shared/batch.sqlite
+    python -m app.work_queue worker --queue shared/batch.sqlite --folder shared/worker_articles
+    python -m app.work_queue status --queue shared/batch.sqlite
+    python -m app.work_queue merge --queue shared/batch.sqlite --folder shared/worker_articles \\
+        --output "output/Output Data Structure.xlsx"
+"""
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+import pandas as pd
+
+from .analyzer import OUTPUT_COLUMNS, METRIC_COLUMNS, ANALYSIS_PROFILES, analyze_text, profile_columns
+from .corpus import ARTICLES_DIR, read_article, write_article
+from .extractor_router import get_router
+from .fulltext_index import sync_index
+from .metrics import span, incr
+from .scraper import extract_article_text
+from .utils import load_input_excel
+from .workspace import atomic_path
+
+LEASE_SECONDS = float(os.getenv("ARTICLE_QUEUE_LEASE", 120))
+CLAIM_BATCH = int(os.getenv("ARTICLE_QUEUE_CLAIM_BATCH", 8))
+MAX_ATTEMPTS = int(os.getenv("ARTICLE_QUEUE_MAX_ATTEMPTS", 3))
+POLL_SECONDS = 2.0
+WORKER_ARTICLES_DIR = os.getenv("ARTICLE_WORKER_ARTICLES_DIR", "worker_articles")
+
+PENDING, LEASED, DONE, FAILED = "pending", "leased", "done", "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    position INTEGER PRIMARY KEY,
+    url_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    message TEXT,
+    metrics TEXT,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS tasks_by_status ON tasks (status, lease_expires);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class WorkQueue:
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        # Rollback journal (not WAL) so the file can live on shared/network storage;
+        # writers wait for each other instead of failing
+        self.db = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self.db.executescript(SCHEMA)
+
+    # 📥 Coordinator
+    def add_tasks(self, rows, profile=None):
+        """Adds [(URL_ID, URL), ...] in input order and records the batch's analysis profile."""
+        rows = list(rows)
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                start = self.db.execute("SELECT COALESCE(MAX(position) + 1, 0) FROM tasks").fetchone()[0]
+                self.db.executemany(
+                    "INSERT INTO tasks (position, url_id, url, updated_at) VALUES (?, ?, ?, ?)",
+                    [(start + i, str(url_id), str(url), time.time()) for i, (url_id, url) in enumerate(rows)],
+                )
+                self.db.execute(
+                    "INSERT OR REPLACE INTO settings VALUES ('profile', ?)", (profile or "",)
+                )
+                self.db.execute("COMMIT")
+            except Exception:
+                self.db.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def profile(self):
+        with self.lock:
+            row = self.db.execute("SELECT value FROM settings WHERE key = 'profile'").fetchone()
+        return (row[0] if row else "") or None
+
+    # 🔒 Leases
+    def claim(self, worker, limit=CLAIM_BATCH, lease_seconds=LEASE_SECONDS):
+        """
+        Leases up to `limit` tasks to `worker`: pending ones, or leased ones whose lease expired.
+
+        Expired tasks that already used MAX_ATTEMPTS are marked failed instead.
+
+        Returns:
+            list: [(position, URL_ID, URL), ...]
+        """
+        now = time.time()
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                self.db.execute(
+                    "UPDATE tasks SET status = 'failed', worker = NULL, updated_at = ?, "
+                    "message = COALESCE(message, '❌ Lease expired too many times') "
+                    "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                    (now, now, MAX_ATTEMPTS),
+                )
+                rows = self.db.execute(
+                    "SELECT position, url_id, url FROM tasks "
+                    "WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?) "
+                    "ORDER BY position LIMIT ?",
+                    (now, limit),
+                ).fetchall()
+                self.db.executemany(
+                    "UPDATE tasks SET status = 'leased', worker = ?, lease_expires = ?, "
+                    "attempts = attempts + 1, updated_at = ? WHERE position = ?",
+                    [(worker, now + lease_seconds, now, position) for position, _, _ in rows],
+                )
+                self.db.execute("COMMIT")
+            except Exception:
+                self.db.execute("ROLLBACK")
+                raise
+        if rows:
+            incr("work_queue_tasks_claimed_total", len(rows))
+        return rows
+
+    def heartbeat(self, worker, positions, lease_seconds=LEASE_SECONDS):
+        """Extends the worker's leases on `positions`; returns how many it still holds."""
+        if not positions:
+            return 0
+        now = time.time()
+        placeholders = ",".join("?" * len(positions))
+        with self.lock:
+            cursor = self.db.execute(
+                f"UPDATE tasks SET lease_expires = ?, updated_at = ? "
+                f"WHERE worker = ? AND status = 'leased' AND position IN ({placeholders})",
+                (now + lease_seconds, now, worker, *positions),
+            )
+            return cursor.rowcount
+
+    def complete(self, worker, position, message, metrics=None):
+        """
+        Records a task's outcome, if `worker` still holds its lease.
+
+        A task whose lease was lost (and possibly reclaimed) is left to its new holder.
+        The worker stays recorded, so merge_corpus knows whose corpus holds the text.
+
+        Returns:
+            bool: True if the result was recorded.
+        """
+        with self.lock:
+            cursor = self.db.execute(
+                "UPDATE tasks SET status = 'done', message = ?, metrics = ?, updated_at = ? "
+                "WHERE position = ? AND worker = ? AND status = 'leased'",
+                (message, json.dumps(metrics) if metrics is not None else None, time.time(), position, worker),
+            )
+            return cursor.rowcount == 1
+
+    def retry(self, worker, position, message):
+        """Returns a task that failed to the queue, or fails it after MAX_ATTEMPTS attempts."""
+        with self.lock:
+            self.db.execute(
+                "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "message = ?, worker = NULL, updated_at = ? "
+                "WHERE position = ? AND worker = ? AND status = 'leased'",
+                (MAX_ATTEMPTS, message, time.time(), position, worker),
+            )
+
+    # 📊 Progress and merge
+    def counts(self):
+        """Returns {status: number of tasks} for pending, leased, done and failed."""
+        with self.lock:
+            rows = dict(self.db.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status"))
+        return {status: rows.get(status, 0) for status in (PENDING, LEASED, DONE, FAILED)}
+
+    def finished(self):
+        counts = self.counts()
+        return counts[PENDING] == 0 and counts[LEASED] == 0
+
+    def results_frame(self):
+        """
+        Merges the per-article results into the standard output frame, in input order.
+
+        Returns:
+            tuple: (DataFrame with OUTPUT_COLUMNS, [(URL_ID, status message), ...])
+        """
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT url_id, url, status, message, metrics FROM tasks ORDER BY position"
+            ).fetchall()
+
+        output, messages = [], []
+        for url_id, url, status, message, metrics in rows:
+            messages.append((url_id, message or status))
+            if status == DONE and metrics is not None:
+                output.append([url_id, url] + json.loads(metrics) + [""])
+
+        df = pd.DataFrame(output, columns=OUTPUT_COLUMNS)
+        df[METRIC_COLUMNS] = df[METRIC_COLUMNS].apply(pd.to_numeric, errors="coerce")
+        return df, messages
+
+    def extracted(self):
+        """Returns [(URL_ID, worker), ...] for finished tasks, in input order."""
+        with self.lock:
+            return self.db.execute(
+                "SELECT url_id, worker FROM tasks WHERE status = 'done' AND worker IS NOT NULL ORDER BY position"
+            ).fetchall()
+
+
+def merge_corpus(queue, workers_dir, folder=ARTICLES_DIR):
+    """
+    Copies the texts saved by the workers into the coordinator's corpus and indexes them.
+
+    Args:
+        queue (WorkQueue): The finished (or partly finished) queue.
+        workers_dir (str): The workers' --folder; each worker saved to <workers_dir>/<worker id>.
+        folder (str): Coordinator corpus the texts are merged into.
+
+    Returns:
+        int: Number of texts merged.
+    """
+    merged = []
+    for url_id, worker in queue.extracted():
+        text = read_article(url_id, os.path.join(workers_dir, worker))
+        if text is not None:
+            write_article(url_id, text, folder)
+            merged.append(url_id)
+    with span("work_queue.merge_index"):
+        sync_index(merged, folder)
+    return len(merged)
+
+
+# 👷 Worker
+def _process_task(url_id, url, save_dir, columns):
+    """
+    Extracts and analyzes one article.
+
+    Returns:
+        tuple: (extracted, status message, metrics or None); only a failed
+        extraction is worth retrying, analysis gives the same result every time.
+    """
+    success, message, text = extract_article_text(url_id, url, save_dir=save_dir, index=False)
+    if not success or text is None:
+        return False, message, None
+    try:
+        return True, message, analyze_text(text, columns)
+    except Exception as e:
+        return True, f"❌ Failed to analyze article {url_id}: {e}", None
+
+
+def run_worker(queue_path, save_dir=WORKER_ARTICLES_DIR, worker=None, claim_batch=CLAIM_BATCH,
+               lease_seconds=LEASE_SECONDS, wait=True, stop_event=None):
+    """
+    Claims and processes tasks until the queue is finished.
+
+    Texts are saved, unindexed, to this worker's own corpus <save_dir>/<worker>.
+    A heartbeat thread renews the leases of the tasks this worker holds every
+    third of the lease time. With `wait`, the worker keeps polling while other
+    workers still hold leases, so it can pick up tasks whose holder dies.
+
+    Returns:
+        int: Number of tasks this worker completed.
+    """
+    queue = WorkQueue(queue_path)
+    worker = worker or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+    folder = os.path.join(save_dir, worker)
+    profile = queue.profile()
+    columns = profile_columns(profile)
+    stop_event = stop_event or threading.Event()
+    held = set()
+    held_lock = threading.Lock()
+    completed = 0
+
+    def heartbeat():
+        while not stop_event.wait(lease_seconds / 3):
+            with held_lock:
+                positions = list(held)
+            queue.heartbeat(worker, positions, lease_seconds)
+
+    beat = threading.Thread(target=heartbeat, name=f"heartbeat-{worker}", daemon=True)
+    beat.start()
+    try:
+        while not stop_event.is_set():
+            tasks = queue.claim(worker, claim_batch, lease_seconds)
+            if not tasks:
+                if not wait or queue.finished():
+                    break
+                stop_event.wait(POLL_SECONDS)
+                continue
+
+            with held_lock:
+                held.update(position for position, _, _ in tasks)
+            for position, url_id, url in tasks:
+                if stop_event.is_set():
+                    break
+                try:
+                    with span("work_queue.task"):
+                        extracted, message, metrics = _process_task(url_id, url, folder, columns)
+                    if extracted:
+                        completed += queue.complete(worker, position, message, metrics)
+                    else:
+                        queue.retry(worker, position, message)
+                except Exception as e:
+                    queue.retry(worker, position, f"❌ Worker {worker} failed: {e}")
+                finally:
+                    with held_lock:
+                        held.discard(position)
+            get_router().save()
+    finally:
+        stop_event.set()
+        beat.join()
+    return completed
+
+
+# 🧭 CLI
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Distributed batch runs over a shared work queue.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    init = commands.add_parser("init", help="Load an input workbook into a queue.")
+    init.add_argument("input", help="Input workbook with URL_ID and URL columns.")
+    init.add_argument("--queue", required=True)
+    init.add_argument("--profile", choices=sorted(ANALYSIS_PROFILES), help="Metrics to compute (default: full).")
+
+    worker = commands.add_parser("worker", help="Claim and process tasks until the queue is finished.")
+    worker.add_argument("--queue", required=True)
+    worker.add_argument("--folder", default=WORKER_ARTICLES_DIR,
+                        help="Texts go to <folder>/<worker id>, a corpus only this worker writes.")
+    worker.add_argument("--claim-batch", type=int, default=CLAIM_BATCH)
+    worker.add_argument("--lease", type=float, default=LEASE_SECONDS, help="Lease time in seconds.")
+    worker.add_argument("--no-wait", action="store_true", help="Exit as soon as nothing is claimable.")
+
+    status = commands.add_parser("status", help="Show task counts.")
+    status.add_argument("--queue", required=True)
+
+    merge = commands.add_parser("merge", help="Merge per-article results into the output workbook.")
+    merge.add_argument("--queue", required=True)
+    merge.add_argument("--output", default="output/Output Data Structure.xlsx")
+    merge.add_argument("--folder", default=WORKER_ARTICLES_DIR, help="The workers' --folder.")
+    merge.add_argument("--corpus", default=ARTICLES_DIR, help="Corpus the workers' texts are merged into.")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "init":
+        df = load_input_excel(args.input).dropna(subset=["URL_ID", "URL"])
+        added = WorkQueue(args.queue).add_tasks(zip(df["URL_ID"], df["URL"]), args.profile)
+        print(f"✅ Queued {added} tasks in {args.queue}")
+    elif args.command == "worker":
+        done = run_worker(args.queue, args.folder, claim_batch=args.claim_batch,
+                          lease_seconds=args.lease, wait=not args.no_wait)
+        print(f"✅ Worker completed {done} tasks")
+    elif args.command == "status":
+        counts = WorkQueue(args.queue).counts()
+        print(" | ".join(f"{status}: {count}" for status, count in counts.items()))
+    elif args.command == "merge":
+        queue = WorkQueue(args.queue)
+        if not queue.finished():
+            print(f"⚠️ Queue not finished yet: {queue.counts()}; merging the results so far.")
+        df, _ = queue.results_frame()
+        with span("report.excel_write"), atomic_path(args.output) as tmp_path:
+            df.to_excel(tmp_path, index=False)
+        print(f"✅ Wrote {len(df)} rows to {args.output}")
+        merged = merge_corpus(queue, args.folder, args.corpus)
+        print(f"✅ Merged {merged} article texts into {args.corpus}")
+
+
+if __name__ == "__main__":
+    main()
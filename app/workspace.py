@@ -0,0 +1,152 @@
+"""
+Per-session and per-job workspaces, and atomic file writes.
+
+Layout under WORKSPACES_DIR:
+    sessions/<session_id>/input/     uploaded files
+    sessions/<session_id>/charts/    chart images for the PDF report
+    sessions/<session_id>/output/    PDF reports
+    sessions/<session_id>/articles/  URL_ID -> content hash refs (texts live in the shared object store)
+    sessions/<session_id>/Output Data Structure.xlsx
+    jobs/<job_id>/articles/          same, for one background job
+    jobs/<job_id>/Output Data Structure.xlsx
+
+Workspaces untouched for WORKSPACE_MAX_AGE_HOURS are removed by clean_old_workspaces.
+
+Nothing is written in place: files are written to a temp file in the target
+directory and renamed over the destination, so readers never see a partial file.
+"""
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import streamlit as st
+
+WORKSPACES_DIR = os.getenv("ARTICLE_WORKSPACES_DIR", "workspaces")
+REPORT_NAME = "Output Data Structure.xlsx"
+WORKSPACE_MAX_AGE_HOURS = float(os.getenv("ARTICLE_WORKSPACE_MAX_AGE_HOURS", 24))
+CLEANUP_INTERVAL_MINUTES = float(os.getenv("ARTICLE_CLEANUP_INTERVAL_MINUTES", 60))
+CLEANUP_STAMP = ".last_cleanup"
+
+
+# ✍️ Atomic writes
+@contextmanager
+def atomic_path(path):
+    """
+    Yields a temporary path next to `path`; it replaces `path` only if the block succeeds.
+
+    Use it for libraries that write to a file name themselves (to_excel, savefig, PDF builders).
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.splitext(path)[1])
+    os.close(fd)
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def atomic_write(path, data):
+    """Writes bytes or text to `path` atomically."""
+    with atomic_path(path) as tmp_path:
+        if isinstance(data, bytes):
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+        else:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+
+
+# 🗂️ Workspaces
+def session_id():
+    """Short random ID of the current Streamlit session."""
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = str(uuid.uuid4())[:8]
+    return st.session_state.session_id
+
+
+def session_dir(*parts):
+    """Directory private to the current session (created on demand)."""
+    path = os.path.join(WORKSPACES_DIR, "sessions", session_id(), *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def job_dir(job_id, *parts):
+    """Directory private to one background job (created on demand)."""
+    path = os.path.join(WORKSPACES_DIR, "jobs", job_id, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+# 🧹 Cleanup
+_cleanup_lock = threading.Lock()
+
+
+def cleanup_due(interval_minutes=CLEANUP_INTERVAL_MINUTES):
+    """
+    True at most once per interval for all processes sharing WORKSPACES_DIR.
+
+    The last cleanup time is the modification time of a stamp file, which is
+    touched by the caller that gets True.
+    """
+    stamp = os.path.join(WORKSPACES_DIR, CLEANUP_STAMP)
+    with _cleanup_lock:
+        try:
+            if time.time() - os.path.getmtime(stamp) < interval_minutes * 60:
+                return False
+        except FileNotFoundError:
+            pass
+        os.makedirs(WORKSPACES_DIR, exist_ok=True)
+        with open(stamp, "a"):
+            pass
+        os.utime(stamp)
+        return True
+
+
+def _last_modified(path):
+    """Newest modification time of anything in a directory tree."""
+    newest = os.path.getmtime(path)
+    for root, dirs, files in os.walk(path):
+        for name in dirs + files:
+            try:
+                newest = max(newest, os.path.getmtime(os.path.join(root, name)))
+            except OSError:
+                pass  # removed while walking
+    return newest
+
+
+def clean_old_workspaces(max_age_hours=WORKSPACE_MAX_AGE_HOURS, keep=()):
+    """
+    Deletes session and job workspaces in which nothing changed for `max_age_hours`.
+
+    Args:
+        max_age_hours (float): Age after which an untouched workspace is deleted.
+        keep (iterable): Session and job IDs kept regardless of age (the current session, running jobs).
+    """
+    cutoff = time.time() - max_age_hours * 3600
+    keep = set(keep)
+    deleted_count = 0
+
+    for kind in ("sessions", "jobs"):
+        parent = os.path.join(WORKSPACES_DIR, kind)
+        if not os.path.isdir(parent):
+            continue
+        for name in os.listdir(parent):
+            path = os.path.join(parent, name)
+            if name in keep or not os.path.isdir(path):
+                continue
+            try:
+                if _last_modified(path) < cutoff:
+                    shutil.rmtree(path)
+                    deleted_count += 1
+            except Exception as e:
+                print(f"Error deleting {path}: {e}")
+
+    print(f"🧹 Cleaned {deleted_count} old workspace(s) from '{WORKSPACES_DIR}'")
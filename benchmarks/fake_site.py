@@ -0,0 +1,187 @@
+"""
+Local stand-in for real news sites, used to load-test the scraper without network access.
+
+Every URL of the form /article/<n> behaves deterministically (seeded by <n>) as one of:
+a normal article page, a server error, a redirect, a slow-drip response, a very
+large body or a non-HTML (PDF) payload, with rates set by SiteConfig. The same
+behaviours are also reachable directly via /error/<n>, /redirect/<n>, /drip/<n>,
+/large/<n> and /pdf/<n>.
+
+Usage:
+    python -m benchmarks.fake_site --port 8000 --error-rate 0.05 --latency-ms 80
+"""
+import argparse
+import html
+import random
+import threading
+import time
+from collections import namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.synthetic_corpus import KB, MB, generate_article
+
+
+SiteConfig = namedtuple("SiteConfig", [
+    "latency_ms",        # base response latency
+    "jitter_ms",         # extra uniform random latency
+    "error_rate",        # share of /article URLs answering 500/503
+    "redirect_rate",     # share answering 302 to the real page
+    "drip_rate",         # share sent in small chunks with pauses
+    "large_rate",        # share answering with a huge body
+    "non_html_rate",     # share answering with a PDF
+    "article_bytes",     # size of generated article text
+    "large_bytes",       # size of "large" bodies
+    "drip_chunk",        # bytes per slow-drip chunk
+    "drip_delay_ms",     # pause between slow-drip chunks
+])
+
+DEFAULT_CONFIG = SiteConfig(
+    latency_ms=50, jitter_ms=50, error_rate=0.02, redirect_rate=0.05, drip_rate=0.02,
+    large_rate=0.01, non_html_rate=0.02, article_bytes=8 * KB, large_bytes=50 * MB,
+    drip_chunk=512, drip_delay_ms=100,
+)
+
+BEHAVIOURS = ("error", "redirect", "drip", "large", "pdf")
+
+
+def render_article_page(n, size_bytes):
+    paragraphs = generate_article(n, size_bytes).split("\n")
+    body = "\n".join(f"<p>{html.escape(p)}</p>" for p in paragraphs)
+    return (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+        f"<title>Synthetic article {n}</title></head><body>"
+        "<nav><a href=\"/\">Home</a> <a href=\"/about\">About</a></nav>"
+        f"<article><h1>Synthetic article {n}</h1>{body}</article>"
+        "<footer><p>© Fake Site</p></footer></body></html>"
+    ).encode("utf-8")
+
+
+def pick_behaviour(n, config):
+    """Deterministically maps an article number to a behaviour."""
+    roll = random.Random(n).random()
+    for name, rate in zip(BEHAVIOURS, (config.error_rate, config.redirect_rate, config.drip_rate,
+                                       config.large_rate, config.non_html_rate)):
+        if roll < rate:
+            return name
+        roll -= rate
+    return "article"
+
+
+class FakeSiteHandler(BaseHTTPRequestHandler):
+    config = DEFAULT_CONFIG
+
+    def log_message(self, format, *args):
+        pass  # keep load tests quiet
+
+    def do_GET(self):
+        parts = self.path.strip("/").split("/")
+        if len(parts) != 2 or not parts[1].isdigit():
+            return self.send_error(404)
+
+        route, n = parts[0], int(parts[1])
+        if route == "article":
+            route = pick_behaviour(n, self.config)
+
+        delay = self.config.latency_ms + random.random() * self.config.jitter_ms
+        time.sleep(delay / 1000)
+
+        try:
+            handler = getattr(self, f"serve_{route}", None)
+            if handler is None:
+                return self.send_error(404)
+            handler(n)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client gave up (e.g. size cap or content-type rejection)
+
+    def serve_article(self, n):
+        body = render_article_page(n, self.config.article_bytes)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def serve_error(self, n):
+        self.send_error(random.Random(n).choice([500, 503]))
+
+    def serve_redirect(self, n):
+        self.send_response(302)
+        self.send_header("Location", f"/article_page/{n}")
+        self.end_headers()
+
+    def serve_article_page(self, n):
+        self.serve_article(n)
+
+    def serve_drip(self, n):
+        body = render_article_page(n, self.config.article_bytes)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.end_headers()
+        for start in range(0, len(body), self.config.drip_chunk):
+            self.wfile.write(body[start:start + self.config.drip_chunk])
+            self.wfile.flush()
+            time.sleep(self.config.drip_delay_ms / 1000)
+
+    def serve_large(self, n):
+        # No Content-Length: the client only finds out while streaming
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.end_headers()
+        self.wfile.write(b"<!DOCTYPE html><html><body><p>")
+        chunk = b"x" * (64 * KB)
+        for _ in range(self.config.large_bytes // len(chunk)):
+            self.wfile.write(chunk)
+        self.wfile.write(b"</p></body></html>")
+
+    def serve_pdf(self, n):
+        body = b"%PDF-1.4\n" + random.Random(n).randbytes(256 * KB)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_fake_site(config=DEFAULT_CONFIG, host="127.0.0.1", port=0):
+    """
+    Starts the fake site on a background thread.
+
+    Returns:
+        tuple: (server, base_url). Call server.shutdown() when done.
+    """
+    handler = type("ConfiguredFakeSiteHandler", (FakeSiteHandler,), {"config": config})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def add_site_arguments(parser):
+    """Adds one CLI flag per SiteConfig field."""
+    for field in SiteConfig._fields:
+        default = getattr(DEFAULT_CONFIG, field)
+        parser.add_argument(f"--{field.replace('_', '-')}", type=type(default), default=default)
+
+
+def config_from_args(args):
+    return SiteConfig(**{field: getattr(args, field) for field in SiteConfig._fields})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve synthetic article pages locally.")
+    parser.add_argument("--port", type=int, default=8000)
+    add_site_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server, base_url = start_fake_site(config_from_args(args), port=args.port)
+    print(f"🌐 Fake site running at {base_url}/article/<n> (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
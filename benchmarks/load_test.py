@@ -0,0 +1,127 @@
+"""
+Scraper load test against the local fake site.
+
+Drives `extract_articles` (per-URL latency) or `extract_articles_from_file`
+(whole-batch path used by the app) at a chosen concurrency and reports
+pages/sec, p50/p99 latency and a breakdown of failures.
+
+Usage:
+    python -m benchmarks.load_test --urls 500 --concurrency 16
+    python -m benchmarks.load_test --mode file --urls 200 --concurrency 8 --error-rate 0.1
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from benchmarks.fake_site import add_site_arguments, config_from_args, start_fake_site
+
+
+def classify(message):
+    """Maps an extract_articles status message to a failure bucket."""
+    if message.startswith("✅"):
+        return "ok"
+    if message.startswith("⛔"):
+        return "rejected"
+    if "download" in message:
+        return "download_error"
+    if "too short" in message:
+        return "too_short"
+    if "save" in message:
+        return "save_error"
+    return "extract_error"
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_articles_mode(urls, concurrency, save_dir):
+    from app.scraper import extract_articles
+
+    def timed_extract(item):
+        url_id, url = item
+        start = time.perf_counter()
+        _, message = extract_articles(url_id, url, save_dir=save_dir)
+        return time.perf_counter() - start, classify(message)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(timed_extract, urls))
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency for latency, _ in outcomes]
+    return elapsed, latencies, Counter(bucket for _, bucket in outcomes)
+
+
+def run_file_mode(urls, concurrency, save_dir, workdir):
+    from app.pipeline.extract import extract_articles_from_file
+
+    input_path = os.path.join(workdir, "load_test_input.xlsx")
+    pd.DataFrame(urls, columns=["URL_ID", "URL"]).to_excel(input_path, index=False)
+
+    # Per-URL status messages and latencies, as reported by the app's batch path
+    timings = []
+    start = time.perf_counter()
+    extract_articles_from_file(input_path, max_workers=concurrency, save_dir=save_dir, timings=timings)
+    elapsed = time.perf_counter() - start
+
+    buckets = Counter(classify(message) for _, message, _ in timings)
+    if len(timings) < len(urls):
+        buckets["batch_error"] += len(urls) - len(timings)  # the batch stopped before these URLs reported
+    return elapsed, [seconds for _, _, seconds in timings], buckets
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the scraper against a local fake site.")
+    parser.add_argument("--mode", choices=["articles", "file"], default="articles")
+    parser.add_argument("--urls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--base-url", help="Use an already running fake site instead of starting one.")
+    add_site_arguments(parser)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="article_load_")
+    # Keep the fake domain out of the real extractor routing stats
+    os.environ.setdefault("ARTICLE_ROUTER_STATS", os.path.join(workdir, "routes.json"))
+
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        server, base_url = start_fake_site(config_from_args(args))
+
+    urls = [(str(i), f"{base_url}/article/{i}") for i in range(args.urls)]
+    save_dir = os.path.join(workdir, "extracted_articles")
+
+    try:
+        if args.mode == "articles":
+            elapsed, latencies, buckets = run_articles_mode(urls, args.concurrency, save_dir)
+        else:
+            elapsed, latencies, buckets = run_file_mode(urls, args.concurrency, save_dir, workdir)
+    finally:
+        if server:
+            server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"🔁 Mode: {args.mode} | URLs: {args.urls} | Concurrency: {args.concurrency}")
+    print(f"⏱️ Elapsed: {elapsed:.2f}s | Throughput: {args.urls / elapsed:.1f} pages/sec")
+    if latencies:
+        print(f"📈 Latency p50: {percentile(latencies, 50) * 1000:.0f} ms | p99: {percentile(latencies, 99) * 1000:.0f} ms")
+    print("📋 Outcomes:")
+    for bucket, count in buckets.most_common():
+        print(f"  - {bucket}: {count} ({count / args.urls:.1%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
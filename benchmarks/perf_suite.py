@@ -0,0 +1,338 @@
+"""
+Offline performance regression suite.
+
+Times the analysis, keyword, syllable, chart, PDF and full-text search stages
+on a deterministic synthetic corpus, records throughput and peak memory, and compares the results
+with a stored baseline. No network access is needed; the NLTK resources listed
+in app/nltk_setup.py must already be installed.
+
+Usage:
+    python -m benchmarks.perf_suite --profile quick
+    python -m benchmarks.perf_suite --profile standard --update-baseline
+    python -m benchmarks.perf_suite --profile full --stages search
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+from contextlib import contextmanager
+
+import pandas as pd
+
+from benchmarks.synthetic_corpus import KB, MB, generate_article, write_corpus
+
+
+PROFILES = {
+    "quick": {"doc_sizes": [1 * KB, 10 * KB], "corpus_counts": [10, 100]},
+    "standard": {"doc_sizes": [1 * KB, 10 * KB, 100 * KB], "corpus_counts": [10, 1000]},
+    "full": {"doc_sizes": [1 * KB, 10 * KB, 100 * KB, 1 * MB], "corpus_counts": [10, 1000, 10000, 100000]},
+}
+CORPUS_DOC_SIZE = 1 * KB        # article size used when scaling the article count
+REPORT_MAX_ARTICLES = 1000      # PDF tables beyond this size are not a realistic workload
+# Synthetic articles share a small vocabulary, so these terms occur in nearly every article
+SEARCH_QUERIES = {"term": "market", "terms": "market technology", "phrase": '"market report"'}
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# A case is timed as run(setup()); setup work is excluded from the measurement
+Case = namedtuple("Case", ["name", "items", "bytes", "setup", "run"])
+
+
+@contextmanager
+def working_directory(path):
+    """The app writes to relative paths (extracted_articles/, output/, charts/)."""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def synthetic_metrics_frame(count, seed=42):
+    """Builds an analyzer-shaped result frame without running the analyzer."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        word_count = rng.randint(150, 2000)
+        rows.append({
+            "URL_ID": str(1000 + i),
+            "URL": f"https://example.test/articles/{1000 + i}",
+            "POLARITY SCORE": round(rng.uniform(-0.5, 0.6), 3),
+            "SUBJECTIVITY SCORE": round(rng.uniform(0.1, 0.9), 3),
+            "AVG SENTENCE LENGTH": round(rng.uniform(8, 30), 3),
+            "PERCENTAGE OF COMPLEX WORDS": round(rng.uniform(0.1, 0.5), 3),
+            "FOG INDEX": round(rng.uniform(4, 14), 3),
+            "COMPLEX WORD COUNT": int(word_count * rng.uniform(0.1, 0.5)),
+            "WORD COUNT": word_count,
+            "SYLLABLE PER WORD": round(rng.uniform(1.3, 2.6), 3),
+            "PERSONAL PRONOUNS": rng.randint(0, 40),
+            "AVG WORD LENGTH": round(rng.uniform(4, 8), 3),
+        })
+    return pd.DataFrame(rows)
+
+
+# ---------------- Case builders ----------------
+def syllable_cases(profile):
+    from app.utils import count_syllables
+
+    words = generate_article(0, max(profile["doc_sizes"]), seed=7).split()
+
+    return [Case(
+        f"count_syllables/{len(words)}w", len(words), sum(len(w) for w in words),
+        lambda: words,
+        lambda ws: [count_syllables(w) for w in ws],
+    )]
+
+
+def keyword_cases(profile):
+    from app.keyword_extractor import extract_keywords_from_text
+
+    cases = []
+    for size in profile["doc_sizes"]:
+        text = generate_article(0, size, seed=11)
+        cases.append(Case(
+            f"extract_keywords/{size // KB}KB", 1, size,
+            lambda text=text: text,
+            lambda t: extract_keywords_from_text(t),
+        ))
+    return cases
+
+
+def analyze_cases(profile, workroot):
+    from app.analyzer import analyze_articles
+
+    shapes = [(count, CORPUS_DOC_SIZE) for count in profile["corpus_counts"]]
+    shapes += [(min(profile["corpus_counts"]), size) for size in profile["doc_sizes"] if size != CORPUS_DOC_SIZE]
+
+    cases = []
+    for count, size in shapes:
+        workdir = os.path.join(workroot, f"analyze_{count}x{size}")
+
+        def setup(workdir=workdir, count=count, size=size):
+            if not os.path.isdir(workdir):
+                write_corpus(workdir, count, size)
+            return os.path.join("input", f"synthetic_{count}x{size}.xlsx"), workdir
+
+        def run(state):
+            input_path, workdir = state
+            with working_directory(workdir):
+                analyze_articles.clear()
+                return analyze_articles(input_path)
+
+        cases.append(Case(f"analyze_articles/{count}x{size // KB}KB", count, count * size, setup, run))
+    return cases
+
+
+def search_cases(profile, workroot):
+    """
+    Uncached full-text queries whose terms occur in nearly every article (the worst case).
+
+    Target: the one-word query answers in under 50 ms at 50,000 articles.
+    """
+    from app.fulltext_index import FullTextIndex
+
+    cases = []
+    for count in profile["corpus_counts"]:
+        path = os.path.join(workroot, f"search_{count}.sqlite")
+
+        def setup(path=path, count=count):
+            index = FullTextIndex(path)
+            if not index.versions():
+                for start in range(0, count, 1000):
+                    index.add_many([
+                        (str(1000 + i), generate_article(i, CORPUS_DOC_SIZE), "")
+                        for i in range(start, min(count, start + 1000))
+                    ])
+            return index
+
+        for kind, query in SEARCH_QUERIES.items():
+            def run(index, query=query):
+                index.results.clear()  # measure the query itself, not the result cache
+                return index.search(query)
+
+            cases.append(Case(f"search/{kind}/{count}", 1, 0, setup, run))
+    return cases
+
+
+def chart_cases(profile, workroot):
+    from app.visualizer import sentiment_distribution, word_count_vs_complexity, personal_pronouns_barchart
+    from app.pdf_charts import (
+        save_sentiment_distribution_matplotlib,
+        save_word_count_vs_complexity_matplotlib,
+        save_personal_pronouns_barchart_matplotlib,
+    )
+
+    workdir = os.path.join(workroot, "charts")
+    os.makedirs(workdir, exist_ok=True)
+
+    cases = []
+    for count in profile["corpus_counts"]:
+        df = synthetic_metrics_frame(count)
+
+        def run_plotly(frame):
+            return [sentiment_distribution(frame), word_count_vs_complexity(frame), personal_pronouns_barchart(frame)]
+
+        def run_matplotlib(frame):
+            with working_directory(workdir):
+                return [
+                    save_sentiment_distribution_matplotlib(frame, "bench"),
+                    save_word_count_vs_complexity_matplotlib(frame, "bench"),
+                    save_personal_pronouns_barchart_matplotlib(frame, "bench"),
+                ]
+
+        cases.append(Case(f"plotly_charts/{count}", count, 0, lambda df=df: df, run_plotly))
+        if count <= REPORT_MAX_ARTICLES:
+            cases.append(Case(f"matplotlib_charts/{count}", count, 0, lambda df=df: df, run_matplotlib))
+    return cases
+
+
+def pdf_cases(profile, workroot):
+    from app.pdf_generator import export_analysis_to_pdf
+
+    cases = []
+    for count in [c for c in profile["corpus_counts"] if c <= REPORT_MAX_ARTICLES]:
+        workdir = os.path.join(workroot, f"pdf_{count}")
+
+        def setup(workdir=workdir, count=count):
+            if not os.path.isdir(workdir):
+                write_corpus(workdir, count, CORPUS_DOC_SIZE)
+            return synthetic_metrics_frame(count), workdir
+
+        def run(state):
+            df, workdir = state
+            with working_directory(workdir):
+                export_analysis_to_pdf.clear()
+                return export_analysis_to_pdf(df, {}, input_path="synthetic.xlsx", session_id="bench")
+
+        cases.append(Case(f"export_analysis_to_pdf/{count}", count, 0, setup, run))
+    return cases
+
+
+# ---------------- Measurement ----------------
+def measure(case, repeat):
+    """
+    Returns best wall time over `repeat` runs, throughput and traced peak memory.
+
+    Peak memory comes from a separate tracemalloc pass so tracing overhead does
+    not distort the timings.
+    """
+    state = case.setup()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        case.run(state)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+
+    tracemalloc.start()
+    try:
+        case.run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": round(best, 6),
+        "items_per_sec": round(case.items / best, 3) if best else None,
+        "mb_per_sec": round(case.bytes / MB / best, 3) if best and case.bytes else None,
+        "peak_kb": round(peak / KB, 1),
+    }
+
+
+def compare(results, baseline, tolerance, memory_tolerance):
+    """Returns a list of human-readable regressions against the baseline."""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        if result["seconds"] > reference["seconds"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: {result['seconds']:.4f}s vs baseline {reference['seconds']:.4f}s (+{tolerance:.0%} allowed)"
+            )
+        if result["peak_kb"] > reference["peak_kb"] * (1 + memory_tolerance):
+            regressions.append(
+                f"{name}: peak {result['peak_kb']:.0f}KB vs baseline {reference['peak_kb']:.0f}KB (+{memory_tolerance:.0%} allowed)"
+            )
+    return regressions
+
+
+def build_cases(profile, workroot, stages):
+    builders = {
+        "syllables": lambda: syllable_cases(profile),
+        "keywords": lambda: keyword_cases(profile),
+        "analyze": lambda: analyze_cases(profile, workroot),
+        "charts": lambda: chart_cases(profile, workroot),
+        "pdf": lambda: pdf_cases(profile, workroot),
+        "search": lambda: search_cases(profile, workroot),
+    }
+    cases = []
+    for stage in stages:
+        cases.extend(builders[stage]())
+    return cases
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline performance regression suite.")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument("--stages", nargs="+", default=["syllables", "keywords", "analyze", "charts", "pdf", "search"],
+                        choices=["syllables", "keywords", "analyze", "charts", "pdf", "search"])
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case (best is kept).")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown, e.g. 0.25 = 25%%.")
+    parser.add_argument("--memory-tolerance", type=float, default=0.25, help="Allowed peak memory growth.")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline.")
+    parser.add_argument("--output", help="Also write the raw results to this JSON file.")
+    args = parser.parse_args(argv)
+
+    workroot = tempfile.mkdtemp(prefix="article_perf_")
+    results = {}
+    try:
+        for case in build_cases(PROFILES[args.profile], workroot, args.stages):
+            results[case.name] = measure(case, args.repeat)
+            r = results[case.name]
+            print(f"{case.name:<40} {r['seconds']:>10.4f}s {r['items_per_sec'] or 0:>12.1f} items/s {r['peak_kb']:>12.1f} KB peak")
+    finally:
+        shutil.rmtree(workroot, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"📌 Baseline updated: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("ℹ️ No baseline found; run with --update-baseline to create one.")
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    regressions = compare(results, baseline, args.tolerance, args.memory_tolerance)
+    if regressions:
+        print("❌ Performance regressions:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+
+    print("✅ No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
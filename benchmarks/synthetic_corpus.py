@@ -0,0 +1,90 @@
+import os
+import random
+import pandas as pd
+
+from app.corpus import write_article
+
+
+# Vocabulary mixes short/long words, sentiment-bearing words and personal pronouns
+# so every metric in the analyzer has something to measure.
+COMMON_WORDS = (
+    "the market report shows that teams across the region have grown while costs "
+    "remained stable and customers asked for faster delivery of new services"
+).split()
+COMPLEX_WORDS = (
+    "infrastructure organization productivity sustainability technology analytical "
+    "communication development opportunity transformation regulatory innovation"
+).split()
+SENTIMENT_WORDS = (
+    "excellent good great remarkable positive successful poor bad terrible weak "
+    "negative disappointing uncertain strong reliable"
+).split()
+PRONOUNS = ["I", "we", "my", "us", "ours"]
+
+KB = 1024
+MB = 1024 * KB
+
+
+def generate_sentence(rng):
+    length = rng.randint(8, 25)
+    words = []
+    for _ in range(length):
+        roll = rng.random()
+        if roll < 0.62:
+            words.append(rng.choice(COMMON_WORDS))
+        elif roll < 0.82:
+            words.append(rng.choice(COMPLEX_WORDS))
+        elif roll < 0.95:
+            words.append(rng.choice(SENTIMENT_WORDS))
+        else:
+            words.append(rng.choice(PRONOUNS))
+    sentence = " ".join(words)
+    return sentence[0].upper() + sentence[1:] + rng.choice([".", ".", ".", "!", "?"])
+
+
+def generate_article(index, size_bytes, seed=42):
+    """
+    Generates a deterministic article of roughly `size_bytes` UTF-8 bytes.
+
+    Args:
+        index (int): Article number; combined with the seed so each article differs.
+        size_bytes (int): Target size in bytes.
+        seed (int): Base random seed.
+
+    Returns:
+        str: Article text made of short paragraphs.
+    """
+    rng = random.Random(seed * 1_000_003 + index)
+    paragraphs = []
+    size = 0
+    while size < size_bytes:
+        paragraph = " ".join(generate_sentence(rng) for _ in range(rng.randint(3, 6)))
+        paragraphs.append(paragraph)
+        size += len(paragraph) + 1
+    return "\n".join(paragraphs)[:size_bytes]
+
+
+def write_corpus(workdir, count, size_bytes, seed=42):
+    """
+    Writes a synthetic corpus laid out the way the app expects it.
+
+    Stores the articles in `workdir/extracted_articles` through the configured
+    corpus backend and writes an input Excel file with URL_ID/URL columns.
+
+    Returns:
+        str: Path of the input Excel file.
+    """
+    articles_dir = os.path.join(workdir, "extracted_articles")
+    input_dir = os.path.join(workdir, "input")
+    os.makedirs(input_dir, exist_ok=True)
+
+    url_ids = [str(1000 + i) for i in range(count)]
+    for i, url_id in enumerate(url_ids):
+        write_article(url_id, generate_article(i, size_bytes, seed), folder=articles_dir)
+
+    input_path = os.path.join(input_dir, f"synthetic_{count}x{size_bytes}.xlsx")
+    pd.DataFrame({
+        "URL_ID": url_ids,
+        "URL": [f"https://example.test/articles/{url_id}" for url_id in url_ids],
+    }).to_excel(input_path, index=False)
+    return input_path
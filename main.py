@@ -1,11 +1,23 @@
+import os
+import threading
 import streamlit as st
 from app.ui.upload import handle_file_upload
-from app.pipeline.extract import extract_articles_from_file
-from app.pipeline.analyze import analyze_and_cache_results
-from app.pipeline.summary import display_summary
+from app.pipeline.extract import extract_articles_from_file, extract_and_analyze_from_file
+from app.pipeline.analyze import ANALYSIS_MODE, analyze_and_cache_results
+from app.pipeline.summary import display_summary, display_approximate_summary, refresh_keyword_aggregate
 from app.pipeline.visuals import show_visual_tabs
-from app.pipeline.download import show_download_section
+from app.pipeline.search import show_search_box
+from app.pipeline.download import show_download_section, show_profile_report
+from app.pipeline.background import BACKGROUND_JOBS, collect_job_results
+from app.jobs import get_job_registry
 from app.utils import clear_old_charts, clean_old_pdfs
+from app.workspace import REPORT_NAME, cleanup_due, session_dir, session_id
+from app.corpus import ARTICLES_DIR, clean_storage, get_store
+from app.metrics import start_run, export_metrics
+from app.profiling import profiling_mode, profile_run
+from app.nlp_models import WARMUP_MODELS, models, start_warmup
+from app.keyword_extractor import KEYWORD_BACKENDS, KEYWORD_BACKEND
+from app.analyzer import ANALYSIS_PROFILES, ANALYSIS_PROFILE, fill_missing_metrics, missing_metrics, profile_columns
 
 # ---------------------- App Configuration ----------------------
 st.set_page_config(
@@ -13,6 +25,17 @@ st.set_page_config(
     layout="wide"
 )
 
+# Collect per-stage timings for this run
+run_timings = start_run()
+
+# Profile this run on request (?profile=cpu|memory|all or ARTICLE_PROFILE)
+profile_mode = profiling_mode(st.query_params.get("profile"))
+profile_slot = None
+
+# Load the NLP models in the background once per server process
+if WARMUP_MODELS:
+    start_warmup()
+
 # ------------------- Sidebar: About This App -----------------------
 with st.sidebar:
     st.markdown("## 🤔 Why Use This App?")
@@ -36,43 +59,156 @@ with st.sidebar:
     st.markdown("### ⚙️ Powered by Precision:")
     st.markdown("`AI` + `Stats` + `Visuals`")
 
+    st.markdown("---")
+    keyword_backend = st.selectbox(
+        "🔑 Keyword engine",
+        KEYWORD_BACKENDS,
+        index=KEYWORD_BACKENDS.index(KEYWORD_BACKEND),
+        format_func=lambda name: {"yake": "YAKE (per article, accurate)", "tfidf": "TF-IDF (batch, fast)"}[name],
+    )
+    analysis_profile = st.selectbox(
+        "🧮 Analysis profile",
+        list(ANALYSIS_PROFILES),
+        index=list(ANALYSIS_PROFILES).index(ANALYSIS_PROFILE),
+        format_func=lambda name: {
+            "full": "Full (all metrics)", "sentiment": "Sentiment only", "readability": "Readability only"
+        }[name],
+    )
+    show_timings = st.checkbox("⏱️ Show timing breakdown", value=False)
+
 
 st.title("📰 Advanced Article Analyzer with Visual Insights")
 
+if BACKGROUND_JOBS and ANALYSIS_MODE != "standard":
+    st.warning(
+        f"⚠️ ARTICLE_ANALYSIS_MODE={ANALYSIS_MODE} is ignored while background jobs are enabled "
+        "(jobs already extract and analyze each article as it arrives). "
+        "Unset ARTICLE_BACKGROUND_JOBS to use it."
+    )
+
+# Drop workspaces and article texts nobody has used for a while: at most once per
+# interval across server processes, in the background (it walks the whole corpus)
+if cleanup_due():
+    threading.Thread(
+        target=clean_storage, args=([session_id(), *get_job_registry().running_ids()],),
+        name="storage-cleanup", daemon=True,
+    ).start()
+
 # ---------------------- Step 1: Upload Input ----------------------
 sample_path = handle_file_upload()
 
-# ---------------------- Step 2: Article Extraction ----------------------
-if sample_path:
-    # Check if new file uploaded or no previous result
-    if (
-        "df_result" not in st.session_state or
-        st.session_state.get("last_file_path") != sample_path
-    ):
-        clear_old_charts() # clean old charts
-        clean_old_pdfs(folder="output", max_age_minutes=30)
-        st.session_state.pop("pdf_path", None)
-        df_result = extract_articles_from_file(sample_path)
+with profile_run(profile_mode) as profiling:
+    # ---------------------- Step 2: Article Extraction ----------------------
+    if sample_path:
+        if BACKGROUND_JOBS:
+            # Extraction + analysis run as a background job that survives reruns
+            df_result = collect_job_results(sample_path, analysis_profile, keyword_backend)
+            if df_result is not None and missing_metrics(df_result, profile_columns(analysis_profile)):
+                # A wider profile was selected: compute only the metrics it adds, from the job's corpus
+                with st.spinner("🔍 Computing metrics for the selected profile..."):
+                    df_result = fill_missing_metrics(
+                        df_result, profile_columns(analysis_profile), st.session_state.articles_dir
+                    )
+                st.session_state.df_result = df_result
+            if df_result is not None and (
+                st.session_state.get("keyword_job_id") != st.session_state.job_id or
+                st.session_state.get("keyword_backend") != keyword_backend
+            ):
+                # Estimates stay on screen while exact keyword statistics are computed
+                placeholder = st.empty()
+                job = get_job_registry().get(st.session_state.job_id)
+                if job is not None:
+                    with placeholder.container():
+                        display_approximate_summary(job, keyword_backend)
+                refresh_keyword_aggregate(df_result, keyword_backend, st.session_state.articles_dir)
+                placeholder.empty()
+                st.session_state.keyword_job_id = st.session_state.job_id
+                st.session_state.keyword_backend = keyword_backend
+                st.session_state.pop("pdf_path", None)  # its top keywords came from the previous aggregate
+        # Check if new file uploaded or no previous result
+        elif (
+            "df_result" not in st.session_state or
+            st.session_state.get("last_file_path") != sample_path
+        ):
+            clear_old_charts(session_dir("charts")) # clean old charts
+            clean_old_pdfs(folder=session_dir("output"), max_age_minutes=30)
+            st.session_state.pop("pdf_path", None)
+            # Texts and report go to this session's workspace; the texts themselves are shared by hash
+            articles_dir = session_dir("articles")
+            get_store(articles_dir, backend="cas")
+            report_path = os.path.join(session_dir(), REPORT_NAME)
+            if ANALYSIS_MODE == "pipelined":
+                # Analysis overlaps extraction; texts are handed over in memory
+                df_result = extract_and_analyze_from_file(sample_path, analysis_profile, articles_dir, report_path)
+            else:
+                # The normalized input goes to the session too: the sample file is shared
+                input_path = os.path.join(session_dir("input"), os.path.basename(sample_path))
+                df_result = extract_articles_from_file(sample_path, save_dir=articles_dir, normalized_path=input_path)
+                if df_result is not None:
+                    df_result = analyze_and_cache_results(
+                        input_path, df_result, analysis_profile, articles_dir, report_path
+                    )
+            if df_result is not None:
+                refresh_keyword_aggregate(df_result, keyword_backend, articles_dir)
+                st.session_state.df_result = df_result
+                st.session_state.last_file_path = sample_path
+                st.session_state.articles_dir = articles_dir
+                st.session_state.report_path = report_path
+                st.session_state.keyword_backend = keyword_backend
+        else:
+            df_result = st.session_state.df_result
+            if df_result is not None and missing_metrics(df_result, profile_columns(analysis_profile)):
+                # A wider profile was selected: compute only the metrics it adds
+                with st.spinner("🔍 Computing metrics for the selected profile..."):
+                    df_result = fill_missing_metrics(
+                        df_result, profile_columns(analysis_profile), st.session_state.articles_dir
+                    )
+                st.session_state.df_result = df_result
+            if df_result is not None and st.session_state.get("keyword_backend") != keyword_backend:
+                refresh_keyword_aggregate(df_result, keyword_backend, st.session_state.articles_dir)
+                st.session_state.keyword_backend = keyword_backend
+                st.session_state.pop("pdf_path", None)  # its top keywords came from the previous aggregate
+
         if df_result is not None:
-            df_result = analyze_and_cache_results(sample_path, df_result)
-            st.session_state.df_result = df_result
-            st.session_state.last_file_path = sample_path
-    else:
-        df_result = st.session_state.df_result
+            st.success("✅ Article analysis complete")
+            st.markdown("---")
+
+            articles_dir = st.session_state.get("articles_dir", ARTICLES_DIR)
+
+            # ---------------- Step 4: Display Summary ----------------
+            display_summary(df_result, articles_dir, keyword_backend)
+            st.markdown("---")
+
+            # ---------------- Step 5: Search & Visualizations ----------------
+            df_view = show_search_box(df_result, articles_dir)
+            show_visual_tabs(df_view, keyword_backend, articles_dir)
+            st.markdown("---")
+
+            # ---------------- Step 6: Download Processed File ----------------
+            show_download_section(
+                st.session_state.get("report_path"), df_result, sample_path, articles_dir, keyword_backend
+            )
+            profile_slot = st.empty()
 
-    if df_result is not None:
-        st.success("✅ Article analysis complete")
-        st.markdown("---")
+            st.caption("📍 Built with ❤️ by Pawan | Powered by Streamlit")
 
-        # ---------------- Step 4: Display Summary ----------------
-        display_summary(df_result)
-        st.markdown("---")
+# ---------------------- Profiling Report ----------------------
+# Shown under the download section once the profiled run has finished
+if "report" in profiling:
+    with profile_slot.container() if profile_slot is not None else st.container():
+        show_profile_report(profiling["report"])
 
-        # ---------------- Step 5: Show Visualizations ----------------
-        show_visual_tabs(df_result)
-        st.markdown("---")
+# ---------------------- Timing Breakdown ----------------------
+export_metrics()
 
-        # ---------------- Step 6: Download Processed File ----------------
-        show_download_section("output/Output Data Structure.xlsx", df_result, sample_path)
+if show_timings:
+    with st.sidebar:
+        st.markdown("### ⏱️ Timing Breakdown")
+        breakdown = run_timings.breakdown()
+        if breakdown:
+            st.dataframe(breakdown, hide_index=True)
+        else:
+            st.caption("No stages ran in this run (results were served from cache).")
 
-        st.caption("📍 Built with ❤️ by Pawan | Powered by Streamlit")
\ No newline at end of file
+        st.markdown("### 🧠 NLP Models")
+        st.dataframe(models.report(), hide_index=True)